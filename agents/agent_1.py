@@ -1,25 +1,14 @@
 from tools.google_tools import get_google_data
-from tools.npi_tools import get_npi_data
-from tools.compare_tools import compare_data
+from tools.npi_tools import get_npi_data, lookup_npi_local, invalid_npi_result
+from utils.npi import normalize_npi, is_valid_npi
+from tools.compare_tools import compare_data_many
 
 
-def validation_agent(state):
+def gather_sources(provider: dict) -> dict:
     """
-    Agent-1: Provider Data Validation
-
-    INPUT:
-        state["provider"] contains merged CSV + PDF data.
-
-    OUTPUT:
-        {
-            "validated_data": {...},
-            "google_result": {...},
-            "npi_result": {...}
-        }
+    Agent-1 lookups for one provider: the cleaned input (PDF values win
+    over CSV) plus its Google and NPI results, ready for compare_data.
     """
-
-    provider = state["provider"]
-
     # STEP 1: Decide which phone/address to validate
     # ------------------------------------------
     # PDF > CSV (recommended for hackathon)
@@ -48,18 +37,55 @@ def validation_agent(state):
     }
 
     # Extract NPI if available in input/PDF
-    npi_input = provider.get("npi") or provider.get("pdf_npi")
+    npi_input = normalize_npi(provider.get("npi") or provider.get("pdf_npi")) or None
 
     # STEP 2: Call validation APIs
     google_res = get_google_data(name, address)
-    npi_res = get_npi_data(name, npi_id=npi_input)
+    # A bad check digit is flagged without any lookup; otherwise the local
+    # NPPES index first (microseconds), web search only as a fallback
+    if npi_input and not is_valid_npi(npi_input):
+        npi_res = invalid_npi_result(npi_input)
+    else:
+        npi_res = lookup_npi_local(name, npi_id=npi_input, address=address)
+        if npi_res is None:
+            npi_res = get_npi_data(name, npi_id=npi_input)
 
-    # STEP 3: Compare values
-    validated = compare_data(cleaned_provider, google_res, npi_res)
+    return {"provider": cleaned_provider, "google_result": google_res, "npi_result": npi_res}
 
-    # STEP 4: Return to pipeline
-    return {
-        "validated_data": validated,
-        "google_result": google_res,
-        "npi_result": npi_res
-    }
+
+def validation_agent(state):
+    """
+    Agent-1: Provider Data Validation
+
+    INPUT:
+        state["provider"] contains merged CSV + PDF data.
+
+    OUTPUT:
+        {
+            "validated_data": {...},
+            "google_result": {...},
+            "npi_result": {...}
+        }
+    """
+    return validate_many([gather_sources(state["provider"])])[0]
+
+
+def validate_many(sources: list[dict]) -> list[dict]:
+    """
+    STEP 3 for many providers at once: compare each gather_sources() result,
+    scoring every provider's field pairs in one batched compare_data_many
+    call. Returns validation_agent outputs in the same order.
+    """
+    validated = compare_data_many(
+        [s["provider"] for s in sources],
+        [s["google_result"] for s in sources],
+        [s["npi_result"] for s in sources],
+    )
+    return [
+        {
+            "validated_data": v,
+            "google_result": s["google_result"],
+            "npi_result": s["npi_result"]
+        }
+        for s, v in zip(sources, validated)
+    ]
@@ -24,7 +24,10 @@ def _fraud_signals(provider: Dict[str, Any],
         signals.append("missing_contact_info")
         score += 20
 
-    if not license_id:
+    if validated.get("npi_valid") is False:
+        signals.append("invalid_npi")
+        score += 30
+    elif not license_id:
         signals.append("missing_license")
         score += 30
 
@@ -141,11 +144,14 @@ def quality_agent(state):
     # -----------------------------
     # 2) Discrepancies
     # -----------------------------
+    # An NPI that failed the check digit is reported as such, not as missing
+    invalid_npi = validated.get("npi_valid") is False
     discrepancies = {
         "phone_mismatch": not bool(phone_match),
         "address_mismatch": not bool(addr_match),
         "specialty_mismatch": not bool(spec_match),
-        "missing_license": not license_id or license_id in ["Not Found", "Error"],
+        "missing_license": not invalid_npi and (not license_id or license_id in ["Not Found", "Error"]),
+        "invalid_npi": invalid_npi,
     }
 
     # -----------------------------
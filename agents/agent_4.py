@@ -3,7 +3,6 @@
 from __future__ import annotations
 from typing import Dict, Any
 from utils.exporter import mask_phone, mask_license
-from tools.email_tools import build_provider_email
 
 
 # specialty impact weight (for ranking)
@@ -33,7 +32,8 @@ def directory_agent(state: Dict[str, Any]) -> Dict[str, Any]:
     - Combines all outputs
     - Computes provider status + priority ranking
     - Masks sensitive values for reports
-    - Generates email text (not sending, just template)
+    Email drafts are rendered on demand from the stored result
+    (see /api/reports/email-draft), not carried in pipeline state.
     """
 
     provider = state["provider"]
@@ -78,9 +78,6 @@ def directory_agent(state: Dict[str, Any]) -> Dict[str, Any]:
         "priority_score": priority,
     }
 
-    # Email template (string)
-    email_text = build_provider_email(final_profile, quality)
-
     summary_report = {
         "Provider Name": final_profile["name"],
         "Status": status,
@@ -91,7 +88,6 @@ def directory_agent(state: Dict[str, Any]) -> Dict[str, Any]:
         "Needs Manual Review": "YES" if final_profile["needs_manual_review"] else "NO",
         "Masked Phone": final_profile["phone_original"],
         "Masked License": final_profile["license"],
-        "Email Draft": email_text,
     }
 
     return {
@@ -1,50 +1,16 @@
 # agents.research_agent.py
 import os
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain.prompts import PromptTemplate
-from langchain.tools import Tool
-from langchain_google_genai import ChatGoogleGenerativeAI
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 
-from tools.search_tools import get_search_tools
+from backend.core.config import get_settings
 
 # Data Tools (Internal)
-# We can import these from your existing modules if needed, 
-# or keep the simple lookups here if they are specific to research.
-# For now, we'll implement the simple lookups here to match previous logic,
-# but nicely encapsulated.
-
-# --- Internal Knowledge Base Helpers ---
-
-def lookup_drug(query: str):
-    """Refined drug lookup"""
-    q = query.lower()
-    db = {
-        "aspirin": "**Aspirin**\n- Class: NSAID\n- Uses: Pain, Fever, Anti-platelet\n- Warning: Bleeding risk",
-        "ibuprofen": "**Ibuprofen**\n- Class: NSAID\n- Uses: Inflammation, Pain\n- Warning: Stomach ulcers",
-        "lisinopril": "**Lisinopril**\n- Class: ACE Inhibitor\n- Uses: Hypertension, Heart Failure\n- Warning: Dry cough, Potassium levels",
-        "metformin": "**Metformin**\n- Class: Biguanide\n- Uses: Type 2 Diabetes\n- Warning: Lactic acidosis (rare)",
-        "atorvastatin": "**Atorvastatin**\n- Class: Statin\n- Uses: High Cholesterol\n- Warning: Muscle pain",
-        "amoxicillin": "**Amoxicillin**\n- Class: Antibiotic\n- Uses: Bacterial Infections\n- Warning: Penicillin allergy"
-    }
-    for drug, info in db.items():
-        if drug in q:
-            return info
-    return None
-
-def lookup_customer_care(query: str):
-    """Platform support lookup"""
-    q = query.lower()
-    kb = {
-        "update provider": "To update a provider: Go to Dashboard > Agent Operations > Select Provider > Run Analysis.",
-        "add provider": "To add a provider: Import a CSV in the Batch Processing tab or use the API.",
-        "export": "To export data: Go to Dashboard > Export, select format (CSV/JSON/PDF) and click Download.",
-        "api key": "To manage API keys: Go to Settings > Security > API Keys.",
-        "billing": "For billing inquiries, please contact finance@ey-caregrid.com."
-    }
-    for key, info in kb.items():
-        if key in q:
-            return info
-    return None
+# Drug and customer care knowledge lives in tools/knowledge_base.py,
+# shared with the research service.
+from tools.knowledge_base import lookup_drug, lookup_customer_care, get_knowledge_store
 
 def drug_tool(query):
     return lookup_drug(query) or "Drug not found in internal DB. Try WebSearch."
@@ -57,12 +23,26 @@ def build_research_agent():
     """
     Constructs and returns the LangChain AgentExecutor for Research.
     """
+    settings = get_settings()
     api_key = os.getenv("GOOGLE_API_KEY")
     if not api_key:
         return None
 
+    from langchain.agents import AgentExecutor, create_react_agent
+    from langchain.prompts import PromptTemplate
+    from langchain.tools import Tool
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from tools.search_tools import get_search_tools
+
     # 1. LLM
-    llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key=api_key, temperature=0.3)
+    # Per-call timeout; the API also bounds the whole run (LLM_TIMEOUT_SECONDS)
+    llm = ChatGoogleGenerativeAI(
+        model=settings.LLM_MODEL,
+        google_api_key=api_key,
+        temperature=0.3,
+        timeout=settings.LLM_TIMEOUT_SECONDS,
+        max_retries=1
+    )
 
     # 2. Tools
     tools = get_search_tools() # From tools/search_tools.py
@@ -106,7 +86,6 @@ Question: {input}
     prompt = PromptTemplate.from_template(template)
 
     # 4. Agent
-    from langchain.agents import create_react_agent
     agent = create_react_agent(llm, tools, prompt)
 
     # 5. Executor
@@ -117,3 +96,125 @@ Question: {input}
         handle_parsing_errors=True,
         max_iterations=5
     )
+
+
+# --- Parallel Retrieval (fan-out + one synthesis call) ---
+#
+# Instead of a ReAct loop (one LLM round-trip per tool call), the
+# independent retrieval tools run at the same time under a deadline and
+# their observations go to a single LLM synthesis call.
+
+# The deadline (RESEARCH_TOOL_DEADLINE_SECONDS) and support-only threshold
+# (RESEARCH_SUPPORT_ONLY_CONFIDENCE) come from settings.
+
+# Characters of each observation passed to the synthesis prompt
+MAX_OBSERVATION_CHARS = 1500
+
+# Threads for retrieval tool calls, shared by all requests. A tool that
+# misses the deadline keeps its thread until it returns, so the pool
+# (not the default executor) bounds how many can pile up.
+_tool_executor = ThreadPoolExecutor(
+    max_workers=get_settings().RESEARCH_TOOL_WORKERS, thread_name_prefix="research-tool"
+)
+
+_web_tools: Optional[Dict[str, Callable[[str], str]]] = None
+
+
+def get_retrieval_tools() -> Dict[str, Callable[[str], str]]:
+    """Tool name -> callable(query) for every retrieval tool (web tools built once)."""
+    global _web_tools
+    if _web_tools is None:
+        try:
+            from tools.search_tools import get_search_tools
+            _web_tools = {
+                ("Wikipedia" if t.name == "wikipedia" else t.name): t.run
+                for t in get_search_tools()
+            }
+        except ImportError as e:
+            print(f"Web search tools not available: {e}")
+            _web_tools = {}
+    return {"DrugDatabase": lookup_drug, "CustomerCare": lookup_customer_care, **_web_tools}
+
+
+def plan_tools(query: str, available: List[str]) -> List[str]:
+    """
+    Pick the tools to fan out to. A platform question whose best knowledge
+    match is a support article covering it (RESEARCH_SUPPORT_ONLY_CONFIDENCE) needs
+    no web search. Otherwise the query goes to DrugDatabase, Wikipedia and
+    WebSearch, plus CustomerCare when it mentions a support trigger phrase
+    ("batch", "export", ...) that may be incidental.
+    """
+    hits = get_knowledge_store().search(query, limit=1)
+    if hits and hits[0]["kind"] == "support" and hits[0]["confidence"] >= get_settings().RESEARCH_SUPPORT_ONLY_CONFIDENCE:
+        return ["CustomerCare"]
+    wanted = ["DrugDatabase", "Wikipedia", "WebSearch"]
+    if lookup_customer_care(query):
+        wanted.append("CustomerCare")
+    return [name for name in wanted if name in available]
+
+
+async def gather_observations(query: str, tools: Optional[List[str]] = None,
+                              deadline: Optional[float] = None):
+    """
+    Run the planned tools concurrently (on the tool pool) and yield
+    {"tool", "output", "elapsed_ms"} as each one finishes. Tools that fail or
+    have not finished by the deadline yield {"tool", "error"}.
+    """
+    deadline = deadline or get_settings().RESEARCH_TOOL_DEADLINE_SECONDS
+    registry = get_retrieval_tools()
+    names = tools or plan_tools(query, list(registry))
+    start = time.perf_counter()
+    loop = asyncio.get_running_loop()
+
+    async def run(name):
+        output = await loop.run_in_executor(_tool_executor, registry[name], query)
+        return name, output
+
+    tasks = {asyncio.ensure_future(run(name)): name for name in names if name in registry}
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline - (time.perf_counter() - start)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                elapsed_ms = round((time.perf_counter() - start) * 1000, 1)
+                if task.exception() is not None:
+                    yield {"tool": tasks[task], "error": str(task.exception()), "elapsed_ms": elapsed_ms}
+                else:
+                    _, output = task.result()
+                    yield {"tool": tasks[task], "output": output, "elapsed_ms": elapsed_ms}
+    finally:
+        # Worker threads cannot be interrupted; their late results are dropped
+        for task in pending:
+            task.cancel()
+    for task in pending:
+        yield {"tool": tasks[task], "error": f"no result within {deadline:.0f}s"}
+
+
+SYNTHESIS_TEMPLATE = """You are CareGrid Research Assistant, helping with medical research, drug information, and healthcare platform support.
+
+Answer the question using the tool results below. Prefer the internal DrugDatabase and CustomerCare results, cite Wikipedia or WebSearch when you use them, and say so if the results do not answer the question. For medical topics, include a disclaimer to consult healthcare providers.
+
+{context}
+
+Tool results:
+{observations}
+
+Question: {query}
+
+Answer:"""
+
+
+def build_synthesis_prompt(query: str, observations: List[Dict], context: str = "") -> str:
+    """Single LLM prompt combining all tool observations."""
+    blocks = [
+        f"[{o['tool']}]\n{str(o['output'])[:MAX_OBSERVATION_CHARS]}"
+        for o in observations if o.get("output")
+    ]
+    return SYNTHESIS_TEMPLATE.format(
+        context=context,
+        observations="\n\n".join(blocks) or "(no tool returned results)",
+        query=query
+    )
@@ -2,4 +2,6 @@ from backend.main import app
 
 # This is the entry point for Vercel's Python runtime
 # It exposes the FastAPI 'app' object to Vercel
+# Heavy services are imported on first use (see backend/core/lazy.py),
+# so a cold start only pays for FastAPI and the routers.
 app = app
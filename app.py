@@ -10,6 +10,8 @@ import plotly.express as px
 
 from pipeline.pipeline_graph import build_pipeline
 from utils.data_loader import load_provider_with_pdf  # provider + PDF loader
+from utils.exporter import read_results_parquet, latest_batch, PARQUET_ROOT, PYARROW_AVAILABLE, FINAL_RESULT_COLUMNS
+from utils.result_sinks import CsvSink, PartitionedParquetSink, MultiSink
 
 # Optional PDF export
 try:
@@ -141,10 +143,26 @@ def load_providers_csv(path: str = "data/providers.csv") -> pd.DataFrame:
 
 
 @st.cache_data
-def load_final_results(path: str = "data/final_results.csv") -> pd.DataFrame | None:
+def load_final_results(path: str = "data/final_results.csv",
+                       columns: list[str] | None = None) -> pd.DataFrame | None:
+    # Prefer the columnar Parquet store (only the latest batch, like the
+    # CSV, which each batch overwrites) unless the CSV was written after
+    # it (e.g. by a writer without pyarrow); fall back to the CSV
+    latest = latest_batch(PARQUET_ROOT) if PYARROW_AVAILABLE else None
+    if latest and os.path.exists(path) and os.path.getmtime(path) > latest["marked_at"]:
+        latest = None
+    if latest:
+        df = read_results_parquet(
+            PARQUET_ROOT,
+            columns=columns or [c for c in FINAL_RESULT_COLUMNS if c != "batch_id"],
+            batch_dates=[latest["batch_date"]],
+            batch_ids=[latest["batch_id"]],
+        )
+        if df is not None and not df.empty:
+            return df
     if not os.path.exists(path):
         return None
-    return pd.read_csv(path)
+    return pd.read_csv(path, usecols=columns)
 
 
 def run_pipeline_for_provider(provider: dict):
@@ -177,8 +195,9 @@ def run_pipeline_for_provider(provider: dict):
     return result
 
 
+@st.cache_data(max_entries=64)
 def make_pdf(summary: dict) -> bytes:
-    """Create simple PDF summary and return as bytes."""
+    """Create simple PDF summary and return as bytes (cached per summary)."""
     if not HAS_FPDF:
         return b""
 
@@ -545,7 +564,6 @@ def render_batch_processing():
         st.markdown("### 📊 Processing Status")
 
         app = get_pipeline()
-        results = []
 
         progress_bar = st.progress(0)
         status_text = st.empty()
@@ -562,58 +580,65 @@ def render_batch_processing():
         warning_count = 0
         error_count = 0
 
-        for i in range(batch_size):
-            try:
-                row = df.iloc[i]
-                name_for_log = row["name"] if "name" in row else "Unknown"
+        # Results are persisted as each provider completes, not at the end.
+        # The with block closes the sinks (flushing buffered rows and
+        # marking the Parquet batch) even if Streamlit stops or reruns the
+        # script mid-batch.
+        os.makedirs("data", exist_ok=True)
+        out_path = "data/final_results.csv"
+        with MultiSink(
+            CsvSink(out_path),
+            PartitionedParquetSink(PARQUET_ROOT) if PYARROW_AVAILABLE else None,
+        ) as sink:
+            for i in range(batch_size):
+                try:
+                    row = df.iloc[i]
+                    name_for_log = row["name"] if "name" in row else "Unknown"
 
-                status_text.info(
-                    f"🔄 Processing provider {i+1}/{batch_size}: **{name_for_log}**"
-                )
+                    status_text.info(
+                        f"🔄 Processing provider {i+1}/{batch_size}: **{name_for_log}**"
+                    )
 
-                # ✅ Correct: pass full row object to loader
-                provider = load_provider_with_pdf(row)
+                    # ✅ Correct: pass full row object to loader
+                    provider = load_provider_with_pdf(row)
 
-                result = app.invoke({"provider": provider})
-                final_profile = result.get("final_profile", {})
+                    result = app.invoke({"provider": provider})
+                    final_profile = result.get("final_profile", {})
 
-                final_profile["provider_id"] = int(row.get("id", i + 1))
-                if "name" not in final_profile and "name" in provider:
-                    final_profile["name"] = provider["name"]
+                    final_profile["provider_id"] = int(row.get("id", i + 1))
+                    if "name" not in final_profile and "name" in provider:
+                        final_profile["name"] = provider["name"]
 
-                results.append(final_profile)
+                    sink.write(final_profile)
 
-                risk = final_profile.get("risk_level", "UNKNOWN")
+                    risk = final_profile.get("risk_level", "UNKNOWN")
 
-                if risk == "HIGH":
-                    warning_count += 1
-                else:
-                    success_count += 1
+                    if risk == "HIGH":
+                        warning_count += 1
+                    else:
+                        success_count += 1
 
-                with log_expander:
-                    st.success(f"✅ {i+1}. {name_for_log} — Risk: {risk}")
+                    with log_expander:
+                        st.success(f"✅ {i+1}. {name_for_log} — Risk: {risk}")
 
-            except Exception as e:
-                error_count += 1
-                with log_expander:
-                    st.error(f"❌ {i+1}. {row.get('name','Unknown')} — Error: {str(e)}")
+                except Exception as e:
+                    error_count += 1
+                    with log_expander:
+                        st.error(f"❌ {i+1}. {row.get('name','Unknown')} — Error: {str(e)}")
 
-            progress = (i + 1) / batch_size
-            progress_bar.progress(progress)
+                progress = (i + 1) / batch_size
+                progress_bar.progress(progress)
 
-            metric_processed.metric("Processed", f"{i+1}/{batch_size}")
-            metric_success.metric("Success", success_count)
-            metric_warnings.metric("High Risk", warning_count)
-            metric_errors.metric("Errors", error_count)
+                metric_processed.metric("Processed", f"{i+1}/{batch_size}")
+                metric_success.metric("Success", success_count)
+                metric_warnings.metric("High Risk", warning_count)
+                metric_errors.metric("Errors", error_count)
 
         progress_bar.empty()
         status_text.empty()
 
-        if results:
-            out_df = pd.DataFrame(results)
-            os.makedirs("data", exist_ok=True)
-            out_path = "data/final_results.csv"
-            out_df.to_csv(out_path, index=False)
+        if sink.rows_written:
+            out_df = pd.read_csv(out_path)
 
             st.success(f"✅ Batch processing completed! Results saved to `{out_path}`")
 
@@ -621,7 +646,7 @@ def render_batch_processing():
             c1, c2, c3, c4 = st.columns(4)
 
             with c1:
-                st.metric("Total Processed", len(results))
+                st.metric("Total Processed", len(out_df))
 
             with c2:
                 if "confidence_overall" in out_df.columns:
@@ -633,8 +658,8 @@ def render_batch_processing():
                     st.metric("High Risk", (out_df["risk_level"] == "HIGH").sum())
 
             with c4:
-                if len(results) > 0:
-                    sr = (success_count / len(results)) * 100
+                if len(out_df) > 0:
+                    sr = (success_count / len(out_df)) * 100
                     st.metric("Success Rate", f"{sr:.1f}%")
 
             st.markdown("### 📋 Results Preview")
@@ -0,0 +1,72 @@
+"""
+Benchmark: keyword loops (`keyword.lower() in text.lower()` per keyword, as
+the specialty / KB lookups used to do) vs the shared Aho-Corasick
+KeywordMatcher, for growing keyword lists over a ~2 KB search snippet.
+Lists up to KeywordMatcher.SCAN_THRESHOLD use its str.find scan, longer ones
+the automaton.
+
+Run:
+python -m backend.bench_keywords
+"""
+
+import random
+import string
+import time
+
+from utils.keyword_matcher import KeywordMatcher
+
+KEYWORD_COUNTS = [10, 100, 1000, 5000]
+TEXT_CHARS = 2000
+ROUNDS = 50
+
+
+def make_keywords(n: int, rng: random.Random):
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(5, 12))))
+    return sorted(words)
+
+
+def make_text(keywords, rng: random.Random) -> str:
+    """Random words with a few keywords mixed in (like a search snippet)."""
+    parts = []
+    while sum(len(p) + 1 for p in parts) < TEXT_CHARS:
+        if rng.random() < 0.02:
+            parts.append(rng.choice(keywords).title())
+        else:
+            parts.append("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9))))
+    return " ".join(parts)
+
+
+def loop_match(keywords, text):
+    # Original pattern: one substring scan (and lowercase) per keyword
+    return [k for k in keywords if k.lower() in text.lower()]
+
+
+def timed(fn, rounds=ROUNDS) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    rng = random.Random(42)
+    print(f"Text: ~{TEXT_CHARS} chars, {ROUNDS} rounds each\n")
+    print(f"{'keywords':>9} {'build ms':>9} {'loop ms':>9} {'matcher ms':>13} {'speedup':>8}")
+    for n in KEYWORD_COUNTS:
+        keywords = make_keywords(n, rng)
+        text = make_text(keywords, rng)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(keywords)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        assert matcher.matched(text) == loop_match(keywords, text)
+        loop_ms = timed(lambda: loop_match(keywords, text))
+        auto_ms = timed(lambda: matcher.matched(text))
+        print(f"{n:>9} {build_ms:>9.1f} {loop_ms:>9.3f} {auto_ms:>13.3f} {loop_ms / auto_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: local NPI index (tools/npi_index.py) ingest throughput and
+lookup latency, on a synthetic file in the NPPES CSV format.
+
+Run:
+python -m backend.bench_npi_index [--rows 200000]
+
+The web-search lookup it replaces (tools/npi_tools.get_npi_data) takes
+about a second per provider and is rate-limited.
+"""
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from tools import npi_index
+from utils.npi import npi_check_digit
+
+FIRST_NAMES = ["John", "Mary", "Robert", "Patricia", "Michael", "Linda", "David", "Susan", "Wei", "Priya"]
+LAST_NAMES = ["Smith", "Johnson", "Garcia", "Lee", "Patel", "Nguyen", "O'Brien", "Kim", "Lopez", "Clark"]
+STATES = ["CA", "TX", "NY", "FL", "MA", "IL", "WA", "GA"]
+TAXONOMIES = list(npi_index.TAXONOMY_SPECIALTIES)
+
+HEADER = [
+    npi_index.COL_NPI, npi_index.COL_ENTITY_TYPE, "Replacement NPI", "Employer Identification Number (EIN)",
+    npi_index.COL_ORG_NAME, npi_index.COL_LAST_NAME, npi_index.COL_FIRST_NAME, npi_index.COL_MIDDLE_NAME,
+    npi_index.COL_CREDENTIAL, npi_index.COL_ADDRESS, npi_index.COL_CITY, npi_index.COL_STATE,
+    npi_index.COL_POSTAL_CODE, "Provider Business Practice Location Address Country Code (If outside U.S.)",
+    npi_index.COL_PHONE, "Provider Enumeration Date", "Last Update Date",
+    npi_index.COL_DEACTIVATION_DATE, npi_index.COL_REACTIVATION_DATE,
+] + [
+    col
+    for n in range(1, npi_index.TAXONOMY_SLOTS + 1)
+    for col in (f"Healthcare Provider Taxonomy Code_{n}", f"Provider License Number_{n}",
+                f"Provider License Number State Code_{n}", f"Healthcare Provider Primary Taxonomy Switch_{n}")
+]
+
+
+def write_synthetic_nppes(path: str, rows: int, rng: random.Random):
+    """NPPES-format CSV: mostly individuals, some organizations and deactivated NPIs."""
+    npis = [int(f"{p}{npi_check_digit(str(p))}") for p in rng.sample(range(100000000, 200000000), rows)]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(HEADER)
+        for i, npi in enumerate(npis):
+            row = dict.fromkeys(HEADER, "")
+            row[npi_index.COL_NPI] = npi
+            if i % 50 == 0:
+                row[npi_index.COL_DEACTIVATION_DATE] = "01/15/2020"
+            else:
+                is_org = i % 10 == 0
+                row[npi_index.COL_ENTITY_TYPE] = 2 if is_org else 1
+                if is_org:
+                    row[npi_index.COL_ORG_NAME] = f"{rng.choice(LAST_NAMES).upper()} MEDICAL GROUP {i} LLC"
+                else:
+                    row[npi_index.COL_FIRST_NAME] = rng.choice(FIRST_NAMES).upper()
+                    row[npi_index.COL_LAST_NAME] = f"{rng.choice(LAST_NAMES).upper()}{i}"
+                    row[npi_index.COL_CREDENTIAL] = "M.D."
+                row[npi_index.COL_ADDRESS] = f"{rng.randint(1, 9999)} MAIN ST"
+                row[npi_index.COL_CITY] = "SPRINGFIELD"
+                row[npi_index.COL_STATE] = rng.choice(STATES)
+                row[npi_index.COL_POSTAL_CODE] = f"{rng.randint(10000, 99999)}0000"
+                row[npi_index.COL_PHONE] = f"{rng.randint(2000000000, 9999999999)}"
+                slot = rng.randint(1, 3)
+                row[f"Healthcare Provider Taxonomy Code_{slot}"] = rng.choice(TAXONOMIES)
+                row[f"Healthcare Provider Primary Taxonomy Switch_{slot}"] = "Y"
+            writer.writerow(row.values())
+    return npis
+
+
+def time_lookups(fn, args, rounds: int):
+    samples = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        fn(*args[i % len(args)])
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "npidata_pfile.csv")
+        db_path = os.path.join(tmp, "npi_index.db")
+        npis = write_synthetic_nppes(csv_path, args.rows, rng)
+        print(f"Synthetic NPPES file: {args.rows:,} rows, {os.path.getsize(csv_path) / 1e6:.1f} MB")
+
+        result = npi_index.build_index(csv_path, db_path)
+        print(f"Ingest: {result['seconds']}s ({result['rows'] / result['seconds']:,.0f} rows/s), "
+              f"index {result['size_bytes'] / 1e6:.1f} MB")
+
+        index = npi_index.NPIIndex(db_path)
+        sample = rng.sample(npis, min(1000, len(npis)))
+        records = [r for r in (index.get(n) for n in sample) if r and r["name_key"] and r["entity_type"] == 1]
+        by_npi = [(n,) for n in sample]
+        by_name = [(r["name"], r["state"]) for r in records]
+        assert all(index.find(name, state) for name, state in by_name)
+
+        for label, fn, fn_args in (("get(npi)", index.get, by_npi), ("find(name, state)", index.find, by_name)):
+            median, p99 = time_lookups(fn, fn_args, args.lookups)
+            print(f"{label:>18}: median {median:.1f} us, p99 {p99:.1f} us")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: default FastAPI JSON encoding vs FastJSONResponse + compression
+on a synthetic 1,000-provider batch response.
+
+Run:
+python -m backend.bench_responses
+"""
+
+import gzip
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from backend.core.responses import FastJSONResponse, BROTLI_AVAILABLE, ORJSON_AVAILABLE
+
+N_PROVIDERS = 1000
+ROUNDS = 20
+
+
+def make_batch_response(n: int) -> dict:
+    results = []
+    for i in range(n):
+        results.append({
+            "input": {
+                "name": f"Dr. Provider {i}",
+                "npi": f"{1000000000 + i}",
+                "address": f"{i} Main St, Springfield, IL",
+                "phone": "(555) 010-0199",
+                "specialty": "Cardiology",
+                "license": f"IL-A{i:05d}",
+            },
+            "status": "processed",
+            "risk_level": ["LOW", "MEDIUM", "HIGH"][i % 3],
+            "confidence_score": 70.0 + (i % 30),
+            "final_data": {
+                "education": "Johns Hopkins School of Medicine",
+                "affiliations": ["General Hospital", "University Medical Center"],
+                "accepted_insurances": ["Aetna", "Cigna", "UnitedHealthcare"],
+            },
+            "flags": {
+                "phone_mismatch": False,
+                "address_mismatch": i % 4 == 0,
+                "specialty_mismatch": False,
+                "missing_license": False,
+            },
+        })
+    return {
+        "total_processed": n,
+        "successful": n,
+        "failed": 0,
+        "results": results,
+        "risk_summary": {"LOW": n // 3, "MEDIUM": n // 3, "HIGH": n - 2 * (n // 3)},
+        "avg_confidence": 84.5,
+    }
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    payload = make_batch_response(N_PROVIDERS)
+
+    default_body = JSONResponse(jsonable_encoder(payload)).body
+    default_ms = timed(lambda: JSONResponse(jsonable_encoder(payload)).body)
+
+    fast_body = FastJSONResponse(payload).body
+    fast_ms = timed(lambda: FastJSONResponse(payload).body)
+    gzip_body = gzip.compress(fast_body, compresslevel=5)
+    gzip_ms = timed(lambda: gzip.compress(FastJSONResponse(payload).body, compresslevel=5))
+
+    print(f"orjson: {ORJSON_AVAILABLE}, brotli: {BROTLI_AVAILABLE}")
+    print(f"default  : {default_ms:7.2f} ms  {len(default_body):>9,} bytes")
+    print(f"fast     : {fast_ms:7.2f} ms  {len(fast_body):>9,} bytes  ({default_ms / fast_ms:.1f}x faster)")
+    print(f"fast+gzip: {gzip_ms:7.2f} ms  {len(gzip_body):>9,} bytes  ({len(default_body) / len(gzip_body):.1f}x smaller)")
+
+    if BROTLI_AVAILABLE:
+        import brotli
+        br_body = brotli.compress(fast_body, quality=4)
+        br_ms = timed(lambda: brotli.compress(FastJSONResponse(payload).body, quality=4))
+        print(f"fast+br  : {br_ms:7.2f} ms  {len(br_body):>9,} bytes  ({len(default_body) / len(br_body):.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: difflib.SequenceMatcher ratio (what compare_tools used) vs
+utils.similarity on 100k realistic field pairs (phones, normalized
+addresses, specialties with typos), plus compare_data per provider vs
+compare_data_many.
+
+Also reports how often the 0.6 / 0.7 / 0.8 threshold decisions differ
+from difflib, and where levenshtein_similarity / jaro_winkler land for
+pairs difflib scores around 0.7.
+
+Run:
+python -m backend.bench_similarity [--pairs 100000]
+"""
+
+import argparse
+import difflib
+import random
+import statistics
+import time
+
+from tools.compare_tools import compare_data, compare_data_many, _normalize_address
+from utils.similarity import RAPIDFUZZ_AVAILABLE, ratio, ratio_many, levenshtein_similarity, jaro_winkler
+
+STREETS = ["Main Street", "Oak Avenue", "Maple Drive", "Sunset Boulevard", "Park Road", "Elm Street"]
+CITIES = ["Springfield, IL 62701", "Boston, MA 02115", "Austin, TX 73301", "Seattle, WA 98101"]
+SPECIALTIES = ["Cardiology", "Dermatology", "Pediatrics", "Radiology", "Oncology", "Neurology",
+               "Psychiatry", "Gastroenterology", "Endocrinology", "Orthopedics", "General Practice"]
+
+
+def mutate(s: str, rng: random.Random, edits: int) -> str:
+    chars = list(s)
+    for _ in range(edits):
+        op = rng.random()
+        i = rng.randrange(len(chars) + 1)
+        if op < 0.4 and i < len(chars):
+            chars[i] = rng.choice("0123456789abcdefghijklmnopqrstuvwxyz ")
+        elif op < 0.7 and i < len(chars):
+            del chars[i]
+        else:
+            chars.insert(i, rng.choice("0123456789abcdefghijklmnopqrstuvwxyz "))
+    return "".join(chars)
+
+
+def make_providers(n: int, rng: random.Random):
+    providers, google, npi = [], [], []
+    for _ in range(n):
+        phone = "".join(rng.choice("0123456789") for _ in range(10))
+        address = f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}"
+        specialty = rng.choice(SPECIALTIES)
+        other = rng.random() < 0.2  # a different provider entirely
+        providers.append({"phone": phone, "address": address, "specialty": specialty})
+        google.append({
+            "google_phone": "".join(rng.choice("0123456789") for _ in range(10)) if other
+            else mutate(phone, rng, rng.choice([0, 0, 1, 2, 3])),
+            "google_address": f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}" if other
+            else mutate(address, rng, rng.choice([0, 1, 3, 6, 10])),
+        })
+        npi.append({"npi_specialty": rng.choice(SPECIALTIES) if other
+                    else mutate(specialty, rng, rng.choice([0, 0, 1, 3]))})
+    return providers, google, npi
+
+
+def timed(fn, rounds: int = 3) -> float:
+    """Best of 'rounds' runs (the first also warms up imports and caches)."""
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=100000)
+    args = parser.parse_args()
+    rng = random.Random(11)
+
+    providers, google, npi = make_providers(args.pairs // 3, rng)
+    pairs = []
+    for p, g, n in zip(providers, google, npi):
+        pairs.append((p["phone"], g["google_phone"]))
+        pairs.append((_normalize_address(p["address"]), _normalize_address(g["google_address"])))
+        pairs.append((p["specialty"].lower(), n["npi_specialty"].lower()))
+
+    print(f"{len(pairs):,} pairs, rapidfuzz {'installed' if RAPIDFUZZ_AVAILABLE else 'not installed'}\n")
+    results = {}
+    t_difflib = timed(lambda: results.update(difflib=[difflib.SequenceMatcher(None, a, b).ratio() for a, b in pairs]))
+    t_scalar = timed(lambda: results.update(scalar=[ratio(a, b) for a, b in pairs]))
+    t_batch = timed(lambda: results.update(batch=ratio_many(pairs)))
+    print(f"{'difflib ratio loop':>22}: {t_difflib:6.2f}s")
+    print(f"{'ratio loop':>22}: {t_scalar:6.2f}s ({t_difflib / t_scalar:.1f}x)")
+    print(f"{'ratio_many':>22}: {t_batch:6.2f}s ({t_difflib / t_batch:.1f}x)")
+
+    t_one = timed(lambda: [compare_data(p, g, n) for p, g, n in zip(providers, google, npi)])
+    t_many = timed(lambda: compare_data_many(providers, google, npi))
+    print(f"\ncompare_data x{len(providers):,}: {t_one:.2f}s, compare_data_many: {t_many:.2f}s "
+          f"({t_one / t_many:.1f}x)")
+
+    old, new = results["difflib"], results["batch"]
+    assert all(abs(x - y) < 1e-9 for x, y in zip(new, results["scalar"]))
+    print("\nThreshold decisions that differ from difflib:")
+    for threshold in (0.6, 0.7, 0.8):
+        changed = sum((x >= threshold) != (y >= threshold) for x, y in zip(old, new))
+        print(f"  >= {threshold}: {changed:,} of {len(pairs):,} ({changed / len(pairs):.2%})")
+    print(f"  exact same score: {sum(abs(x - y) < 1e-9 for x, y in zip(old, new)) / len(pairs):.1%}, "
+          f"never lower: {all(y >= x - 1e-9 for x, y in zip(old, new))}")
+
+    near = [(a, b) for (a, b), r in zip(pairs, old) if 0.65 <= r <= 0.75][:5000]
+    if near:
+        print(f"\nPairs with difflib ratio 0.65-0.75 (n={len(near):,}): "
+              f"median levenshtein_similarity {statistics.median(levenshtein_similarity(a, b) for a, b in near):.2f}, "
+              f"median jaro_winkler {statistics.median(jaro_winkler(a, b) for a, b in near):.2f}")
+
+
+if __name__ == "__main__":
+    main()
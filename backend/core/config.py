@@ -31,6 +31,83 @@ class Settings(BaseSettings):
     BACKEND_PORT: int = int(os.getenv("BACKEND_PORT", 8000))
     ENV: str = os.getenv("ENV", "dev")
 
+    # Import the deferred services (research agent, pipeline) in the background
+    # right after startup. Off by default so serverless cold starts stay fast;
+    # turn on for long-running servers so the first request is not slower.
+    PRELOAD_SERVICES: bool = os.getenv("PRELOAD_SERVICES", "false").lower() == "true"
+
+    # Local NPPES index (python -m tools.npi_index builds it); validation
+    # falls back to the NPI Registry web lookup while it does not exist
+    NPI_INDEX_DB: str = os.getenv("NPI_INDEX_DB", os.path.join("data", "npi_index.db"))
+
+    # Responses larger than this (bytes) are gzip/brotli compressed
+    RESPONSE_COMPRESSION_MIN_BYTES: int = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", 1024))
+
+    # Research LLM calls: model, per-call timeout, concurrent calls, and how
+    # many callers may queue (and for how long) before getting a 503
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "gemini-1.5-flash")
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", 45))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+    LLM_MAX_QUEUE: int = int(os.getenv("LLM_MAX_QUEUE", 32))
+    LLM_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", 15))
+
+    # Research mode: "parallel" (retrieval tools fanned out, one synthesis
+    # LLM call) or "react" (LangChain ReAct agent, one LLM call per step)
+    RESEARCH_MODE: str = os.getenv("RESEARCH_MODE", "parallel")
+
+    # Parallel mode: seconds to wait for the retrieval tools (slower ones are
+    # left out), and the threads they share across requests
+    RESEARCH_TOOL_DEADLINE_SECONDS: float = float(os.getenv("RESEARCH_TOOL_DEADLINE_SECONDS", 8))
+    RESEARCH_TOOL_WORKERS: int = int(os.getenv("RESEARCH_TOOL_WORKERS", 16))
+
+    # A support article must cover this share (0-1) of a question for
+    # CustomerCare alone to answer it in parallel mode
+    RESEARCH_SUPPORT_ONLY_CONFIDENCE: float = float(os.getenv("RESEARCH_SUPPORT_ONLY_CONFIDENCE", 0.8))
+
+    # Questions covered this well (0-1) by a knowledge base article or an
+    # accepted answer are answered locally, without the LLM (1.1 = never)
+    RESEARCH_LOCAL_CONFIDENCE: float = float(os.getenv("RESEARCH_LOCAL_CONFIDENCE", 0.8))
+
+    # Research answers cached by normalized question (0 = caching off)
+    RESEARCH_CACHE_TTL_SECONDS: float = float(os.getenv("RESEARCH_CACHE_TTL_SECONDS", 3600))
+    RESEARCH_CACHE_MAX_ENTRIES: int = int(os.getenv("RESEARCH_CACHE_MAX_ENTRIES", 1024))
+
+    # Research memory retention (0 = no limit): messages older than the age
+    # limit or beyond the newest N per session / overall are moved to a
+    # compressed archive. Archived history is kept indefinitely unless
+    # RESEARCH_ARCHIVE_RETENTION_DAYS is set.
+    # The maintenance job (archive, purge, incremental VACUUM of at most
+    # RESEARCH_VACUUM_MAX_PAGES pages) runs every
+    # RESEARCH_MAINTENANCE_INTERVAL_SECONDS (0 = only via the API).
+    # All of this is opt-in: with the defaults nothing is archived or run on
+    # a schedule. To enable it, set the limits you want and an interval,
+    # e.g. RESEARCH_RETENTION_DAYS=90, RESEARCH_MAX_MESSAGES_PER_SESSION=500
+    # and RESEARCH_MAINTENANCE_INTERVAL_SECONDS=21600 (every 6 hours).
+    RESEARCH_RETENTION_DAYS: float = float(os.getenv("RESEARCH_RETENTION_DAYS", 0))
+    RESEARCH_MAX_MESSAGES_PER_SESSION: int = int(os.getenv("RESEARCH_MAX_MESSAGES_PER_SESSION", 0))
+    RESEARCH_MAX_MESSAGES: int = int(os.getenv("RESEARCH_MAX_MESSAGES", 0))
+    RESEARCH_ARCHIVE_RETENTION_DAYS: float = float(os.getenv("RESEARCH_ARCHIVE_RETENTION_DAYS", 0))
+    RESEARCH_MAINTENANCE_INTERVAL_SECONDS: float = float(os.getenv("RESEARCH_MAINTENANCE_INTERVAL_SECONDS", 0))
+    RESEARCH_VACUUM_MAX_PAGES: int = int(os.getenv("RESEARCH_VACUUM_MAX_PAGES", 5000))
+
+    # Outbound email (empty SMTP_HOST = mock sending, nothing leaves the box)
+    # For local load tests run `python -m backend.smtp_sink` and set
+    # SMTP_HOST=127.0.0.1, SMTP_PORT=8025.
+    SMTP_HOST: str = os.getenv("SMTP_HOST", "")
+    SMTP_PORT: int = int(os.getenv("SMTP_PORT", 587))
+    SMTP_USER: str = os.getenv("SMTP_USER", "")
+    SMTP_PASSWORD: str = os.getenv("SMTP_PASSWORD", "")
+    SMTP_STARTTLS: bool = os.getenv("SMTP_STARTTLS", "false").lower() == "true"
+    SMTP_TIMEOUT_SECONDS: float = float(os.getenv("SMTP_TIMEOUT_SECONDS", 15))
+    EMAIL_FROM: str = os.getenv("EMAIL_FROM", "provider-quality@caregrid.local")
+
+    # Bulk outreach: SMTP connections, sends/second per recipient domain
+    # (0 = unlimited) and attempts per message for transient failures
+    OUTREACH_WORKERS: int = int(os.getenv("OUTREACH_WORKERS", 20))
+    OUTREACH_DOMAIN_RATE: float = float(os.getenv("OUTREACH_DOMAIN_RATE", 50))
+    OUTREACH_MAX_ATTEMPTS: int = int(os.getenv("OUTREACH_MAX_ATTEMPTS", 4))
+    OUTREACH_LEDGER_DB: str = os.getenv("OUTREACH_LEDGER_DB", os.path.join("data", "outreach_ledger.db"))
+
     class Config:
         env_file = ".env"
         case_sensitive = True
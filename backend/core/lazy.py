@@ -0,0 +1,78 @@
+"""
+File: backend/core/lazy.py
+Purpose:
+Deferred imports for heavy service modules.
+
+Routers reference their service through a LazyModule instead of importing
+it at the top of the file, so `import backend.main` (and every serverless
+cold start) only pays for FastAPI itself. The real module is imported on
+first attribute access, e.g. on the first request that needs it.
+
+    research_service = lazy_module("backend.services.research_service")
+    ...
+    research_service.run_research_query(...)   # imported here, once
+
+How long each deferred import took is kept in DEFERRED_IMPORT_MS for the
+startup profiling report (python -m backend.profile_startup).
+"""
+
+import importlib
+import threading
+import time
+from typing import Dict, List
+
+# module name -> import time (ms) when it was first used
+DEFERRED_IMPORT_MS: Dict[str, float] = {}
+
+_registry: List["LazyModule"] = []
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    DEFERRED_IMPORT_MS[self._name] = round((time.perf_counter() - start) * 1000, 1)
+                    self._module = module
+        return self._module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "deferred"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_module(name: str) -> LazyModule:
+    """Create (and register) a deferred module reference."""
+    module = LazyModule(name)
+    _registry.append(module)
+    return module
+
+
+def preload_all():
+    """Import every registered module now (used to warm long-running servers)."""
+    for module in _registry:
+        module.load()
+
+
+def lazy_status() -> Dict[str, object]:
+    """Which deferred modules are loaded, and what their import cost."""
+    return {
+        "deferred": [m._name for m in _registry if not m.loaded],
+        "loaded_ms": dict(DEFERRED_IMPORT_MS),
+    }
@@ -0,0 +1,135 @@
+"""
+File: backend/core/responses.py
+Purpose:
+Fast JSON encoding and response compression for large API payloads.
+
+- FastJSONResponse : serializes with orjson when it is installed
+                     (falls back to compact stdlib json otherwise)
+- CompressedRoute  : APIRoute that gzip/brotli-compresses response bodies
+                     above a size threshold, based on Accept-Encoding
+
+Usage:
+    router = APIRouter(
+        default_response_class=FastJSONResponse,
+        route_class=CompressedRoute
+    )
+
+Returning FastJSONResponse(result) directly from an endpoint also skips
+FastAPI's jsonable_encoder pass, which dominates encode time for large dicts.
+"""
+
+import gzip
+import json
+from typing import Any, Callable, Optional
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.routing import APIRoute
+
+from backend.core.config import get_settings
+
+# Optional fast encoders / compressors
+ORJSON_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    pass
+
+BROTLI_AVAILABLE = False
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    pass
+
+# Tuned for dynamic content: fast levels, most of the size win
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson (numpy scalars/arrays supported,
+    NaN rendered as null). Falls back to compact stdlib json.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                content,
+                default=str,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            )
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=str,
+        ).encode("utf-8")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick 'br' or 'gzip' from an Accept-Encoding header.
+    Codings listed with q=0 are treated as refused.
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(coding.strip())
+
+    if BROTLI_AVAILABLE and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def compress_response(request: Request, response: Response) -> Response:
+    """
+    Compress a fully-rendered response in place if it is large enough
+    and the client accepts a supported encoding.
+    Streaming responses and already-encoded bodies are left untouched.
+    """
+    if isinstance(response, StreamingResponse) or "content-encoding" in response.headers:
+        return response
+
+    body = getattr(response, "body", b"")
+    if len(body) < get_settings().RESPONSE_COMPRESSION_MIN_BYTES:
+        return response
+
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+    if encoding is None:
+        return response
+
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+    response.body = compressed
+    response.headers["content-length"] = str(len(compressed))
+    response.headers["content-encoding"] = encoding
+    vary = response.headers.get("vary")
+    response.headers["vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+    return response
+
+
+class CompressedRoute(APIRoute):
+    """
+    Route class that compresses large responses after the endpoint runs.
+    Scoped per router (unlike a global middleware), so SSE streams and
+    small health checks elsewhere are unaffected.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def compressed_handler(request: Request) -> Response:
+            response = await handler(request)
+            return compress_response(request, response)
+
+        return compressed_handler
@@ -10,13 +10,24 @@ It performs 3 main jobs:
 
 How to Run:
 uvicorn backend.main:app --reload
+
+Startup is kept light: routers import their heavy services (pandas,
+LangGraph, google.generativeai, ReportLab) on first use, and databases /
+job history are initialized on first access. Profile it with:
+python -m backend.profile_startup
 """
 
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 # Use relative imports if running from backend dir, or absolute if running as module
 # We will use absolute imports and run with python -m backend.main or uvicorn backend.main:app
 from backend.routers import agents_router, reports, jobs, research_router
+from backend.core.config import get_settings
+from backend.core.lazy import preload_all
 
 import os
 from dotenv import load_dotenv
@@ -32,11 +43,34 @@ if api_key:
 else:
     print("❌ GOOGLE_API_KEY NOT FOUND in environment")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Optionally warm deferred services without blocking startup, and
+    schedule research memory maintenance (retention + VACUUM).
+    """
+    settings = get_settings()
+    if settings.PRELOAD_SERVICES:
+        def warm():
+            from backend.services.agent_service import get_pipeline
+            preload_all()
+            get_pipeline()
+        threading.Thread(target=warm, name="preload-services", daemon=True).start()
+
+    maintenance = None
+    if settings.RESEARCH_MAINTENANCE_INTERVAL_SECONDS > 0:
+        from backend.services.memory_maintenance import maintenance_loop
+        maintenance = asyncio.create_task(maintenance_loop(settings.RESEARCH_MAINTENANCE_INTERVAL_SECONDS))
+    yield
+    if maintenance is not None:
+        maintenance.cancel()
+
 # 1. Initialize App
 app = FastAPI(
     title="CareGrid AI Engine",
     description="Backend API for CareGrid Provider Intelligence Platform",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # 2. Configure CORS (Cross-Origin Resource Sharing)
@@ -53,6 +87,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all methods (GET, POST, etc.)
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["ETag", "Last-Modified", "X-Next-Cursor"],  # Readable by the browser
 )
 
 # 3. Register Routers
@@ -0,0 +1,84 @@
+"""
+Startup profile: how long `import backend.main` takes and where the time goes.
+
+1. Imports backend.main in a fresh interpreter with -X importtime (a cold
+   start, like a serverless instance) and prints the total, the slowest
+   modules and any heavy package that was pulled in at import time.
+2. Imports the deferred services in-process and prints what each one costs
+   on first use.
+
+Run:
+python -m backend.profile_startup [top_n]
+"""
+
+import subprocess
+import sys
+import time
+
+# Packages that should only load on first use
+HEAVY_PACKAGES = [
+    "pandas", "numpy", "langgraph", "langchain", "langchain_community",
+    "google.generativeai", "reportlab", "pyarrow", "duckduckgo_search",
+]
+
+PROJECT_PACKAGES = ("backend", "pipeline", "agents", "tools", "utils", "database")
+
+COLD_IMPORT = "import time; t = time.perf_counter(); import backend.main; print(time.perf_counter() - t)"
+
+
+def parse_importtime(stderr: str):
+    """Yield (name, self_us, cumulative_us) from -X importtime output."""
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        head, cumulative_us, name = line.split("|", 2)
+        self_us = int(head.split(":")[1])
+        yield name.strip(), self_us, int(cumulative_us)
+
+
+def cold_start_seconds() -> float:
+    """Wall time of a plain cold import (no importtime overhead)."""
+    out = subprocess.run([sys.executable, "-c", COLD_IMPORT], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    top_n = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+
+    wall = min(cold_start_seconds() for _ in range(3))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import backend.main"],
+                          capture_output=True, text=True, check=True)
+    modules = list(parse_importtime(proc.stderr))
+    loaded = {name for name, *_ in modules}
+
+    print(f"Cold start (import backend.main, best of 3): {wall * 1000:.0f} ms\n")
+
+    print("Slowest project modules (cumulative):")
+    ours = [m for m in modules if m[0].split(".")[0] in PROJECT_PACKAGES]
+    for name, _, cumulative in sorted(ours, key=lambda m: -m[2])[:top_n]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    print("\nSlowest modules overall (self time):")
+    for name, self_us, _ in sorted(modules, key=lambda m: -m[1])[:top_n]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    eager = [p for p in HEAVY_PACKAGES if p in loaded]
+    print(f"\nHeavy packages imported at startup: {', '.join(eager) if eager else 'none'}")
+
+    # Phase 2: what the deferred modules cost on first use
+    import backend.main  # noqa: F401
+    from backend.core.lazy import preload_all, DEFERRED_IMPORT_MS
+    from backend.services.agent_service import get_pipeline
+
+    preload_all()
+    start = time.perf_counter()
+    get_pipeline()
+    DEFERRED_IMPORT_MS["pipeline (build_pipeline)"] = round((time.perf_counter() - start) * 1000, 1)
+
+    print("\nDeferred to first use:")
+    for name, ms in sorted(DEFERRED_IMPORT_MS.items(), key=lambda kv: -kv[1]):
+        print(f"  {ms:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
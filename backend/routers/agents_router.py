@@ -8,17 +8,21 @@ Endpoints:
 - POST /api/agents/validate : Triggers validation
 - POST /api/agents/enrich   : Triggers enrichment
 - POST /api/agents/score    : Triggers scoring
+- POST /api/batch/upload    : Streams a provider CSV into the batch engine
 
 It uses 'pydantic' models to ensure data is correct before processing.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Request
+from fastapi.responses import StreamingResponse, Response
+from email.utils import formatdate, parsedate_to_datetime
 import json
 import asyncio
-from typing import Dict, Any
+import hashlib
+from typing import Dict, Any, Optional
 
 # Absolute imports for running as 'python -m backend.main'
+from backend.core.responses import FastJSONResponse, CompressedRoute
 from backend.schemas.request_models import ProviderInput, AgentResponse, BatchProviderInput, BatchAnalysisResponse
 from backend.services.agent_service import (
     run_validation,
@@ -28,7 +32,7 @@ from backend.services.agent_service import (
     run_batch_pipeline,
     run_full_pipeline,
     get_pipeline,
-    load_providers_csv,
+    query_providers,
     run_bulk_validation,
     run_bulk_enrichment,
     start_monitoring,
@@ -36,11 +40,15 @@ from backend.services.agent_service import (
     get_monitoring_status,
     check_for_changes
 )
+from backend.services.ingest_service import spool_upload, run_csv_ingest, DEFAULT_CHUNK_SIZE
+from backend.services.job_service import job_service
 
 # Create a router instance.
 router = APIRouter(
     prefix="/api",
-    tags=["AI Agents"]
+    tags=["AI Agents"],
+    default_response_class=FastJSONResponse,
+    route_class=CompressedRoute
 )
 
 @router.post("/validate-provider", response_model=AgentResponse)
@@ -123,11 +131,47 @@ async def batch_process_endpoint(batch_input: BatchProviderInput):
         
         result = run_batch_pipeline(providers_list)
         
-        return BatchAnalysisResponse(**result)
+        # Returned directly: skips response_model validation and the
+        # jsonable_encoder pass, which dominate encode time on large batches
+        return FastJSONResponse(result)
     except Exception as e:
         print(f"Batch Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/batch/upload")
+async def batch_upload_endpoint(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+):
+    """
+    Endpoint: Streaming CSV Batch Ingestion
+    path: /api/batch/upload
+
+    Accepts a multipart CSV upload (columns: name, npi, address, phone,
+    specialty, license). The file is spooled to disk and processed in
+    chunks by a background job, so large files never sit in RAM.
+    Poll /api/jobs/{job_id} for progress.
+    """
+    if chunk_size < 1:
+        raise HTTPException(status_code=400, detail="chunk_size must be positive")
+
+    job_id = job_service.create_job("csv_ingest", user="admin")
+    try:
+        path = await spool_upload(file)
+    except Exception as e:
+        job_service.update_job(job_id, "failed", details=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
+
+    background_tasks.add_task(run_csv_ingest, job_id, path, chunk_size)
+
+    return {
+        "status": "accepted",
+        "job_id": job_id,
+        "filename": file.filename,
+        "chunk_size": chunk_size
+    }
+
 @router.get("/analytics")
 async def get_analytics():
     """
@@ -164,25 +208,70 @@ async def get_agent_status():
 # ============================================
 
 @router.get("/providers")
-async def get_providers():
-    """
-    Endpoint: Get all providers from CSV
+async def get_providers(
+    request: Request,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    q: Optional[str] = None
+):
+    """
+    Endpoint: Get providers from CSV
     path: /api/providers
     Returns list of providers for frontend dropdown.
+
+    - offset/limit : pagination (no limit = all providers)
+    - q            : case-insensitive name prefix search
+
+    Responses carry ETag/Last-Modified; a matching If-None-Match or
+    If-Modified-Since gets a 304 with no body.
     """
+    if offset < 0 or (limit is not None and limit < 0):
+        raise HTTPException(status_code=400, detail="offset and limit must be non-negative")
+
     try:
-        providers = load_providers_csv()
-        return {
-            "status": "success",
-            "count": len(providers),
-            "providers": providers
-        }
+        result = query_providers(offset=offset, limit=limit, q=q)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    # The ETag covers the file version and the query, since each page is
+    # a different representation of the same file. Hashed so any q is a
+    # valid (latin-1, quote-free) header value.
+    key = f'{result["version"]}\x00{offset}\x00{limit}\x00{q or ""}'
+    etag = f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()}"'
+    last_modified = formatdate(result["mtime"], usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": "no-cache"
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_none_match is not None:
+        if etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+    elif if_modified_since:
+        try:
+            if int(result["mtime"]) <= parsedate_to_datetime(if_modified_since).timestamp():
+                return Response(status_code=304, headers=headers)
+        except (TypeError, ValueError):
+            pass
+
+    return FastJSONResponse(
+        content={
+            "status": "success",
+            "count": len(result["providers"]),
+            "total": result["total"],
+            "offset": offset,
+            "providers": result["providers"]
+        },
+        headers=headers
+    )
+
 # Helper function to get a fresh pipeline instance
 def get_fresh_pipeline():
     """Create a fresh LangGraph pipeline for every request to avoid state leakage."""
+    from pipeline.pipeline_graph import build_pipeline
     return build_pipeline()
 
 @router.post("/run-pipeline")
@@ -197,44 +286,107 @@ async def run_pipeline_endpoint(provider: ProviderInput):
     try:
         provider_dict = provider.model_dump()
         result = run_full_pipeline(provider_dict)
-        return result
+        return FastJSONResponse(result)
     except Exception as e:
         print(f"Pipeline Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Seconds of silence before a compact stream emits a heartbeat comment
+STREAM_HEARTBEAT_SECONDS = 10
+
+
+def _sse(payload: Dict[str, Any]) -> str:
+    """Serialize one compact SSE data frame."""
+    return f"data: {json.dumps(payload, separators=(',', ':'), default=str)}\n\n"
+
+
+async def _compact_events(pipeline, initial_state: Dict[str, Any]):
+    """
+    Compact stream: one event per finished node, carrying only the state
+    keys that node produced. Keeps a heartbeat going while a node runs.
+    """
+    from pipeline.pipeline_graph import NODE_OUTPUT_KEYS
+
+    updates = pipeline.astream(initial_state, stream_mode="updates").__aiter__()
+    seq = 0
+    next_update = asyncio.ensure_future(updates.__anext__())
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_update}, timeout=STREAM_HEARTBEAT_SECONDS)
+            if not done:
+                # SSE comment: keeps proxies from closing the connection,
+                # ignored by the browser's event parser.
+                yield ": hb\n\n"
+                continue
+            try:
+                chunk = next_update.result()
+            except StopAsyncIteration:
+                break
+            for node, state in chunk.items():
+                keys = NODE_OUTPUT_KEYS.get(node)
+                if keys is None or not state:
+                    continue
+                seq += 1
+                yield _sse({
+                    "t": "node",
+                    "seq": seq,
+                    "node": node,
+                    "delta": {k: state.get(k) for k in keys}
+                })
+            next_update = asyncio.ensure_future(updates.__anext__())
+    finally:
+        if not next_update.done():
+            next_update.cancel()
+
+
+async def _full_events(pipeline, initial_state: Dict[str, Any]):
+    """Verbose stream: every chain/tool event from astream_events."""
+    # astream_events provides granular events (tool calls, node transitions)
+    async for event in pipeline.astream_events(initial_state, version="v1"):
+        kind = event["event"]
+
+        # We are interested in Node transitions and Tool executions
+        if kind in ["on_chain_start", "on_chain_end", "on_tool_start", "on_tool_end"]:
+            # Create a simplified event object for frontend
+            payload = {
+                "type": kind,
+                "name": event["name"],
+                "data": str(event["data"])[:1000] # Truncate large data to avoid SSE issues
+            }
+
+            # Extract specific outputs if available
+            if "output" in event["data"]:
+                payload["output"] = event["data"]["output"]
+            if "input" in event["data"]:
+                 payload["input"] = event["data"]["input"]
+
+            yield f"data: {json.dumps(payload)}\n\n"
+
+
 @router.post("/run-stream")
-async def run_pipeline_stream(provider: ProviderInput):
+async def run_pipeline_stream(provider: ProviderInput, mode: str = "full"):
     """
     Stream the LangGraph pipeline execution using Server-Sent Events (SSE).
     This allows the frontend to see 'internal working' of agents in real-time.
+
+    Modes:
+    - full    : every chain/tool event, with full input/output states
+    - compact : one {"t": "node", "seq", "node", "delta"} event per agent,
+                plus heartbeat comments while an agent is running
     """
+    if mode not in ("full", "compact"):
+        raise HTTPException(status_code=400, detail="mode must be 'full' or 'compact'")
+
     pipeline = get_pipeline()
-    
+    events = _compact_events if mode == "compact" else _full_events
+
     async def event_generator():
         initial_state = {"provider": provider.model_dump()}
-        
+
         try:
-            # astream_events provides granular events (tool calls, node transitions)
-            async for event in pipeline.astream_events(initial_state, version="v1"):
-                kind = event["event"]
-                
-                # We are interested in Node transitions and Tool executions
-                if kind in ["on_chain_start", "on_chain_end", "on_tool_start", "on_tool_end"]:
-                    # Create a simplified event object for frontend
-                    payload = {
-                        "type": kind,
-                        "name": event["name"],
-                        "data": str(event["data"])[:1000] # Truncate large data to avoid SSE issues
-                    }
-                    
-                    # Extract specific outputs if available
-                    if "output" in event["data"]:
-                        payload["output"] = event["data"]["output"]
-                    if "input" in event["data"]:
-                         payload["input"] = event["data"]["input"]
-
-                    yield f"data: {json.dumps(payload)}\n\n"
-                    
+            async for frame in events(pipeline, initial_state):
+                yield frame
+
             yield "data: [DONE]\n\n"
 
         except Exception as e:
@@ -256,7 +408,7 @@ async def validate_bulk_endpoint(batch_input: BatchProviderInput):
     try:
         providers_list = [p.model_dump() for p in batch_input.providers]
         result = run_bulk_validation(providers_list, clean_data=True)
-        return result
+        return FastJSONResponse(result)
     except Exception as e:
         print(f"Bulk Validation Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -271,7 +423,7 @@ async def enrich_bulk_endpoint(batch_input: BatchProviderInput):
     try:
         providers_list = [p.model_dump() for p in batch_input.providers]
         result = run_bulk_enrichment(providers_list, save_to_db=True)
-        return result
+        return FastJSONResponse(result)
     except Exception as e:
         print(f"Bulk Enrichment Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,10 +1,13 @@
 from fastapi import APIRouter
 from typing import List
 from ..services.job_service import job_service
+from ..core.responses import FastJSONResponse, CompressedRoute
 
 router = APIRouter(
     prefix="/api/jobs",
-    tags=["jobs"]
+    tags=["jobs"],
+    default_response_class=FastJSONResponse,
+    route_class=CompressedRoute
 )
 
 @router.get("/history")
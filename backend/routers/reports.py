@@ -1,67 +1,225 @@
+import os
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from fastapi.responses import Response, JSONResponse
+from fastapi.responses import Response, JSONResponse, StreamingResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from ..services.export_service import ExportService
 from ..services.email_service import email_service, EmailService
 from ..services.job_service import job_service
+from ..services.report_service import report_service
+from ..core.responses import FastJSONResponse, CompressedRoute
+from ..core.lazy import lazy_module
+from database.db import search_provider_results
+
+# smtplib/email stack: imported when the first campaign starts
+outreach_service = lazy_module("backend.services.outreach_service")
 
 router = APIRouter(
     prefix="/api/reports",
-    tags=["reports"]
+    tags=["reports"],
+    default_response_class=FastJSONResponse,
+    route_class=CompressedRoute
 )
 
 # --- Schemas ---
 class ExportRequest(BaseModel):
-    format: str = "csv" # csv or json
+    format: str = "csv" # csv, ndjson, json or parquet
+    filters: Optional[Dict[str, Any]] = None
+    since: Optional[str] = None # change cursor (id) or timestamp for delta exports
+
+class SummaryReportRequest(BaseModel):
+    batch_id: Optional[str] = None
     filters: Optional[Dict[str, Any]] = None
 
+class EmailDraftRequest(BaseModel):
+    filters: Optional[Dict[str, Any]] = None # export filters over stored results
+    results: Optional[List[Dict[str, Any]]] = None # or in-memory {final_profile, quality_data}
+
 class EmailRequest(BaseModel):
     template_id: str
     recipients: List[str]
     data: Optional[Dict[str, Any]] = None
 
+class BulkEmailRequest(BaseModel):
+    template_id: str = "discrepancy_notice"
+    providers: List[Dict[str, Any]] # each needs an 'email'; 'quality' feeds discrepancy notices
+    campaign_id: Optional[str] = None # reuse to resend only undelivered messages
+
 # --- Endpoints ---
 
 @router.post("/export")
 async def export_data(request: ExportRequest, background_tasks: BackgroundTasks):
     """
     Trigger a data export.
-    Returns: File download or Job ID if async.
-    For this MVP, we return the file directly for small datasets.
+    Streams provider_results from the database as CSV, NDJSON or JSON
+    (Parquet is written to a temp file first, then served).
+    Filters (risk_level, status, specialty, provider_id, min_confidence,
+    max_confidence, created_after, created_before) are applied in SQL.
     """
+    # 1. Log Job Start
+    job_id = job_service.create_job("data_export", user="admin")
+
     try:
-        # 1. Log Job Start
-        job_id = job_service.create_job("data_export", user="admin")
-        
-        # 2. Get Data (Mocking fetching from DB or Agent Service)
-        # In a real app, inject ProviderService here.
-        # We'll use dummy data for demonstration if DB isn't connected
-        mock_providers = [
-            {"id": 1, "name": "Dr. Smith", "npi": "1234567890", "status": "active"},
-            {"id": 2, "name": "Dr. Doe", "npi": "0987654321", "status": "inactive"},
-            {"id": 3, "name": "General Hospital", "npi": "1122334455", "status": "review_needed"},
-        ]
-        
-        # 3. Process Export
-        result = ExportService.export_provider_data(mock_providers, request.format)
-        
-        # 4. Log Completion
-        job_service.update_job(job_id, "completed", details=f"Exported {len(mock_providers)} records to {request.format}")
-
-        # 5. Return Response
-        return Response(
-            content=result["content"],
-            media_type=result["media_type"],
-            headers={"Content-Disposition": f"attachment; filename={result['filename']}"}
-        )
+        # Parquet needs a seekable file (footer at the end): write row groups
+        # to a temp file (in a worker thread, off the event loop), then
+        # serve and delete it.
+        if request.format.lower() == "parquet":
+            result = await run_in_threadpool(ExportService.export_parquet_file, request.filters, request.since)
+            job_service.update_job(job_id, "completed", details=f"Exported {result['rows']} records to parquet")
+            return FileResponse(
+                result["path"],
+                media_type=result["media_type"],
+                filename=result["filename"],
+                headers=_cursor_headers(result),
+                background=BackgroundTask(os.remove, result["path"])
+            )
 
+        # 2. Open the streaming export (validates format + filters, runs the
+        # first query) in a worker thread, off the event loop
+        result = await run_in_threadpool(
+            ExportService.stream_provider_results, request.format, request.filters, request.since
+        )
+    except ValueError as e:
+        job_service.update_job(job_id, "failed", details=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Log Failure
-        if 'job_id' in locals():
-            job_service.update_job(job_id, "failed", details=str(e))
+        job_service.update_job(job_id, "failed", details=str(e))
         raise HTTPException(status_code=500, detail=str(e))
 
+    # 3. Return Response (job completes when the stream is drained)
+    return StreamingResponse(
+        _track_export(job_id, result["content"], request.format),
+        media_type=result["media_type"],
+        headers={
+            "Content-Disposition": f"attachment; filename={result['filename']}",
+            **_cursor_headers(result)
+        }
+    )
+
+
+def _cursor_headers(result: Dict[str, Any]) -> Dict[str, str]:
+    """X-Next-Cursor header for delta exports (empty for full exports)."""
+    if result.get("next_cursor") is None:
+        return {}
+    return {"X-Next-Cursor": str(result["next_cursor"])}
+
+
+def _track_export(job_id: str, chunks: Iterator[str], format: str) -> Iterator[str]:
+    """
+    Pass export chunks through, logging job completion or failure
+    once the stream ends (or cancellation if the client disconnects).
+    """
+    sent = 0
+    try:
+        for chunk in chunks:
+            sent += len(chunk)
+            yield chunk
+        job_service.update_job(job_id, "completed", details=f"Exported {sent} bytes to {format}")
+    except GeneratorExit:
+        job_service.update_job(job_id, "cancelled", details=f"Client disconnected after {sent} bytes")
+        raise
+    except Exception as e:
+        job_service.update_job(job_id, "failed", details=str(e))
+        raise
+
+@router.get("/results/search")
+async def search_results(
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    risk_level: Optional[str] = None,
+    status: Optional[str] = None,
+    batch_id: Optional[str] = None
+):
+    """
+    Full-text search over stored provider results (name, address,
+    specialty and flags such as "Specialty mismatch" or phone_mismatch).
+    Results are ranked best match first and paginated with limit/offset.
+    """
+    filters = {"risk_level": risk_level, "status": status, "batch_id": batch_id}
+    try:
+        result = search_provider_results(q, limit=limit, offset=offset, filters=filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "status": "success",
+        "count": len(result["results"]),
+        **result
+    }
+
+@router.post("/summary-pdf")
+async def request_summary_pdf(request: SummaryReportRequest, background_tasks: BackgroundTasks):
+    """
+    Request a PDF summary report for a batch and/or filter set.
+    Cached reports are returned as ready; otherwise rendering runs as a
+    background job and the client polls GET /summary-pdf/{report_id}.
+    """
+    try:
+        result = report_service.request_report(request.batch_id, request.filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if result.pop("start"):
+        background_tasks.add_task(
+            report_service.render_report,
+            result["report_id"],
+            result["job_id"],
+            request.batch_id,
+            request.filters
+        )
+    return result
+
+@router.get("/summary-pdf/{report_id}")
+async def download_summary_pdf(report_id: str):
+    """
+    Download a finished summary report (202 while it is still rendering).
+    """
+    path = report_service.get_cached(report_id)
+    if path:
+        return FileResponse(path, media_type="application/pdf", filename=f"summary_{report_id}.pdf")
+
+    status = report_service.get_status(report_id)
+    if status["status"] == "pending":
+        return JSONResponse(status, status_code=202)
+    raise HTTPException(status_code=404, detail="Report not found")
+
+@router.get("/email-draft/{provider_id}")
+async def get_email_draft(provider_id: str):
+    """
+    Render the discrepancy email draft for a provider's latest result.
+    Drafts are generated on demand instead of inside the pipeline.
+    """
+    try:
+        draft = email_service.draft_for_provider(provider_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if draft is None:
+        raise HTTPException(status_code=404, detail="No results for provider")
+    return draft
+
+@router.post("/email-drafts")
+async def render_email_drafts(request: EmailDraftRequest):
+    """
+    Bulk render email drafts.
+    With 'results', drafts are rendered from the given pipeline outputs;
+    otherwise from stored results matching 'filters', streamed as NDJSON.
+    """
+    if request.results is not None:
+        return list(email_service.iter_profile_drafts(request.results))
+
+    try:
+        drafts = email_service.iter_drafts(request.filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(ExportService.iter_ndjson(drafts), media_type="application/x-ndjson")
+
 @router.get("/templates")
 async def get_email_templates():
     """
@@ -88,9 +246,10 @@ async def send_report_email(request: EmailRequest, background_tasks: BackgroundT
     
     return {"message": "Email sending initiated", "job_id": job_id}
 
-async def _process_email_sending(job_id: str, template_id: str, recipients: List[str], data: Any):
+def _process_email_sending(job_id: str, template_id: str, recipients: List[str], data: Any):
     """
     Background task wrapper for email sending to ensure job logging.
+    Sync so SMTP I/O runs in the threadpool, not on the event loop.
     """
     try:
         success = email_service.send_email(template_id, recipients, data)
@@ -99,3 +258,36 @@ async def _process_email_sending(job_id: str, template_id: str, recipients: List
         job_service.update_job(job_id, status, details=details)
     except Exception as e:
         job_service.update_job(job_id, "failed", details=f"Error: {str(e)}")
+
+@router.post("/email/bulk")
+async def send_bulk_email(request: BulkEmailRequest):
+    """
+    Start a bulk outreach campaign (one email per provider).
+    Runs on its own worker pool outside the request; poll the job or
+    GET /email/campaigns/{campaign_id} for progress.
+    """
+    try:
+        email_service.get_template(request.template_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job_id = job_service.create_job("email_campaign", user="admin")
+    campaign_id = request.campaign_id or job_id
+    outreach_service.start_campaign(
+        email_service.iter_outreach_items(request.template_id, request.providers),
+        campaign_id,
+        job_id
+    )
+    return {
+        "message": "Email campaign started",
+        "job_id": job_id,
+        "campaign_id": campaign_id,
+        "providers": len(request.providers)
+    }
+
+@router.get("/email/campaigns/{campaign_id}")
+async def get_campaign_status(campaign_id: str):
+    """
+    Delivery counts per status from the send ledger.
+    """
+    return outreach_service.campaign_status(campaign_id)
@@ -5,17 +5,17 @@ API endpoints for the Medical Research Agent.
 Provides chat-style research queries and conversation history with SQLite persistence.
 """
 
-from fastapi import APIRouter, HTTPException
+import json
+from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict
-from backend.services.research_service import (
-    run_research_query,
-    get_conversation_history,
-    clear_conversation_history,
-    get_all_sessions,
-    delete_session,
-    get_memory_stats
-)
+from backend.core.lazy import lazy_module
+from backend.core.config import get_settings
+
+# google.generativeai + langchain tools: imported on the first research request
+research_service = lazy_module("backend.services.research_service")
+memory_service = lazy_module("backend.services.memory_service")
 
 
 router = APIRouter(
@@ -32,6 +32,8 @@ class ResearchQuery(BaseModel):
     """Request model for research queries."""
     query: str
     session_id: Optional[str] = "default"
+    use_cache: bool = True  # False forces a fresh answer
+    mode: Optional[str] = None  # "parallel" or "react" (default: RESEARCH_MODE)
 
 
 class ResearchResponse(BaseModel):
@@ -44,6 +46,16 @@ class ResearchResponse(BaseModel):
     error: Optional[str] = None
     message: Optional[str] = None
     has_memory: Optional[bool] = None
+    message_id: Optional[int] = None  # assistant message id (for /accept)
+    tools_used: Optional[List[str]] = None
+    cached: Optional[bool] = None
+    cache_age_seconds: Optional[float] = None
+    mode: Optional[str] = None
+
+
+class AcceptAnswerRequest(BaseModel):
+    """Request model for accepting an assistant answer."""
+    message_id: int
 
 
 class ConversationMessage(BaseModel):
@@ -68,24 +80,82 @@ async def research_query(request: ResearchQuery):
     - Drug database for medication info
     - Customer care KB for platform questions
     """
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+
     try:
-        if not request.query.strip():
-            raise HTTPException(status_code=400, detail="Query cannot be empty")
-        
-        result = run_research_query(request.query, request.session_id)
+        result = await research_service.arun_research_query(
+            request.query, request.session_id, use_cache=request.use_cache, mode=request.mode
+        )
         return ResearchResponse(**result)
-        
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except research_service.LLMBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except research_service.LLMTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/query/stream")
+async def research_query_stream(request: ResearchQuery):
+    """
+    Same as /query, streamed with Server-Sent Events.
+
+    Emits {"t": "start"}, then tool steps ({"t": "tool"} / {"t": "observation"})
+    and answer tokens ({"t": "token", "text"}) as the LLM produces them, and
+    finally {"t": "done", "response", "tools_used", "cached"} followed by
+    [DONE]. The conversation is saved once the answer is complete.
+    """
+    if not request.query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    try:
+        mode = research_service.resolve_mode(request.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def event_generator():
+        async for event in research_service.stream_research_query(
+            request.query, request.session_id, use_cache=request.use_cache, mode=mode
+        ):
+            yield f"data: {json.dumps(event, separators=(',', ':'), default=str)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/accept")
+async def accept_answer(request: AcceptAnswerRequest) -> Dict:
+    """
+    Mark an assistant answer (by message id) as accepted. Accepted answers
+    join the local knowledge base, so the same question is answered without
+    the LLM from then on.
+    """
+    try:
+        result = research_service.accept_research_answer(request.message_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if result["status"] == "not_found":
+        raise HTTPException(status_code=404, detail="No assistant answer with that message id")
+    return result
 
 
 @router.get("/history/{session_id}")
-async def get_history(session_id: str = "default") -> Dict:
+async def get_history(session_id: str = "default", include_archived: bool = False) -> Dict:
     """
     Get conversation history for a session.
+    include_archived prepends messages moved out by retention (marked "archived").
     """
     try:
-        history = get_conversation_history(session_id)
+        history = research_service.get_conversation_history(session_id)
+        if include_archived:
+            history = memory_service.get_archived_messages(session_id) + history
         return {
             "status": "success",
             "session_id": session_id,
@@ -102,7 +172,7 @@ async def clear_history(session_id: str = "default") -> Dict:
     Clear conversation history for a session.
     """
     try:
-        result = clear_conversation_history(session_id)
+        result = research_service.clear_conversation_history(session_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -114,7 +184,7 @@ async def list_sessions() -> Dict:
     List all conversation sessions.
     """
     try:
-        sessions = get_all_sessions()
+        sessions = research_service.get_all_sessions()
         return {
             "status": "success",
             "sessions": sessions,
@@ -130,27 +200,82 @@ async def remove_session(session_id: str) -> Dict:
     Delete a conversation session and all its messages.
     """
     try:
-        result = delete_session(session_id)
+        result = research_service.delete_session(session_id)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/search")
+async def search_conversations(
+    q: str,
+    limit: int = 20,
+    offset: int = 0,
+    session_id: Optional[str] = None,
+    role: Optional[str] = None
+) -> Dict:
+    """
+    Full-text search over past research questions and answers.
+    Results are ranked best match first and paginated with limit/offset;
+    session_id and role ("user" / "assistant") narrow the search.
+    """
+    try:
+        result = memory_service.search_messages(q, limit=limit, offset=offset, session_id=session_id, role=role)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "status": "success",
+        "count": len(result["results"]),
+        **result
+    }
+
+
 @router.get("/stats")
 async def memory_stats() -> Dict:
     """
     Get memory/database statistics.
     """
     try:
-        stats = get_memory_stats()
+        stats = research_service.get_memory_stats()
         return {
             "status": "success",
-            **stats
+            **stats,
+            "answer_cache": research_service.get_answer_cache_stats(),
+            "llm": research_service.get_llm_stats(),
+            "knowledge_base": research_service.get_knowledge_stats()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.delete("/cache")
+async def clear_cache() -> Dict:
+    """
+    Drop all cached research answers (e.g. after the knowledge base changes).
+    """
+    try:
+        return research_service.clear_answer_cache()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/maintenance")
+async def run_maintenance(background_tasks: BackgroundTasks) -> Dict:
+    """
+    Run research memory maintenance now (archive messages past retention,
+    purge old archive rows, incremental VACUUM) as a background job.
+    Poll /api/jobs/{job_id} for the result.
+    """
+    from backend.services.memory_maintenance import run_memory_maintenance
+    from backend.services.job_service import job_service
+
+    job_id = job_service.create_job("memory_maintenance", user="admin")
+    background_tasks.add_task(run_memory_maintenance, job_id)
+    return {"status": "accepted", "job_id": job_id}
+
+
 @router.get("/status")
 async def research_status():
     """
@@ -163,6 +288,7 @@ async def research_status():
         "status": "operational" if api_key_set else "api_key_missing",
         "api_key_configured": api_key_set,
         "memory_enabled": True,
+        "research_mode": get_settings().RESEARCH_MODE,
         "tools_available": [
             "Wikipedia Search",
             "Web Search (DuckDuckGo)",
@@ -12,9 +12,11 @@ Think of these classes as "Blueprints" for the JSON data.
 If the frontend sends data that doesn't match the blueprint, FastAPI rejects it automatically.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, Dict, Any, List
 
+from utils.npi import normalize_npi
+
 class ProviderInput(BaseModel):
     """
     Blueprint for the raw provider data sent from Frontend.
@@ -31,11 +33,21 @@ class ProviderInput(BaseModel):
     npi_result: Optional[Dict[str, Any]] = Field(None, description="Result from Enrichment Agent")
     quality_data: Optional[Dict[str, Any]] = Field(None, description="Result from QA Agent")
 
+    @field_validator("npi")
+    @classmethod
+    def check_npi(cls, value: Optional[str]) -> Optional[str]:
+        """
+        Digits only (empty = no NPI). A bad check digit is not rejected here:
+        the validation agent flags it (invalid_npi), so one bad NPI does not
+        fail a whole batch request.
+        """
+        return normalize_npi(value) or None
+
     class Config:
         json_schema_extra = {
             "example": {
                 "name": "John Doe MD",
-                "npi": "1234567890",
+                "npi": "1234567893",
                 "address": "123 Main St, New York, NY",
                 "phone": "555-0199",
                 "specialty": "Cardiology"
@@ -14,18 +14,16 @@ It must pass through here so we can:
 
 import sys
 import os
-import pandas as pd
+import bisect
+import threading
+from datetime import datetime
 
 # Add project root to path to allow importing 'tools' and 'agents'
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
 
-from tools import google_tools
-from tools import npi_tools
-from agents.agent_1 import validation_agent
-from agents.agent_2 import enrichment_agent
-from agents.agent_3 import quality_agent
-from agents.agent_4 import directory_agent
-from pipeline.pipeline_graph import build_pipeline
+# Agents, tools and the LangGraph pipeline pull in langchain, google.generativeai
+# and pandas, so they are imported inside the functions that use them.
+# Importing this module (and starting the API) stays cheap.
 from backend.services.job_service import job_service
 
 def run_validation(provider_data: dict) -> dict:
@@ -33,6 +31,8 @@ def run_validation(provider_data: dict) -> dict:
     Service: Validate Provider
     Uses Agent 1 Logic.
     """
+    from agents.agent_1 import validation_agent
+
     job_id = job_service.create_job("Validation", user="agent_system")
     try:
         # Run actual agent logic
@@ -41,23 +41,28 @@ def run_validation(provider_data: dict) -> dict:
         
         job_service.update_job(job_id, "completed", details=f"Validated {provider_data.get('name')}")
         
-        # Return the simplified structure for frontend, but containing all agent outputs
-        return {
-            "provider_input": provider_data,
-            "validation_result": result.get("validated_data", {}),
-            "google_result": result.get("google_result", {}), 
-            "npi_result": result.get("npi_result", {}),
-            "status": "validated"
-        }
+        return _validation_response(provider_data, result)
     except Exception as e:
         job_service.update_job(job_id, "failed", details=str(e))
         raise e
 
+def _validation_response(provider_data: dict, result: dict) -> dict:
+    """Simplified structure for frontend, but containing all agent outputs."""
+    return {
+        "provider_input": provider_data,
+        "validation_result": result.get("validated_data", {}),
+        "google_result": result.get("google_result", {}),
+        "npi_result": result.get("npi_result", {}),
+        "status": "validated"
+    }
+
 def run_enrichment(provider_data: dict) -> dict:
     """
     Service: Enrich Provider
     Uses Agent 2 Logic.
     """
+    from agents.agent_2 import enrichment_agent
+
     job_id = job_service.create_job("Enrichment", user="agent_system")
     try:
         # Step-by-Step Context? 
@@ -82,6 +87,8 @@ def run_quality_check(provider_data: dict) -> dict:
     """
     Service: QA Scoring (Agent 3)
     """
+    from agents.agent_3 import quality_agent
+
     job_id = job_service.create_job("Quality Check", user="agent_system")
     try:
         # Extract context if provided (Step-by-Step Mode)
@@ -110,6 +117,8 @@ def run_directory_update(provider_data: dict) -> dict:
     """
     Service: Directory Management (Agent 4)
     """
+    from agents.agent_4 import directory_agent
+
     job_id = job_service.create_job("Directory Update", user="agent_system")
     try:
         # Extract context
@@ -136,6 +145,9 @@ def run_batch_pipeline(providers_list: list) -> dict:
     Runs the full pipeline for a batch of providers.
     Sequence: Validate -> Enrich -> Score -> Directory
     """
+    from agents.agent_3 import quality_agent
+    from agents.agent_4 import directory_agent
+
     results = []
     risk_counts = {"LOW": 0, "MEDIUM": 0, "HIGH": 0}
     total_confidence = 0.0
@@ -216,6 +228,7 @@ def get_pipeline():
     """Get or create the cached LangGraph pipeline."""
     global _pipeline_cache
     if _pipeline_cache is None:
+        from pipeline.pipeline_graph import build_pipeline
         _pipeline_cache = build_pipeline()
     return _pipeline_cache
 
@@ -247,33 +260,111 @@ def run_full_pipeline(provider_data: dict) -> dict:
     }
 
 
+def _providers_csv_path() -> str:
+    """Resolve data/providers.csv for local and serverless layouts."""
+    # Navigate from backend/services to project root/data
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    path = os.path.join(base_dir, "data", "providers.csv")
+
+    # Fallback for Vercel/Docker/Serverless
+    if not os.path.exists(path):
+        alt_path = os.path.join(os.getcwd(), "data", "providers.csv")
+        if os.path.exists(alt_path):
+            path = alt_path
+    return path
+
+
+# Parsed providers cache, invalidated when the CSV's mtime/size changes
+_providers_cache = {"entry": None}  # (file key, snapshot), swapped atomically
+_providers_lock = threading.Lock()
+
+
+def get_providers_snapshot(path: str = None) -> dict:
+    """
+    Return the cached, parsed provider list for the CSV at 'path'.
+
+    The snapshot holds:
+    - providers : list of provider dicts (CSV order)
+    - name_keys : sorted (lowercased name, row index) pairs for prefix search
+    - mtime     : file modification time (seconds)
+    - version   : opaque string identifying this file version (used for ETags)
+    """
+    path = path or _providers_csv_path()
+    if not os.path.exists(path):
+        return {"providers": [], "name_keys": [], "mtime": 0.0, "version": "0"}
+
+    stat = os.stat(path)
+    key = (path, stat.st_mtime_ns, stat.st_size)
+    entry = _providers_cache["entry"]
+    if entry and entry[0] == key:
+        return entry[1]
+
+    with _providers_lock:
+        entry = _providers_cache["entry"]
+        if entry and entry[0] == key:
+            return entry[1]
+        try:
+            import pandas as pd
+            df = pd.read_csv(path)
+            # Convert to list of dicts (NaN -> None so it serializes as null)
+            providers = df.astype(object).where(pd.notna(df), None).to_dict('records')
+        except Exception as e:
+            print(f"Error loading providers CSV: {e}")
+            providers = []
+
+        name_keys = sorted(
+            (str(p.get("name") or "").lower(), i) for i, p in enumerate(providers)
+        )
+        snapshot = {
+            "providers": providers,
+            "name_keys": name_keys,
+            "mtime": stat.st_mtime,
+            "version": f"{stat.st_mtime_ns:x}-{stat.st_size:x}",
+        }
+        _providers_cache["entry"] = (key, snapshot)
+    return snapshot
+
+
+def query_providers(offset: int = 0, limit: int = None, q: str = None, path: str = None) -> dict:
+    """
+    Page through the cached provider list.
+
+    With 'q', only providers whose name starts with 'q' (case-insensitive)
+    are returned, in name order; the match range is found by binary search,
+    so the cost is O(log n + limit) even for very large directories.
+    """
+    snapshot = get_providers_snapshot(path)
+    providers = snapshot["providers"]
+    offset = max(offset, 0)
+
+    if q:
+        prefix = q.lower()
+        keys = snapshot["name_keys"]
+        start = bisect.bisect_left(keys, (prefix, -1))
+        end = bisect.bisect_left(keys, (prefix + "\uffff", -1))
+        total = end - start
+        stop = end if limit is None else min(end, start + offset + limit)
+        page = [providers[i] for _, i in keys[start + offset:stop]]
+    else:
+        total = len(providers)
+        stop = None if limit is None else offset + limit
+        page = providers[offset:stop]
+
+    return {
+        "providers": page,
+        "total": total,
+        "mtime": snapshot["mtime"],
+        "version": snapshot["version"],
+    }
+
+
 def load_providers_csv(path: str = None) -> list:
     """
     Load providers from the data/providers.csv file.
     Returns a list of provider dictionaries for the frontend dropdown.
+    Served from the in-memory cache until the file changes.
     """
-    if path is None:
-        # Navigate from backend/services to project root/data
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        path = os.path.join(base_dir, "data", "providers.csv")
-        
-        # Fallback for Vercel/Docker/Serverless
-        if not os.path.exists(path):
-            alt_path = os.path.join(os.getcwd(), "data", "providers.csv")
-            if os.path.exists(alt_path):
-                path = alt_path
-    
-    if not os.path.exists(path):
-        return []
-    
-    try:
-        df = pd.read_csv(path)
-        # Convert to list of dicts
-        providers = df.to_dict('records')
-        return providers
-    except Exception as e:
-        print(f"Error loading providers CSV: {e}")
-        return []
+    return get_providers_snapshot(path)["providers"]
 
  
 # ============================================
@@ -291,6 +382,8 @@ def run_bulk_validation(providers_list: list, clean_data: bool = True) -> dict:
     Returns:
         Dictionary with validation results and statistics
     """
+    from agents.agent_1 import gather_sources, validate_many
+
     job_id = job_service.create_job("bulk_validation", user="system")
     
     try:
@@ -300,23 +393,29 @@ def run_bulk_validation(providers_list: list, clean_data: bool = True) -> dict:
         
         total = len(providers_list)
         
+        # Lookups per provider (a failure only skips that provider) ...
+        gathered = []
         for idx, provider in enumerate(providers_list):
             try:
                 # Update progress
                 progress = int((idx / total) * 100)
                 job_service.update_job(job_id, "running", progress=progress)
                 
-                # Run validation
-                result = run_validation(provider)
-                validated_providers.append(result)
-                
-                # Clean data if requested (would update DB in production)
-                if clean_data and result.get("validation_result"):
-                    cleaned_count += 1
+                gathered.append((provider, gather_sources(provider)))
                     
             except Exception as e:
                 error_count += 1
                 print(f"Error validating provider {provider.get('name')}: {e}")
+
+        # ... then one batched comparison for all of them
+        results = validate_many([sources for _, sources in gathered])
+        for (provider, _), result in zip(gathered, results):
+            response = _validation_response(provider, result)
+            validated_providers.append(response)
+
+            # Clean data if requested (would update DB in production)
+            if clean_data and response.get("validation_result"):
+                cleaned_count += 1
         
         job_service.update_job(
             job_id, 
@@ -426,7 +525,7 @@ def start_monitoring(interval_minutes: int = 60) -> dict:
     try:
         _monitoring_state["active"] = True
         _monitoring_state["interval_minutes"] = interval_minutes
-        _monitoring_state["last_check"] = pd.Timestamp.now().isoformat()
+        _monitoring_state["last_check"] = datetime.now().isoformat()
         
         job_service.update_job(
             job_id,
@@ -507,12 +606,12 @@ def check_for_changes() -> dict:
                     "field_changed": random.choice(["phone", "address", "specialty"]),
                     "old_value": "Previous value",
                     "new_value": "Updated value",
-                    "detected_at": pd.Timestamp.now().isoformat()
+                    "detected_at": datetime.now().isoformat()
                 }
                 changes_found.append(change)
         
         _monitoring_state["detected_changes"].extend(changes_found)
-        _monitoring_state["last_check"] = pd.Timestamp.now().isoformat()
+        _monitoring_state["last_check"] = datetime.now().isoformat()
         
         job_service.update_job(
             job_id,
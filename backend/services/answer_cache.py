@@ -0,0 +1,118 @@
+"""
+File: backend/services/answer_cache.py
+Purpose:
+In-process TTL cache of research answers.
+
+Answers are keyed on a normalized form of the question, so "What is
+Metformin used for?" and "what is metformin used for" share one entry no
+matter which session asked. Entries expire after a TTL and the least
+recently used entry is evicted once the cache is full. Each entry records
+the tools the agent used to produce it.
+"""
+
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+from backend.core.config import get_settings
+
+_PUNCT_RE = re.compile(r"[^\w\s]", re.UNICODE)
+_SPACE_RE = re.compile(r"\s+")
+
+# Words that refer back to earlier turns ("what are its side effects?").
+# With prior messages in the session, such questions are not cacheable.
+CONTEXT_WORDS = frozenset({
+    "it", "its", "it's", "this", "that", "these", "those", "they", "them",
+    "their", "he", "she", "his", "her", "above", "previous", "earlier", "same",
+})
+CONTEXT_OPENERS = ("and ", "also ", "what about ", "how about ")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, unicode-normalize, drop punctuation and collapse whitespace."""
+    text = unicodedata.normalize("NFKC", query or "").lower()
+    text = _PUNCT_RE.sub(" ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def needs_context(query: str) -> bool:
+    """True if the question likely depends on earlier turns of the conversation."""
+    lowered = (query or "").lower().strip()
+    if lowered.startswith(CONTEXT_OPENERS):
+        return True
+    words = set(re.findall(r"[\w']+", lowered))
+    return bool(words & CONTEXT_WORDS)
+
+
+class AnswerCache:
+    """Thread-safe TTL + LRU cache of {response, tools_used} by normalized query."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(query: str) -> str:
+        return hashlib.sha1(normalize_query(query).encode("utf-8")).hexdigest()
+
+    def get(self, query: str) -> Optional[Dict[str, Any]]:
+        """Cached entry (with age_seconds) or None if missing/expired."""
+        if self.ttl_seconds <= 0:
+            return None
+        key = self.key(query)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now - entry["stored_at"] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return {**entry, "age_seconds": round(now - entry["stored_at"], 1)}
+
+    def put(self, query: str, response: str, tools_used: List[str]):
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        key = self.key(query)
+        with self._lock:
+            self._entries[key] = {
+                "query": normalize_query(query),
+                "response": response,
+                "tools_used": list(tools_used),
+                "stored_at": time.monotonic(),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            return count
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_settings = get_settings()
+answer_cache = AnswerCache(_settings.RESEARCH_CACHE_TTL_SECONDS, _settings.RESEARCH_CACHE_MAX_ENTRIES)
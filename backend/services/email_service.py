@@ -1,13 +1,22 @@
+import asyncio
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterable, Iterator, Optional
 from datetime import datetime
 
+from database.db import get_latest_provider_result, iter_provider_results, build_result_filters
+from tools.email_tools import build_provider_email, iter_result_emails
+
 logger = logging.getLogger(__name__)
 
+# provider_results columns needed to render a discrepancy draft
+DRAFT_COLUMNS = ["provider_id", "name", "confidence", "risk_level", "quality_json"]
+
 class EmailService:
     """
     Service to handle email communications.
-    Currently mocks sending for demonstration purposes.
+    Sends over SMTP when SMTP_HOST is configured, otherwise mocks sending.
+    Bulk campaigns go through outreach_service (worker pool, rate limits,
+    retries, send ledger).
     """
 
     @staticmethod
@@ -33,14 +42,107 @@ class EmailService:
                 "name": "Provider Onboarding Welcome",
                 "subject": "Welcome to CareGrid Provider Portal",
                 "description": "Welcome email for new provider accounts."
+            },
+            {
+                "id": "discrepancy_notice",
+                "name": "Provider Discrepancy Notice",
+                "subject": "Please review your CareGrid directory listing",
+                "description": "Asks a provider to confirm or correct mismatched directory data."
             }
         ]
 
+    _template_index: Dict[str, Dict[str, str]] = {}
+
+    @staticmethod
+    def get_template(template_id: str) -> Dict[str, str]:
+        if not EmailService._template_index:
+            EmailService._template_index = {t["id"]: t for t in EmailService.get_templates()}
+        template = EmailService._template_index.get(template_id)
+        if template is None:
+            raise ValueError(f"Unknown email template: {template_id}")
+        return template
+
+    @staticmethod
+    def draft_for_provider(provider_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Discrepancy email draft for a provider's latest stored result
+        (None if the provider has no results).
+        """
+        row = get_latest_provider_result(provider_id, DRAFT_COLUMNS)
+        if row is None:
+            return None
+        return next(iter_result_emails([row]))
+
+    @staticmethod
+    def iter_drafts(filters: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Bulk render drafts for the latest result of every provider matching
+        the export filters, streamed from the database.
+        Unknown filter names raise ValueError before anything is read.
+        """
+        build_result_filters(filters)
+        rows = iter_provider_results(filters, since_id=0, columns=DRAFT_COLUMNS)
+        return iter_result_emails(rows)
+
+    @staticmethod
+    def iter_profile_drafts(results: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Render drafts from in-memory pipeline results
+        ({"final_profile": ..., "quality_data": ...}) that were never stored.
+        """
+        for result in results:
+            profile = result.get("final_profile") or {}
+            yield {
+                "provider_id": result.get("provider_id"),
+                "name": profile.get("name"),
+                "risk_level": profile.get("risk_level"),
+                "email_draft": build_provider_email(profile, result.get("quality_data") or {}),
+            }
+
+    @staticmethod
+    def render(template_id: str, provider: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Subject and plain-text body for one provider.
+        Discrepancy notices use the provider's quality flags ('quality').
+        """
+        template = EmailService.get_template(template_id)
+        subject = template["subject"].format(date=datetime.now().strftime("%Y-%m-%d"))
+        if template_id == "discrepancy_notice":
+            body = build_provider_email(provider, provider.get("quality") or {})
+        else:
+            body = (
+                f"Dear {provider.get('name', 'Doctor')},\n\n"
+                f"{template['description']}\n\n"
+                "Best regards,\nProvider Data Quality Team"
+            )
+        return {"subject": subject, "body": body}
+
+    @staticmethod
+    def iter_outreach_items(template_id: str, providers: Iterable[Dict[str, Any]],
+                            stats: Optional[Dict[str, int]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Render providers into outreach items lazily.
+        Providers without an email address are counted in stats['no_email'].
+        """
+        EmailService.get_template(template_id)
+        for provider in providers:
+            recipient = (provider.get("email") or "").strip()
+            if "@" not in recipient:
+                if stats is not None:
+                    stats["no_email"] = stats.get("no_email", 0) + 1
+                continue
+            yield {
+                "recipient": recipient,
+                "provider_id": str(provider.get("id") or provider.get("npi") or "") or None,
+                "template_id": template_id,
+                **EmailService.render(template_id, provider),
+            }
+
     @staticmethod
     def send_email(template_id: str, recipients: List[str], data: Dict[str, Any] = None) -> bool:
         """
-        Mock sending an email.
-        In production, this would use SMTP or SendGrid/AWS SES.
+        Send one template email to a list of recipients.
+        Uses SMTP when SMTP_HOST is configured, otherwise only logs (mock).
         """
         logger.info(f"Attempting to send email template '{template_id}' to {recipients}")
         
@@ -49,8 +151,44 @@ class EmailService:
             logger.warning("No recipients provided.")
             return False
             
-        # Mock success
+        from backend.core.config import get_settings
+        from backend.services.outreach_service import make_transport, build_message
+
+        settings = get_settings()
+        rendered = EmailService.render(template_id, (data or {}).get("provider") or {})
+        transport = make_transport(settings)
+        try:
+            for recipient in recipients:
+                transport.send(build_message(settings.EMAIL_FROM, recipient, rendered["subject"], rendered["body"]))
+        except Exception as e:
+            logger.error(f"Failed to send email '{template_id}': {e}")
+            return False
+        finally:
+            transport.close()
+
         logger.info(f"SUCCESS: Email '{template_id}' sent to {len(recipients)} recipients.")
         return True
 
+    @staticmethod
+    def send_bulk_emails(template_id: str, providers: List[Dict[str, Any]],
+                         campaign_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send one template email to each provider (blocking).
+        Runs the outreach worker pool; re-running with the same campaign_id
+        only sends to providers not yet delivered.
+        """
+        from backend.services.outreach_service import run_campaign
+
+        stats: Dict[str, int] = {}
+        result = asyncio.run(run_campaign(
+            EmailService.iter_outreach_items(template_id, providers, stats),
+            campaign_id=campaign_id
+        ))
+        return {
+            "status": "success" if result["failed"] == 0 else "partial",
+            "total_providers": len(providers),
+            "no_email": stats.get("no_email", 0),
+            **result
+        }
+
 email_service = EmailService()
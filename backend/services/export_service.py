@@ -1,7 +1,22 @@
-import pandas as pd
 import io
+import os
+import csv
 import json
-from typing import List, Dict, Any
+import tempfile
+from itertools import groupby
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+from database.db import (
+    iter_provider_results,
+    resolve_change_cursor,
+    get_change_cursor,
+    EXPORT_COLUMNS
+)
+from utils.exporter import export_parquet, write_parquet_file, PROVIDER_RESULTS_PARQUET_ROOT
+
+# Rows buffered per yielded chunk when streaming
+STREAM_CHUNK_ROWS = 500
+
 
 class ExportService:
     """
@@ -9,6 +24,64 @@ class ExportService:
     Follows Single Responsibility Principle for data formatting.
     """
 
+    # --- Streaming encoders ---
+
+    @staticmethod
+    def iter_csv(rows: Iterable[Dict[str, Any]], columns: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Encode rows as CSV text, yielded in chunks of STREAM_CHUNK_ROWS.
+        Columns default to the keys of the first row.
+        """
+        buffer = io.StringIO()
+        writer = None
+        pending = 0
+
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=columns or list(row.keys()), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow(row)
+            pending += 1
+            if pending >= STREAM_CHUNK_ROWS:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+                pending = 0
+
+        if writer is None and columns:
+            csv.writer(buffer).writerow(columns)
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def iter_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Encode rows as newline-delimited JSON, one object per line.
+        """
+        lines = []
+        for row in rows:
+            lines.append(json.dumps(row, default=str))
+            if len(lines) >= STREAM_CHUNK_ROWS:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+
+    @staticmethod
+    def iter_json_array(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        """
+        Encode rows as a single JSON array, streamed element by element.
+        """
+        yield "["
+        first = True
+        for chunk in ExportService.iter_ndjson(rows):
+            body = chunk.rstrip("\n").replace("\n", ",")
+            yield body if first else "," + body
+            first = False
+        yield "]"
+
+    # --- In-memory exports ---
+
     @staticmethod
     def to_csv(data: List[Dict[str, Any]]) -> str:
         """
@@ -16,9 +89,8 @@ class ExportService:
         """
         if not data:
             return ""
-        
-        df = pd.DataFrame(data)
-        return df.to_csv(index=False)
+
+        return "".join(ExportService.iter_csv(data))
 
     @staticmethod
     def to_json(data: List[Dict[str, Any]]) -> str:
@@ -27,10 +99,8 @@ class ExportService:
         """
         if not data:
             return "[]"
-        
-        # Use pandas for consistent serialization of dates etc.
-        df = pd.DataFrame(data)
-        return df.to_json(orient="records", date_format="iso")
+
+        return "".join(ExportService.iter_json_array(data))
 
     @staticmethod
     def export_provider_data(providers: List[Dict[str, Any]], format: str) -> Dict[str, Any]:
@@ -54,3 +124,121 @@ class ExportService:
             }
         else:
             raise ValueError(f"Unsupported export format: {format}")
+
+    # --- Database exports ---
+
+    @staticmethod
+    def open_result_rows(filters: Optional[Dict[str, Any]] = None, since: Any = None) -> Dict[str, Any]:
+        """
+        Open a provider_results row iterator.
+
+        Without 'since': every matching row.
+        With 'since' (change id or timestamp): only providers whose current
+        result changed after the cursor. The delta is bounded above by the
+        cursor taken now, which is returned as 'next_cursor' for the next pull.
+        """
+        if since is None:
+            return {"rows": iter_provider_results(filters), "next_cursor": None}
+
+        since_id = resolve_change_cursor(since)
+        next_cursor = get_change_cursor()
+        rows = iter_provider_results(filters, since_id=since_id, until_id=next_cursor)
+        return {"rows": rows, "next_cursor": next_cursor}
+
+    @staticmethod
+    def stream_provider_results(format: str, filters: Optional[Dict[str, Any]] = None,
+                                since: Any = None) -> Dict[str, Any]:
+        """
+        Stream provider_results straight from SQLite in the requested format
+        (csv, ndjson or json). Filters are pushed down into SQL.
+        With 'since', only the delta after that cursor is exported.
+        Parquet downloads go through export_parquet_file instead.
+        Returns dictionary with an iterator 'content', 'media_type', 'filename'
+        and 'next_cursor'.
+        """
+        fmt = format.lower()
+        if fmt not in ("csv", "ndjson", "json"):
+            raise ValueError(f"Unsupported export format: {format}")
+
+        # Validate filters before the response starts streaming
+        opened = ExportService.open_result_rows(filters, since)
+        rows = opened["rows"]
+        first = next(rows, None)
+
+        def all_rows():
+            if first is not None:
+                yield first
+                yield from rows
+
+        result = ExportService._encode_rows(fmt, all_rows())
+        result["next_cursor"] = opened["next_cursor"]
+        return result
+
+    @staticmethod
+    def _encode_rows(fmt: str, rows: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Pick the streaming encoder, media type and filename for a format."""
+        if fmt == "csv":
+            return {
+                "content": ExportService.iter_csv(rows, EXPORT_COLUMNS),
+                "media_type": "text/csv",
+                "filename": "providers_export.csv"
+            }
+        if fmt == "ndjson":
+            return {
+                "content": ExportService.iter_ndjson(rows),
+                "media_type": "application/x-ndjson",
+                "filename": "providers_export.ndjson"
+            }
+        return {
+            "content": ExportService.iter_json_array(rows),
+            "media_type": "application/json",
+            "filename": "providers_export.json"
+        }
+
+    @staticmethod
+    def export_parquet_file(filters: Optional[Dict[str, Any]] = None, since: Any = None) -> Dict[str, Any]:
+        """
+        Write filtered provider_results (or the delta since a cursor) to a
+        temporary Parquet file, one row group at a time.
+        The caller is responsible for deleting 'path'.
+        """
+        opened = ExportService.open_result_rows(filters, since)
+        rows = opened["rows"]
+        fd, path = tempfile.mkstemp(prefix="caregrid_export_", suffix=".parquet")
+        os.close(fd)
+        count = write_parquet_file(rows, path, columns=EXPORT_COLUMNS)
+        return {
+            "path": path,
+            "rows": count,
+            "next_cursor": opened["next_cursor"],
+            "media_type": "application/vnd.apache.parquet",
+            "filename": "providers_export.parquet"
+        }
+
+    @staticmethod
+    def write_parquet_dataset(root: str = PROVIDER_RESULTS_PARQUET_ROOT,
+                              filters: Optional[Dict[str, Any]] = None,
+                              batch_rows: int = 10000) -> Dict[str, Any]:
+        """
+        Copy filtered provider_results into a partitioned Parquet store
+        (batch_date from created_at, risk_level; EXPORT_COLUMNS schema),
+        batch_rows at a time. Kept apart from the dashboard's result store.
+        """
+        written = 0
+        batch = []
+
+        def flush(rows):
+            for day, group in groupby(rows, key=lambda r: str(r.get("created_at") or "")[:10]):
+                export_parquet(list(group), root, batch_date=day or None, columns=EXPORT_COLUMNS)
+
+        for row in iter_provider_results(filters, batch_size=batch_rows):
+            batch.append(row)
+            if len(batch) >= batch_rows:
+                flush(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            flush(batch)
+            written += len(batch)
+
+        return {"root": root, "rows": written}
@@ -18,7 +18,14 @@ class JobService:
     """
     
     def __init__(self):
-        self._jobs: List[Dict[str, Any]] = self._load_jobs()
+        # History is read from disk on first access, not at import
+        self._loaded_jobs: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def _jobs(self) -> List[Dict[str, Any]]:
+        if self._loaded_jobs is None:
+            self._loaded_jobs = self._load_jobs()
+        return self._loaded_jobs
 
     def _load_jobs(self) -> List[Dict[str, Any]]:
         if os.path.exists(JOB_HISTORY_FILE):
@@ -69,7 +76,7 @@ class JobService:
                 if progress is not None:
                     job["progress"] = progress
                 
-                if status in ["completed", "failed"]:
+                if status in ["completed", "failed", "cancelled"]:
                     job["completed_at"] = datetime.now().isoformat()
                     if progress is None and status == "completed":
                          job["progress"] = 100
@@ -0,0 +1,216 @@
+"""
+File: backend/services/llm_client.py
+Purpose:
+Shared Gemini client and admission control for research LLM calls.
+
+- get_model(): one configured GenerativeModel, reused across requests
+  (rebuilt only if the API key changes).
+- llm_limiter: caps concurrent LLM calls. Callers beyond the cap wait in a
+  bounded queue; when the queue is full, or a caller waits longer than
+  LLM_QUEUE_TIMEOUT_SECONDS, LLMBusyError is raised so the API can answer
+  503 instead of piling up threads.
+- generate() / run_blocking(): async entry points that hold a limiter slot
+  and enforce a per-request timeout (LLMTimeoutError). Blocking calls (the
+  LangChain agent) run on a dedicated pool sized to the limit, so a burst
+  never uses more than LLM_MAX_CONCURRENCY threads.
+- iterate_blocking() / iterate_with_timeout(): the streaming counterparts.
+  The caller holds the slot; every step must arrive within the timeout.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+from backend.core.config import get_settings
+
+try:
+    import google.generativeai as genai
+    GENAI_AVAILABLE = True
+except ImportError:
+    genai = None
+    GENAI_AVAILABLE = False
+
+
+class LLMBusyError(Exception):
+    """Too many LLM calls in flight and queued; retry later."""
+
+
+class LLMTimeoutError(Exception):
+    """An LLM call did not finish within its timeout."""
+
+
+# ============================================
+# Shared Client
+# ============================================
+
+_model = None
+_model_key = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """Configured GenerativeModel shared by all requests."""
+    global _model, _model_key
+    api_key = os.getenv("GOOGLE_API_KEY", "")
+    if _model is None or _model_key != api_key:
+        with _model_lock:
+            if _model is None or _model_key != api_key:
+                genai.configure(api_key=api_key)
+                _model = genai.GenerativeModel(get_settings().LLM_MODEL)
+                _model_key = api_key
+    return _model
+
+
+# ============================================
+# Concurrency Limiter
+# ============================================
+
+class ConcurrencyLimiter:
+    """
+    At most 'limit' holders at once, at most 'max_queue' waiters; waiting
+    longer than 'queue_timeout' seconds counts as busy too.
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # One semaphore per event loop (the app runs on one; tests may not)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.limit)
+            self._loop = loop
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self):
+        semaphore = self._get_semaphore()
+        if not semaphore.locked():
+            await semaphore.acquire()  # free slot: returns immediately
+        else:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise LLMBusyError("Research agent is busy, please retry shortly")
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise LLMBusyError("Research agent is busy, please retry shortly")
+            finally:
+                self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self.completed += 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+_settings = get_settings()
+llm_limiter = ConcurrencyLimiter(
+    _settings.LLM_MAX_CONCURRENCY,
+    _settings.LLM_MAX_QUEUE,
+    _settings.LLM_QUEUE_TIMEOUT_SECONDS,
+)
+
+# Threads for blocking LLM work (agent.invoke); sized to the limiter
+_executor = ThreadPoolExecutor(max_workers=_settings.LLM_MAX_CONCURRENCY, thread_name_prefix="llm")
+
+
+async def generate(prompt: str, timeout: Optional[float] = None) -> str:
+    """Gemini completion for 'prompt' under the limiter and a timeout."""
+    timeout = timeout or get_settings().LLM_TIMEOUT_SECONDS
+    async with llm_limiter.slot():
+        try:
+            response = await asyncio.wait_for(
+                get_model().generate_content_async(prompt, request_options={"timeout": timeout}),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            llm_limiter.timed_out += 1
+            raise LLMTimeoutError(f"LLM call timed out after {timeout:.0f}s")
+    return response.text
+
+
+async def run_blocking(fn: Callable, *args, timeout: Optional[float] = None):
+    """
+    Run a blocking LLM-bound call (e.g. agent.invoke) on the LLM pool under
+    the limiter and a timeout. On timeout the worker thread finishes in the
+    background, but the caller gets LLMTimeoutError right away.
+    """
+    timeout = timeout or get_settings().LLM_TIMEOUT_SECONDS
+    async with llm_limiter.slot():
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(_executor, fn, *args), timeout)
+        except asyncio.TimeoutError:
+            llm_limiter.timed_out += 1
+            raise LLMTimeoutError(f"LLM call timed out after {timeout:.0f}s")
+
+
+async def iterate_blocking(make_iterable: Callable, timeout: Optional[float] = None):
+    """
+    Consume a blocking iterator (e.g. a Gemini response stream) on the LLM
+    pool. Creating the iterator and each next() must finish within
+    'timeout', or LLMTimeoutError is raised. The caller holds the slot.
+    """
+    timeout = timeout or get_settings().LLM_TIMEOUT_SECONDS
+    loop = asyncio.get_running_loop()
+
+    async def call(fn, *args):
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(_executor, fn, *args), timeout)
+        except asyncio.TimeoutError:
+            llm_limiter.timed_out += 1
+            raise LLMTimeoutError(f"LLM stream stalled for {timeout:.0f}s")
+
+    iterator = await call(lambda: iter(make_iterable()))
+    done = object()
+    while True:
+        item = await call(next, iterator, done)
+        if item is done:
+            return
+        yield item
+
+
+async def iterate_with_timeout(events, timeout: Optional[float] = None):
+    """Re-yield an async iterator, raising LLMTimeoutError if any step takes longer than 'timeout'."""
+    timeout = timeout or get_settings().LLM_TIMEOUT_SECONDS
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(events.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+            except asyncio.TimeoutError:
+                llm_limiter.timed_out += 1
+                raise LLMTimeoutError(f"LLM stream stalled for {timeout:.0f}s")
+            yield event
+    finally:
+        await events.aclose()
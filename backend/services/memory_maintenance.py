@@ -0,0 +1,77 @@
+"""
+File: backend/services/memory_maintenance.py
+Purpose:
+Keeps research_memory.db bounded on long-lived deployments.
+
+One maintenance run (recorded in job history as "memory_maintenance"):
+1. Archive messages past the retention limits (age, per session, overall)
+2. Purge archive rows past the archive retention
+3. Incremental VACUUM + WAL truncate, so freed pages leave the file
+
+maintenance_loop runs it every RESEARCH_MAINTENANCE_INTERVAL_SECONDS from
+the app lifespan; POST /api/research/maintenance runs it on demand.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+from backend.core.config import get_settings
+from backend.services import memory_service
+from backend.services.job_service import job_service
+
+logger = logging.getLogger(__name__)
+
+# One run at a time (scheduled and on-demand runs share the database)
+_run_lock = threading.Lock()
+
+
+def run_memory_maintenance(job_id: Optional[str] = None, user: str = "system") -> Dict[str, Any]:
+    """Archive, purge and vacuum once. Skipped if another run is in progress."""
+    settings = get_settings()
+    if job_id is None:
+        job_id = job_service.create_job("memory_maintenance", user=user)
+
+    if not _run_lock.acquire(blocking=False):
+        job_service.update_job(job_id, "failed", details="Skipped: maintenance already running")
+        return {"job_id": job_id, "status": "skipped"}
+
+    try:
+        job_service.update_job(job_id, "running", details="Archiving old messages")
+        archived = memory_service.archive_messages(
+            max_age_days=settings.RESEARCH_RETENTION_DAYS,
+            max_per_session=settings.RESEARCH_MAX_MESSAGES_PER_SESSION,
+            max_total=settings.RESEARCH_MAX_MESSAGES,
+        )
+        purged = memory_service.purge_archive(settings.RESEARCH_ARCHIVE_RETENTION_DAYS)
+
+        job_service.update_job(job_id, "running", details="Vacuuming")
+        vacuum = memory_service.incremental_vacuum(settings.RESEARCH_VACUUM_MAX_PAGES)
+
+        job_service.update_job(
+            job_id,
+            "completed",
+            details=(
+                f"Archived {archived['archived_messages']} messages from {archived['sessions']} sessions, "
+                f"purged {purged} archive rows, freed {vacuum['freed_pages']} pages"
+            ),
+        )
+        return {"job_id": job_id, "status": "completed", **archived, "purged_archive_rows": purged, **vacuum}
+    except Exception as e:
+        logger.error(f"Memory maintenance failed: {e}")
+        job_service.update_job(job_id, "failed", details=f"Error: {str(e)}")
+        raise
+    finally:
+        _run_lock.release()
+
+
+async def maintenance_loop(interval_seconds: float):
+    """Run maintenance every interval_seconds (first run one interval after startup)."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(run_memory_maintenance)
+        except Exception:
+            # Already logged and recorded on the job; try again next interval
+            pass
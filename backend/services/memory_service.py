@@ -3,15 +3,34 @@ File: backend/services/memory_service.py
 Purpose:
 SQLite-backed conversation memory for the Research Agent.
 Persists chat history across server restarts.
+
+Connections come from a small pool (WAL mode, reused across requests)
+instead of a connect/close per call. Writes for one research query (user
+question + answer) go through add_messages: one transaction that upserts
+the conversation and inserts all messages.
+
+Message content is full-text indexed (FTS5, kept in sync by triggers) for
+search_messages.
+
+Retention: archive_messages moves messages past the age / count limits
+into message_archive (zlib-compressed JSON, one row per batch of a
+session), purge_archive drops old archive rows and incremental_vacuum
+returns the freed pages to the filesystem. backend/services/memory_maintenance
+runs them as a scheduled job.
 """
 
 import sqlite3
 import json
-from datetime import datetime
-from typing import List, Dict, Optional
+import queue
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Iterable, Tuple, Any
 import os
 
-# Database path
+from utils.fts import FTS5_AVAILABLE, fts_query, page_bounds, require_fts5
+
 # Database path
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 DB_PATH = os.path.join(BASE_DIR, "research_memory.db")
@@ -22,21 +41,109 @@ if not os.path.exists(DB_PATH):
     if os.path.exists(alt_path):
         DB_PATH = alt_path
 
+# Max idle connections kept per database file
+POOL_SIZE = 8
+
+# Messages moved to the archive per transaction (keeps write locks short)
+ARCHIVE_BATCH_SIZE = 200
+
+# PRAGMA auto_vacuum value for INCREMENTAL
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+# ============================================
+# Connection Pool
+# ============================================
+
+class ConnectionPool:
+    """
+    Reusable SQLite connections for one database file.
+    Connections are in autocommit mode; use transaction() to group writes.
+    The schema is created when the pool is first built.
+    """
+
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self.path = path
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        with self.connection() as conn:
+            # Only takes effect on a new (empty) file; existing databases
+            # are converted by the first incremental_vacuum run
+            conn.execute(f"PRAGMA auto_vacuum={AUTO_VACUUM_INCREMENTAL}")
+            conn.execute("PRAGMA journal_mode=WAL")
+        with self.transaction() as conn:
+            _create_schema(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection (created on demand, returned to the pool after)."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Borrow a connection inside BEGIN IMMEDIATE ... COMMIT (rollback on error)."""
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Pool for the current DB_PATH (built, with the schema, on first use)."""
+    pool = _pools.get(DB_PATH)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(DB_PATH)
+            if pool is None:
+                pool = ConnectionPool(DB_PATH)
+                _pools[DB_PATH] = pool
+    return pool
+
 
 def get_connection():
-    """Get SQLite connection with row factory."""
+    """Get a new standalone SQLite connection with row factory (tables created on first use)."""
+    get_pool()
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     return conn
 
 
-def init_database():
-    """Initialize the database tables if they don't exist."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
+def _create_schema(conn: sqlite3.Connection):
     # Create conversations table
-    cursor.execute("""
+    conn.execute("""
         CREATE TABLE IF NOT EXISTS conversations (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             session_id TEXT NOT NULL,
@@ -46,9 +153,9 @@ def init_database():
             UNIQUE(session_id)
         )
     """)
-    
+
     # Create messages table
-    cursor.execute("""
+    conn.execute("""
         CREATE TABLE IF NOT EXISTS messages (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             session_id TEXT NOT NULL,
@@ -59,19 +166,134 @@ def init_database():
             FOREIGN KEY (session_id) REFERENCES conversations(session_id)
         )
     """)
-    
-    # Create index for faster lookups
-    cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_messages_session 
-        ON messages(session_id)
+
+    # Per-conversation counters (older databases lack them): backfilled once,
+    # then maintained by triggers so listing sessions never counts messages
+    cols = [row[1] for row in conn.execute("PRAGMA table_info(conversations)")]
+    if "message_count" not in cols:
+        conn.execute("ALTER TABLE conversations ADD COLUMN message_count INTEGER NOT NULL DEFAULT 0")
+        conn.execute("ALTER TABLE conversations ADD COLUMN last_message_at TIMESTAMP")
+        conn.execute("""
+            UPDATE conversations SET
+                message_count = (SELECT COUNT(*) FROM messages m WHERE m.session_id = conversations.session_id),
+                last_message_at = (SELECT MAX(timestamp) FROM messages m WHERE m.session_id = conversations.session_id)
+        """)
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_messages_insert AFTER INSERT ON messages
+        BEGIN
+            UPDATE conversations
+            SET message_count = message_count + 1,
+                last_message_at = NEW.timestamp
+            WHERE session_id = NEW.session_id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_messages_delete AFTER DELETE ON messages
+        BEGIN
+            UPDATE conversations
+            SET message_count = message_count - 1,
+                last_message_at = (SELECT MAX(timestamp) FROM messages WHERE session_id = OLD.session_id)
+            WHERE session_id = OLD.session_id;
+        END
     """)
-    
-    conn.commit()
-    conn.close()
 
+    # (session_id, timestamp) serves history reads, recent-context reads and
+    # the last_message_at lookup; it replaces the session-only index
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_messages_session_time
+        ON messages(session_id, timestamp)
+    """)
+    conn.execute("DROP INDEX IF EXISTS idx_messages_session")
 
-# Initialize database on module load
-init_database()
+    # Sessions list: ORDER BY updated_at DESC LIMIT n walks this index
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_conversations_updated
+        ON conversations(updated_at)
+    """)
+
+    # Answers users marked as good; indexed by the research knowledge store
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS accepted_answers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            message_id INTEGER UNIQUE,
+            question TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # Messages removed by retention: each row holds one batch of a session
+    # as zlib-compressed JSON ([{id, role, content, timestamp, metadata}])
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS message_archive (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            session_id TEXT NOT NULL,
+            message_count INTEGER NOT NULL,
+            first_timestamp TIMESTAMP,
+            last_timestamp TIMESTAMP,
+            payload BLOB NOT NULL,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_message_archive_session
+        ON message_archive(session_id, last_timestamp)
+    """)
+
+    if FTS5_AVAILABLE:
+        _create_search_index(conn)
+
+
+def _create_search_index(conn: sqlite3.Connection):
+    # Full-text index over message content. External content table: the
+    # text lives only in messages, the index is kept in sync by triggers.
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'"
+    ).fetchone()
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+            content, content='messages', content_rowid='id', tokenize='porter unicode61'
+        )
+    """)
+    if not exists:
+        conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_messages_fts_insert AFTER INSERT ON messages
+        BEGIN
+            INSERT INTO messages_fts(rowid, content) VALUES (NEW.id, NEW.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_messages_fts_delete AFTER DELETE ON messages
+        BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_messages_fts_update AFTER UPDATE OF content ON messages
+        BEGIN
+            INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', OLD.id, OLD.content);
+            INSERT INTO messages_fts(rowid, content) VALUES (NEW.id, NEW.content);
+        END
+    """)
+
+
+def init_database():
+    """Initialize the database tables if they don't exist."""
+    get_pool()
+
+
+def _default_title() -> str:
+    return f"Conversation {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+
+def _message_dict(row: sqlite3.Row) -> Dict:
+    msg = dict(row)
+    if msg.get('metadata'):
+        msg['metadata'] = json.loads(msg['metadata'])
+    return msg
 
 
 # ============================================
@@ -80,177 +302,359 @@ init_database()
 
 def create_or_get_conversation(session_id: str, title: Optional[str] = None) -> Dict:
     """Create a new conversation or get existing one."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Try to get existing conversation
-    cursor.execute(
-        "SELECT * FROM conversations WHERE session_id = ?", 
-        (session_id,)
-    )
-    row = cursor.fetchone()
-    
-    if row:
-        conn.close()
-        return dict(row)
-    
-    # Create new conversation
-    cursor.execute(
-        "INSERT INTO conversations (session_id, title) VALUES (?, ?)",
-        (session_id, title or f"Conversation {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    )
-    conn.commit()
-    
-    cursor.execute(
-        "SELECT * FROM conversations WHERE session_id = ?", 
-        (session_id,)
-    )
-    row = cursor.fetchone()
-    conn.close()
-    
+    with get_pool().transaction() as conn:
+        conn.execute(
+            "INSERT INTO conversations (session_id, title) VALUES (?, ?) "
+            "ON CONFLICT(session_id) DO NOTHING",
+            (session_id, title or _default_title())
+        )
+        row = conn.execute(
+            "SELECT * FROM conversations WHERE session_id = ?",
+            (session_id,)
+        ).fetchone()
     return dict(row)
 
 
 def get_all_conversations(limit: int = 50) -> List[Dict]:
-    """Get all conversations, ordered by most recent."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT c.*, 
-               (SELECT COUNT(*) FROM messages m WHERE m.session_id = c.session_id) as message_count
-        FROM conversations c
-        ORDER BY c.updated_at DESC
-        LIMIT ?
-    """, (limit,))
-    
-    rows = cursor.fetchall()
-    conn.close()
-    
+    """Get all conversations, ordered by most recent (message_count is a maintained column)."""
+    with get_pool().connection() as conn:
+        rows = conn.execute("""
+            SELECT * FROM conversations
+            ORDER BY updated_at DESC
+            LIMIT ?
+        """, (limit,)).fetchall()
     return [dict(row) for row in rows]
 
 
 def delete_conversation(session_id: str) -> bool:
-    """Delete a conversation and all its messages."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
-    cursor.execute("DELETE FROM conversations WHERE session_id = ?", (session_id,))
-    
-    conn.commit()
-    deleted = cursor.rowcount > 0
-    conn.close()
-    
-    return deleted
+    """Delete a conversation and all its messages (archived ones too)."""
+    with get_pool().transaction() as conn:
+        conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+        conn.execute("DELETE FROM message_archive WHERE session_id = ?", (session_id,))
+        cursor = conn.execute("DELETE FROM conversations WHERE session_id = ?", (session_id,))
+        return cursor.rowcount > 0
 
 
 # ============================================
 # Message Functions
 # ============================================
 
+def add_messages(session_id: str, messages: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]]) -> List[Dict]:
+    """
+    Add several (role, content, metadata) messages to a conversation in one
+    transaction: the conversation is created or touched with a single upsert,
+    then all messages are inserted.
+    """
+    timestamp = datetime.now().isoformat()
+    saved = []
+    with get_pool().transaction() as conn:
+        conn.execute("""
+            INSERT INTO conversations (session_id, title) VALUES (?, ?)
+            ON CONFLICT(session_id) DO UPDATE SET updated_at = CURRENT_TIMESTAMP
+        """, (session_id, _default_title()))
+
+        for role, content, metadata in messages:
+            cursor = conn.execute("""
+                INSERT INTO messages (session_id, role, content, timestamp, metadata)
+                VALUES (?, ?, ?, ?, ?)
+            """, (session_id, role, content, timestamp, json.dumps(metadata) if metadata else None))
+            saved.append({
+                "id": cursor.lastrowid,
+                "session_id": session_id,
+                "role": role,
+                "content": content,
+                "timestamp": timestamp,
+                "metadata": metadata
+            })
+    return saved
+
+
 def add_message(session_id: str, role: str, content: str, metadata: Optional[Dict] = None) -> Dict:
     """Add a message to a conversation."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Ensure conversation exists
-    create_or_get_conversation(session_id)
-    
-    # Insert message
-    timestamp = datetime.now().isoformat()
-    metadata_json = json.dumps(metadata) if metadata else None
-    
-    cursor.execute("""
-        INSERT INTO messages (session_id, role, content, timestamp, metadata)
-        VALUES (?, ?, ?, ?, ?)
-    """, (session_id, role, content, timestamp, metadata_json))
-    
-    # Update conversation timestamp
-    cursor.execute("""
-        UPDATE conversations SET updated_at = CURRENT_TIMESTAMP
-        WHERE session_id = ?
-    """, (session_id,))
-    
-    conn.commit()
-    
-    message_id = cursor.lastrowid
-    conn.close()
-    
-    return {
-        "id": message_id,
-        "session_id": session_id,
-        "role": role,
-        "content": content,
-        "timestamp": timestamp,
-        "metadata": metadata
-    }
+    return add_messages(session_id, [(role, content, metadata)])[0]
 
 
 def get_messages(session_id: str, limit: int = 100) -> List[Dict]:
     """Get all messages for a conversation."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT * FROM messages 
-        WHERE session_id = ?
-        ORDER BY timestamp ASC
-        LIMIT ?
-    """, (session_id, limit))
-    
-    rows = cursor.fetchall()
-    conn.close()
-    
-    messages = []
-    for row in rows:
-        msg = dict(row)
-        if msg.get('metadata'):
-            msg['metadata'] = json.loads(msg['metadata'])
-        messages.append(msg)
-    
-    return messages
+    with get_pool().connection() as conn:
+        rows = conn.execute("""
+            SELECT * FROM messages
+            WHERE session_id = ?
+            ORDER BY timestamp ASC, id ASC
+            LIMIT ?
+        """, (session_id, limit)).fetchall()
+    return [_message_dict(row) for row in rows]
 
 
 def clear_messages(session_id: str) -> bool:
-    """Clear all messages for a conversation."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
-    
-    conn.commit()
-    deleted = cursor.rowcount > 0
-    conn.close()
-    
-    return deleted
+    """Clear all messages for a conversation (archived ones too)."""
+    with get_pool().transaction() as conn:
+        cursor = conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+        archived = conn.execute("DELETE FROM message_archive WHERE session_id = ?", (session_id,))
+        return cursor.rowcount > 0 or archived.rowcount > 0
 
 
 def get_recent_messages(session_id: str, count: int = 10) -> List[Dict]:
     """Get the most recent N messages for context."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT * FROM (
-            SELECT * FROM messages 
+    with get_pool().connection() as conn:
+        rows = conn.execute("""
+            SELECT * FROM (
+                SELECT * FROM messages
+                WHERE session_id = ?
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            ) ORDER BY timestamp ASC, id ASC
+        """, (session_id, count)).fetchall()
+    return [_message_dict(row) for row in rows]
+
+
+# ============================================
+# Accepted Answers
+# ============================================
+
+def accept_answer(message_id: int) -> Optional[Dict]:
+    """
+    Store an assistant message, with the user question before it, as an
+    accepted answer. Returns {id, question, answer}, or None if the message
+    is not an assistant answer to a question. Accepting twice is a no-op.
+    """
+    with get_pool().transaction() as conn:
+        answer = conn.execute(
+            "SELECT id, session_id, content FROM messages WHERE id = ? AND role = 'assistant'",
+            (message_id,)
+        ).fetchone()
+        if answer is None:
+            return None
+        question = conn.execute("""
+            SELECT content FROM messages
+            WHERE session_id = ? AND id < ? AND role = 'user'
+            ORDER BY id DESC LIMIT 1
+        """, (answer["session_id"], message_id)).fetchone()
+        if question is None:
+            return None
+        conn.execute(
+            "INSERT INTO accepted_answers (message_id, question, answer) VALUES (?, ?, ?) "
+            "ON CONFLICT(message_id) DO NOTHING",
+            (message_id, question["content"], answer["content"])
+        )
+        row = conn.execute(
+            "SELECT id, question, answer FROM accepted_answers WHERE message_id = ?",
+            (message_id,)
+        ).fetchone()
+    return dict(row)
+
+
+def get_accepted_answers() -> List[Dict]:
+    """All accepted answers (id, question, answer)."""
+    with get_pool().connection() as conn:
+        rows = conn.execute("SELECT id, question, answer FROM accepted_answers ORDER BY id").fetchall()
+    return [dict(row) for row in rows]
+
+
+# ============================================
+# Search Functions
+# ============================================
+
+def search_messages(query: str, limit: int = 20, offset: int = 0,
+                    session_id: Optional[str] = None, role: Optional[str] = None) -> Dict:
+    """
+    Full-text search over message content, best matches first (bm25).
+    Returns one page of hits (with a highlighted snippet) and the total
+    number of matches. Raises ValueError for an empty query or bad paging.
+    """
+    require_fts5()
+    match = fts_query(query)
+    limit, offset = page_bounds(limit, offset)
+
+    clauses, params = ["messages_fts MATCH ?"], [match]
+    if session_id:
+        clauses.append("m.session_id = ?")
+        params.append(session_id)
+    if role:
+        clauses.append("m.role = ?")
+        params.append(role)
+    where = " AND ".join(clauses)
+
+    with get_pool().connection() as conn:
+        total = conn.execute(f"""
+            SELECT COUNT(*) FROM messages_fts
+            JOIN messages m ON m.id = messages_fts.rowid
+            WHERE {where}
+        """, params).fetchone()[0]
+        rows = conn.execute(f"""
+            SELECT m.id, m.session_id, m.role, m.content, m.timestamp, m.metadata,
+                   snippet(messages_fts, 0, '[', ']', '...', 16) AS snippet,
+                   bm25(messages_fts) AS rank
+            FROM messages_fts
+            JOIN messages m ON m.id = messages_fts.rowid
+            WHERE {where}
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """, params + [limit, offset]).fetchall()
+
+    return {
+        "query": query,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "results": [_message_dict(row) for row in rows]
+    }
+
+
+# ============================================
+# Retention / Archive Functions
+# ============================================
+
+def _cutoff(days: float) -> str:
+    return (datetime.now() - timedelta(days=days)).isoformat()
+
+
+def _expired_message_ids(conn: sqlite3.Connection, max_age_days: float,
+                         max_per_session: int, max_total: int) -> List[Tuple[str, int]]:
+    """(session_id, id) of messages past any limit, grouped by session, oldest first."""
+    columns, clauses, params = ["session_id", "id", "timestamp"], [], []
+    if max_age_days > 0:
+        clauses.append("timestamp < ?")
+        params.append(_cutoff(max_age_days))
+    if max_per_session > 0:
+        columns.append("ROW_NUMBER() OVER (PARTITION BY session_id ORDER BY timestamp DESC, id DESC) AS session_rank")
+        clauses.append("session_rank > ?")
+        params.append(max_per_session)
+    if max_total > 0:
+        columns.append("ROW_NUMBER() OVER (ORDER BY timestamp DESC, id DESC) AS global_rank")
+        clauses.append("global_rank > ?")
+        params.append(max_total)
+    if not clauses:
+        return []
+    rows = conn.execute(f"""
+        WITH ranked AS (SELECT {", ".join(columns)} FROM messages)
+        SELECT session_id, id FROM ranked
+        WHERE {" OR ".join(clauses)}
+        ORDER BY session_id, timestamp, id
+    """, params).fetchall()
+    return [(row["session_id"], row["id"]) for row in rows]
+
+
+def _archive_batch(session_id: str, ids: List[int]) -> int:
+    """Move one batch of a session's messages into message_archive."""
+    placeholders = ",".join("?" * len(ids))
+    with get_pool().transaction() as conn:
+        rows = conn.execute(f"""
+            SELECT id, role, content, timestamp, metadata FROM messages
+            WHERE id IN ({placeholders})
+            ORDER BY timestamp, id
+        """, ids).fetchall()
+        if not rows:
+            return 0
+        payload = zlib.compress(json.dumps([dict(row) for row in rows]).encode("utf-8"))
+        conn.execute("""
+            INSERT INTO message_archive (session_id, message_count, first_timestamp, last_timestamp, payload)
+            VALUES (?, ?, ?, ?, ?)
+        """, (session_id, len(rows), rows[0]["timestamp"], rows[-1]["timestamp"], payload))
+        # Delete triggers keep message_count / last_message_at and the FTS index in sync
+        conn.execute(f"DELETE FROM messages WHERE id IN ({placeholders})", [row["id"] for row in rows])
+    return len(rows)
+
+
+def archive_messages(max_age_days: float = 0, max_per_session: int = 0, max_total: int = 0,
+                     batch_size: int = ARCHIVE_BATCH_SIZE) -> Dict:
+    """
+    Move messages older than max_age_days, beyond the newest max_per_session
+    of their session, or beyond the newest max_total overall into the
+    compressed archive (0 = no limit). Runs in short per-batch transactions.
+    """
+    with get_pool().connection() as conn:
+        expired = _expired_message_ids(conn, max_age_days, max_per_session, max_total)
+
+    archived, batches, sessions = 0, 0, set()
+    i = 0
+    while i < len(expired):
+        session_id = expired[i][0]
+        ids = []
+        while i < len(expired) and expired[i][0] == session_id and len(ids) < batch_size:
+            ids.append(expired[i][1])
+            i += 1
+        moved = _archive_batch(session_id, ids)
+        if moved:
+            archived += moved
+            batches += 1
+            sessions.add(session_id)
+
+    return {"archived_messages": archived, "archive_rows": batches, "sessions": len(sessions)}
+
+
+def purge_archive(max_age_days: float) -> int:
+    """Delete archive rows whose newest message is older than max_age_days (0 = keep all)."""
+    if max_age_days <= 0:
+        return 0
+    with get_pool().transaction() as conn:
+        cursor = conn.execute("DELETE FROM message_archive WHERE last_timestamp < ?", (_cutoff(max_age_days),))
+        return cursor.rowcount
+
+
+def get_archived_messages(session_id: str, limit: int = 1000) -> List[Dict]:
+    """Archived messages of a session, oldest first (at most 'limit', the newest ones)."""
+    with get_pool().connection() as conn:
+        rows = conn.execute("""
+            SELECT payload FROM message_archive
             WHERE session_id = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ) ORDER BY timestamp ASC
-    """, (session_id, count))
-    
-    rows = cursor.fetchall()
-    conn.close()
-    
+            ORDER BY last_timestamp, id
+        """, (session_id,)).fetchall()
     messages = []
     for row in rows:
-        msg = dict(row)
-        if msg.get('metadata'):
-            msg['metadata'] = json.loads(msg['metadata'])
-        messages.append(msg)
-    
-    return messages
+        for msg in json.loads(zlib.decompress(row["payload"])):
+            msg["session_id"] = session_id
+            msg["metadata"] = json.loads(msg["metadata"]) if msg.get("metadata") else None
+            msg["archived"] = True
+            messages.append(msg)
+    return messages[-limit:] if limit else messages
+
+
+def incremental_vacuum(max_pages: int = 0) -> Dict:
+    """
+    Return up to max_pages free pages (0 = all) to the filesystem and
+    truncate the WAL. A database created without auto_vacuum=INCREMENTAL
+    is converted once with a full VACUUM.
+    """
+    with get_pool().connection() as conn:
+        free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        converted = conn.execute("PRAGMA auto_vacuum").fetchone()[0] != AUTO_VACUUM_INCREMENTAL
+        if converted:
+            conn.execute(f"PRAGMA auto_vacuum={AUTO_VACUUM_INCREMENTAL}")
+            conn.execute("VACUUM")
+        else:
+            # executescript steps the pragma to completion (execute stops
+            # after the first step, i.e. one page)
+            conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)});")
+        free_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("PRAGMA optimize")
+    return {
+        "freed_pages": free_before - free_after,
+        "free_pages": free_after,
+        "converted": converted
+    }
+
+
+def get_storage_stats() -> Dict:
+    """Database file size, page usage and archive totals."""
+    with get_pool().connection() as conn:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        archive = conn.execute(
+            "SELECT COUNT(*) AS rows, COALESCE(SUM(message_count), 0) AS messages, "
+            "COALESCE(SUM(LENGTH(payload)), 0) AS bytes FROM message_archive"
+        ).fetchone()
+    return {
+        "size_bytes": page_size * page_count,
+        "free_bytes": page_size * free_pages,
+        "incremental_vacuum": auto_vacuum == AUTO_VACUUM_INCREMENTAL,
+        "archive_rows": archive["rows"],
+        "archived_messages": archive["messages"],
+        "archive_bytes": archive["bytes"]
+    }
 
 
 # ============================================
@@ -259,19 +663,13 @@ def get_recent_messages(session_id: str, count: int = 10) -> List[Dict]:
 
 def get_stats() -> Dict:
     """Get memory statistics."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT COUNT(*) as count FROM conversations")
-    conversation_count = cursor.fetchone()['count']
-    
-    cursor.execute("SELECT COUNT(*) as count FROM messages")
-    message_count = cursor.fetchone()['count']
-    
-    conn.close()
-    
+    with get_pool().connection() as conn:
+        conversation_count = conn.execute("SELECT COUNT(*) as count FROM conversations").fetchone()['count']
+        message_count = conn.execute("SELECT COUNT(*) as count FROM messages").fetchone()['count']
+
     return {
         "total_conversations": conversation_count,
         "total_messages": message_count,
-        "database_path": DB_PATH
+        "database_path": DB_PATH,
+        "storage": get_storage_stats()
     }
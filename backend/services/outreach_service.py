@@ -0,0 +1,385 @@
+"""
+File: backend/services/outreach_service.py
+Purpose:
+Bulk provider outreach (e.g. discrepancy notices) over SMTP.
+
+- SendLedger        : SQLite record of every (campaign, recipient) send;
+                      re-running a campaign only sends what was not delivered
+- DomainRateLimiter : token bucket per recipient domain
+- SmtpTransport     : one reusable SMTP connection per worker
+- run_campaign      : bounded async worker pool with retry + backoff
+
+Without SMTP_HOST sends are mocked (logged only). Point SMTP_HOST/SMTP_PORT
+at `python -m backend.smtp_sink` to run a full campaign locally.
+"""
+
+import asyncio
+import logging
+import random
+import smtplib
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from email.message import EmailMessage
+from email.utils import make_msgid
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, Optional, Set
+
+from backend.core.config import get_settings
+from backend.services.job_service import job_service
+
+logger = logging.getLogger(__name__)
+
+# Retry backoff: BACKOFF_BASE * 2^(attempt-1) seconds, capped, plus jitter
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+
+class SendLedger:
+    """
+    Persistent send log keyed on (campaign_id, recipient).
+    Each result is committed as soon as it is recorded (WAL with
+    synchronous=NORMAL keeps that cheap), so a re-run after a crash never
+    resends a message the ledger saw delivered.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS email_sends (
+                campaign_id TEXT NOT NULL,
+                recipient TEXT NOT NULL,
+                provider_id TEXT,
+                template_id TEXT,
+                status TEXT,
+                attempts INTEGER,
+                last_error TEXT,
+                message_id TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (campaign_id, recipient)
+            )
+        """)
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def sent_recipients(self, campaign_id: str) -> Set[str]:
+        """Recipients already delivered in this campaign."""
+        rows = self._conn.execute(
+            "SELECT recipient FROM email_sends WHERE campaign_id = ? AND status = 'sent'",
+            (campaign_id,)
+        )
+        return {r[0] for r in rows}
+
+    def record(self, campaign_id: str, recipient: str, provider_id: Optional[str], template_id: str,
+               status: str, attempts: int, error: Optional[str] = None, message_id: Optional[str] = None):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO email_sends VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (campaign_id, recipient, provider_id, template_id, status,
+                 attempts, error, message_id, datetime.now().isoformat())
+            )
+
+    def summary(self, campaign_id: str) -> Dict[str, int]:
+        rows = self._conn.execute(
+            "SELECT status, COUNT(*) FROM email_sends WHERE campaign_id = ? GROUP BY status",
+            (campaign_id,)
+        )
+        return {status: count for status, count in rows}
+
+    def close(self):
+        self._conn.close()
+
+
+class DomainRateLimiter:
+    """
+    Token bucket per recipient domain (rate sends/second, burst = rate).
+    Must be used from a single event loop; rate <= 0 disables limiting.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.burst = max(1.0, rate)
+        self._buckets: Dict[str, tuple] = {}
+
+    async def acquire(self, domain: str):
+        if self.rate <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(domain, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens >= 1:
+                self._buckets[domain] = (tokens - 1, now)
+                return
+            self._buckets[domain] = (tokens, now)
+            await asyncio.sleep((1 - tokens) / self.rate)
+
+
+class SmtpTransport:
+    """
+    One SMTP connection, opened lazily and reused for every message the
+    owning worker sends. Dropped (and reopened on the next send) after
+    any error that may have left the session in an unknown state.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._conn: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        s = self.settings
+        conn = smtplib.SMTP(s.SMTP_HOST, s.SMTP_PORT, timeout=s.SMTP_TIMEOUT_SECONDS)
+        if s.SMTP_STARTTLS:
+            conn.starttls()
+        if s.SMTP_USER:
+            conn.login(s.SMTP_USER, s.SMTP_PASSWORD)
+        return conn
+
+    def send(self, message: EmailMessage):
+        if self._conn is None:
+            self._conn = self._connect()
+        try:
+            self._conn.send_message(message)
+        except smtplib.SMTPRecipientsRefused:
+            raise  # session is still usable (smtplib sent RSET)
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.quit()
+            except Exception:
+                pass
+            self._conn = None
+
+
+class MockTransport:
+    """Used when SMTP_HOST is not configured: logs instead of sending."""
+
+    def send(self, message: EmailMessage):
+        logger.debug(f"[mock] email '{message['Subject']}' to {message['To']}")
+
+    def close(self):
+        pass
+
+
+def make_transport(settings=None):
+    settings = settings or get_settings()
+    return SmtpTransport(settings) if settings.SMTP_HOST else MockTransport()
+
+
+def is_transient(exc: Exception) -> bool:
+    """
+    4xx replies, disconnects and network errors are worth retrying. Other
+    SMTP errors (no reply code, e.g. an unsupported extension or a
+    malformed message) are permanent.
+    """
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    # SMTPException subclasses OSError, so it must be ruled out first
+    if isinstance(exc, smtplib.SMTPException):
+        return False
+    return isinstance(exc, (socket.timeout, ConnectionError, OSError))
+
+
+def backoff_delay(attempt: int) -> float:
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+def recipient_domain(address: str) -> str:
+    return address.rpartition("@")[2].lower()
+
+
+def interleave_by_domain(items: Iterable[Dict[str, Any]], window: int = 5000) -> Iterator[Dict[str, Any]]:
+    """
+    Round-robin items across recipient domains within a sliding window,
+    so one slow (rate-limited) domain does not stall every worker.
+    """
+    buckets: "OrderedDict[str, deque]" = OrderedDict()
+    held = 0
+
+    def drain_round():
+        nonlocal held
+        for domain in list(buckets):
+            queue = buckets[domain]
+            yield queue.popleft()
+            held -= 1
+            if not queue:
+                del buckets[domain]
+
+    for item in items:
+        buckets.setdefault(recipient_domain(item["recipient"]), deque()).append(item)
+        held += 1
+        if held >= window:
+            yield from drain_round()
+    while buckets:
+        yield from drain_round()
+
+
+def build_message(sender: str, recipient: str, subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = recipient
+    message["Subject"] = subject
+    message["Message-ID"] = make_msgid(domain=recipient_domain(sender) or None)
+    message.set_content(body)
+    return message
+
+
+async def run_campaign(items: Iterable[Dict[str, Any]], campaign_id: Optional[str] = None,
+                       job_id: Optional[str] = None, workers: Optional[int] = None,
+                       domain_rate: Optional[float] = None, max_attempts: Optional[int] = None,
+                       ledger_path: Optional[str] = None, transport_factory=None) -> Dict[str, Any]:
+    """
+    Send a stream of outreach items through a bounded worker pool.
+
+    Each item: {"recipient", "subject", "body", "template_id", "provider_id"}.
+    Recipients already marked 'sent' for this campaign_id in the ledger are
+    skipped, so a campaign can be re-run safely after a crash or partial failure.
+    """
+    settings = get_settings()
+    campaign_id = campaign_id or str(uuid.uuid4())
+    workers = workers or settings.OUTREACH_WORKERS
+    max_attempts = max_attempts or settings.OUTREACH_MAX_ATTEMPTS
+    limiter = DomainRateLimiter(settings.OUTREACH_DOMAIN_RATE if domain_rate is None else domain_rate)
+    ledger = SendLedger(ledger_path or settings.OUTREACH_LEDGER_DB)
+    transport_factory = transport_factory or (lambda: make_transport(settings))
+
+    already_sent = ledger.sent_recipients(campaign_id)
+    stats = {"queued": 0, "sent": 0, "failed": 0, "skipped": 0, "retries": 0}
+    queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 4)
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="outreach")
+    started = time.perf_counter()
+
+    def report_progress():
+        done = stats["sent"] + stats["failed"]
+        if job_id and done % 500 == 0:
+            job_service.update_job(
+                job_id, "running",
+                details=f"Sent {stats['sent']}, failed {stats['failed']}, skipped {stats['skipped']}"
+            )
+
+    async def worker():
+        transport = transport_factory()
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                recipient = item["recipient"]
+                message = None
+                attempt = 0
+                while True:
+                    attempt += 1
+                    try:
+                        # A malformed item (e.g. CR/LF in a header) fails
+                        # like a permanent send error and is recorded
+                        if message is None:
+                            message = build_message(settings.EMAIL_FROM, recipient,
+                                                    item["subject"], item["body"])
+                        await limiter.acquire(recipient_domain(recipient))
+                        await loop.run_in_executor(executor, transport.send, message)
+                        stats["sent"] += 1
+                        ledger.record(campaign_id, recipient, item.get("provider_id"), item.get("template_id"),
+                                      "sent", attempt, message_id=message["Message-ID"])
+                        break
+                    except Exception as e:
+                        if attempt < max_attempts and is_transient(e):
+                            stats["retries"] += 1
+                            await asyncio.sleep(backoff_delay(attempt))
+                            continue
+                        stats["failed"] += 1
+                        logger.warning(f"Outreach to {recipient} failed after {attempt} attempts: {e}")
+                        ledger.record(campaign_id, recipient, item.get("provider_id"), item.get("template_id"),
+                                      "failed", attempt, error=str(e))
+                        break
+                report_progress()
+        finally:
+            await loop.run_in_executor(executor, transport.close)
+
+    async def enqueue(item) -> bool:
+        # The queue is bounded, so put() would wait forever once every worker
+        # has died; give up (False) in that case instead
+        put = asyncio.ensure_future(queue.put(item))
+        while not put.done():
+            running = [task for task in tasks if not task.done()]
+            if not running:
+                put.cancel()
+                return False
+            await asyncio.wait([put, *running], return_when=asyncio.FIRST_COMPLETED)
+        return True
+
+    tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+    try:
+        for item in interleave_by_domain(items):
+            if item["recipient"] in already_sent:
+                stats["skipped"] += 1
+                continue
+            stats["queued"] += 1
+            if not await enqueue(item):
+                break
+        for _ in tasks:
+            if not await enqueue(None):
+                break
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=False)
+        ledger.close()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "campaign_id": campaign_id,
+        **stats,
+        "elapsed_seconds": round(elapsed, 2),
+        "per_second": round(stats["sent"] / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def start_campaign(items: Iterable[Dict[str, Any]], campaign_id: str, job_id: str, **kwargs):
+    """
+    Run a campaign on its own thread and event loop, independent of the
+    request that started it. Progress and the result go to job_service.
+    """
+    def target():
+        try:
+            job_service.update_job(job_id, "running", details=f"Campaign {campaign_id} started")
+            result = asyncio.run(run_campaign(items, campaign_id=campaign_id, job_id=job_id, **kwargs))
+            job_service.update_job(
+                job_id, "completed", progress=100,
+                details=(f"Campaign {campaign_id}: sent {result['sent']}, failed {result['failed']}, "
+                         f"skipped {result['skipped']} in {result['elapsed_seconds']}s")
+            )
+        except Exception as e:
+            logger.error(f"Campaign {campaign_id} crashed: {e}")
+            job_service.update_job(job_id, "failed", details=f"Error: {str(e)}")
+
+    thread = threading.Thread(target=target, name=f"campaign-{campaign_id[:8]}", daemon=True)
+    thread.start()
+    return thread
+
+
+def campaign_status(campaign_id: str, ledger_path: Optional[str] = None) -> Dict[str, Any]:
+    """Per-status counts for a campaign from the send ledger."""
+    ledger = SendLedger(ledger_path or get_settings().OUTREACH_LEDGER_DB)
+    try:
+        return {"campaign_id": campaign_id, "counts": ledger.summary(campaign_id)}
+    finally:
+        ledger.close()
@@ -0,0 +1,191 @@
+"""
+File: backend/services/report_service.py
+Purpose:
+Background generation and disk cache for PDF summary reports.
+
+Reports are keyed on (batch_id, filters). The first request starts a
+background job that renders rows as they stream from provider_results
+(reporting progress every few pages); later requests for the same key are
+served from the cached file. Reports without a batch_id also key on the
+current change cursor, so a directory-wide report is rebuilt only after
+new results arrive.
+
+The cache is pruned after each render: reports older than
+REPORT_CACHE_MAX_AGE_SECONDS go first, then the least recently served
+until the directory fits in REPORT_CACHE_MAX_BYTES.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Any, Optional, Iterator
+
+from database.db import iter_provider_results, get_change_cursor, build_result_filters
+from backend.services.job_service import job_service
+
+REPORT_CACHE_DIR = os.path.join("data", "report_cache")
+REPORT_CACHE_MAX_BYTES = 500 * 1024 * 1024
+REPORT_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+# Progress is reported every N rendered pages
+PAGES_PER_CHUNK = 20
+
+
+class ReportService:
+    """
+    Service to build PDF summary reports off the request path.
+    Concurrent requests for the same report share one job.
+    """
+
+    def __init__(self, cache_dir: str = REPORT_CACHE_DIR,
+                 max_bytes: int = REPORT_CACHE_MAX_BYTES,
+                 max_age_seconds: float = REPORT_CACHE_MAX_AGE_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, str] = {}  # report_id -> job_id
+
+    def report_key(self, batch_id: Optional[str] = None, filters: Optional[Dict[str, Any]] = None) -> str:
+        """Stable id for a (batch_id, filters) report."""
+        key = {"batch_id": batch_id, "filters": filters or {}}
+        if batch_id is None:
+            key["cursor"] = get_change_cursor()
+        raw = json.dumps(key, sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+    def report_path(self, report_id: str) -> str:
+        return os.path.join(self.cache_dir, f"summary_{report_id}.pdf")
+
+    def get_cached(self, report_id: str) -> Optional[str]:
+        """Path of a finished report, or None. Marks it recently used."""
+        path = self.report_path(report_id)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return path
+
+    def prune_cache(self, keep: Optional[str] = None) -> int:
+        """
+        Delete expired reports, then the least recently used ones until the
+        cache fits in max_bytes. 'keep' (a path) is never deleted.
+        Returns the number of files removed.
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return 0
+
+        entries = []
+        for name in names:
+            if not name.endswith(".pdf"):
+                continue  # skips .part files still being rendered
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        entries.sort()
+
+        cutoff = time.time() - self.max_age_seconds
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if path == keep:
+                continue
+            if mtime >= cutoff and total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def get_status(self, report_id: str) -> Dict[str, Any]:
+        """'ready', 'pending' (with job_id) or 'missing'."""
+        if self.get_cached(report_id):
+            return {"status": "ready", "report_id": report_id}
+        with self._lock:
+            job_id = self._in_flight.get(report_id)
+        if job_id:
+            return {"status": "pending", "report_id": report_id, "job_id": job_id}
+        return {"status": "missing", "report_id": report_id}
+
+    def request_report(self, batch_id: Optional[str] = None,
+                       filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Return the cached report if present, otherwise register a job.
+        'start' is True only for the caller that must launch render_report.
+        Unknown filter names raise ValueError.
+        """
+        build_result_filters(filters or {})
+        report_id = self.report_key(batch_id, filters)
+        if self.get_cached(report_id):
+            return {"status": "ready", "report_id": report_id, "start": False}
+
+        with self._lock:
+            job_id = self._in_flight.get(report_id)
+            if job_id:
+                return {"status": "pending", "report_id": report_id, "job_id": job_id, "start": False}
+            job_id = job_service.create_job("summary_pdf", user="admin")
+            self._in_flight[report_id] = job_id
+
+        return {"status": "pending", "report_id": report_id, "job_id": job_id, "start": True}
+
+    def render_report(self, report_id: str, job_id: str, batch_id: Optional[str] = None,
+                      filters: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Background job: stream matching results into the PDF, then prune
+        the cache.
+        """
+        # reportlab is only needed once a report is actually rendered
+        from utils.exporter import export_summary_pdf
+
+        filters = dict(filters or {})
+        if batch_id is not None:
+            filters["batch_id"] = batch_id
+
+        def on_chunk(rows: int, pages: int):
+            job_service.update_job(job_id, "running", details=f"Rendered {pages} pages ({rows} providers)")
+
+        try:
+            job_service.update_job(job_id, "running", details="Rendering summary PDF")
+            title = f"Provider Directory QA Summary - batch {batch_id}" if batch_id else "Provider Directory QA Summary"
+            path = export_summary_pdf(
+                self._summary_rows(filters),
+                self.report_path(report_id),
+                title=title,
+                pages_per_chunk=PAGES_PER_CHUNK,
+                on_chunk=on_chunk,
+            )
+            job_service.update_job(job_id, "completed", details=f"Summary PDF ready ({report_id})", progress=100)
+            self.prune_cache(keep=path)
+            return path
+        except Exception as e:
+            job_service.update_job(job_id, "failed", details=f"Error: {str(e)}")
+            return None
+        finally:
+            with self._lock:
+                self._in_flight.pop(report_id, None)
+
+    @staticmethod
+    def _summary_rows(filters: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Map provider_results rows to the PDF line fields."""
+        for row in iter_provider_results(filters):
+            confidence = row.get("confidence")
+            yield {
+                "Provider Name": row.get("name") or row.get("provider_id"),
+                "Status": row.get("status"),
+                "Overall Confidence": f"{confidence}%" if confidence is not None else "-",
+                "Risk Level": row.get("risk_level"),
+            }
+
+
+# Singleton instance
+report_service = ReportService()
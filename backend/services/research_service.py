@@ -6,30 +6,45 @@ Simplified version with fallback when LangChain isn't available.
 Now with SQLite-backed persistent memory.
 """
 
+import asyncio
 import os
 from typing import Dict, Any, List
 from datetime import datetime
 
+from backend.core.config import get_settings
+from backend.services.answer_cache import answer_cache, needs_context
+
 # LangChain is now handled inside agents/research_agent.py
 
-# Try Google GenAI for simple fallback
-GENAI_AVAILABLE = False
-try:
-    import google.generativeai as genai
-    GENAI_AVAILABLE = True
-except ImportError:
+# Google GenAI for simple fallback: one shared client, calls bounded by
+# llm_limiter (see llm_client)
+from backend.services.llm_client import (
+    GENAI_AVAILABLE,
+    LLMBusyError,
+    LLMTimeoutError,
+    get_model,
+    generate,
+    run_blocking,
+    iterate_blocking,
+    iterate_with_timeout,
+    llm_limiter
+)
+if not GENAI_AVAILABLE:
     print("google.generativeai not available")
 
 # Database memory service with fallback
 try:
     from backend.services.memory_service import (
         add_message,
+        add_messages,
         get_messages,
         clear_messages,
         get_recent_messages,
         get_all_conversations,
         delete_conversation,
-        get_stats
+        get_stats,
+        accept_answer,
+        get_accepted_answers
     )
     MEMORY_AVAILABLE = True
 except ImportError:
@@ -44,6 +59,9 @@ except ImportError:
             "role": role, "content": content, "timestamp": datetime.now().isoformat()
         })
         return {"id": len(_conversation_history[session_id])}
+
+    def add_messages(session_id: str, messages):
+        return [add_message(session_id, role, content, metadata) for role, content, metadata in messages]
     
     def get_messages(session_id: str, limit=100):
         return _conversation_history.get(session_id, [])[:limit]
@@ -69,117 +87,81 @@ except ImportError:
     def get_stats():
         return {"total_conversations": len(_conversation_history), "memory_type": "in-memory"}
 
+    def accept_answer(message_id: int):
+        return None
 
-# ============================================
-# Simple Drug Database (built-in)
-# ============================================
-
-DRUG_DATABASE = {
-    "aspirin": {
-        "generic_name": "Acetylsalicylic acid",
-        "brand_names": ["Bayer", "Bufferin", "Ecotrin"],
-        "drug_class": "NSAID",
-        "uses": "Pain relief, fever reduction, anti-inflammatory, blood thinner",
-        "side_effects": "Stomach upset, heartburn, nausea, bleeding risk",
-        "warnings": "Not for children under 12, avoid with blood thinners"
-    },
-    "ibuprofen": {
-        "generic_name": "Ibuprofen",
-        "brand_names": ["Advil", "Motrin", "Nurofen"],
-        "drug_class": "NSAID",
-        "uses": "Pain relief, fever reduction, anti-inflammatory",
-        "side_effects": "Stomach upset, dizziness, headache",
-        "warnings": "May increase cardiovascular risk with long-term use"
-    },
-    "metformin": {
-        "generic_name": "Metformin hydrochloride",
-        "brand_names": ["Glucophage", "Fortamet"],
-        "drug_class": "Biguanide (Antidiabetic)",
-        "uses": "Type 2 diabetes, blood sugar control",
-        "side_effects": "Nausea, diarrhea, metallic taste",
-        "warnings": "Risk of lactic acidosis, avoid with kidney disease"
-    },
-    "lisinopril": {
-        "generic_name": "Lisinopril",
-        "brand_names": ["Prinivil", "Zestril"],
-        "drug_class": "ACE Inhibitor",
-        "uses": "High blood pressure, heart failure",
-        "side_effects": "Dry cough, dizziness, headache",
-        "warnings": "Not for pregnancy, monitor potassium"
-    }
-}
+    def get_accepted_answers():
+        return []
 
 
 # ============================================
-# Customer Care Knowledge Base
+# Local Knowledge (drug database, customer care KB, accepted answers)
 # ============================================
 
-CUSTOMER_CARE_KB = {
-    "update provider": "To update provider information: Log into dashboard > Provider Management > Search & Edit > Submit for verification.",
-    "add provider": "To add a new provider: Dashboard > Batch Processing > Upload CSV > Run validation > Review results.",
-    "verification": "Check verification status in Dashboard > Overview with color-coded risk levels.",
-    "compliance": "CareGrid maintains 48-hour turnaround compliance with automated validation.",
-    "export": "Export data: Navigate to results page > Click Export > Choose CSV or JSON.",
-    "batch": "Batch processing supports up to 300 records. Upload CSV with name, address, phone, specialty."
-}
-
-
-def lookup_drug(query: str) -> str:
-    """Look up drug information."""
-    query_lower = query.lower()
-    for drug_name, info in DRUG_DATABASE.items():
-        if drug_name in query_lower:
-            return f"""
-**{info['generic_name']}** ({', '.join(info['brand_names'])})
-- Class: {info['drug_class']}
-- Uses: {info['uses']}
-- Side Effects: {info['side_effects']}
-- Warnings: {info['warnings']}
-
-⚠️ Consult a healthcare provider for medical advice.
-"""
-    return None
-
-
-def lookup_customer_care(query: str) -> str:
-    """Look up customer care answers."""
-    query_lower = query.lower()
-    for keyword, answer in CUSTOMER_CARE_KB.items():
-        if keyword in query_lower:
-            return answer
-    return None
+# DRUG_DATABASE / CUSTOMER_CARE_KB and the lookups live in tools/knowledge_base
+from tools.knowledge_base import (
+    DRUG_DATABASE,
+    CUSTOMER_CARE_KB,
+    lookup_drug,
+    lookup_customer_care,
+    answer_locally,
+    get_knowledge_store
+)
+
+_accepted_loaded = False
+
+
+def _knowledge_store():
+    """Shared knowledge store, with accepted answers loaded on first use."""
+    global _accepted_loaded
+    store = get_knowledge_store()
+    if not _accepted_loaded:
+        for row in get_accepted_answers():
+            store.add_answer(row["id"], row["question"], row["answer"])
+        _accepted_loaded = True
+    return store
+
+
+def local_answer(query: str):
+    """
+    KB article or accepted answer that covers the question with at least
+    RESEARCH_LOCAL_CONFIDENCE and is an unambiguous match (see
+    KnowledgeStore.best), as (response, tools_used), else None. Callers
+    skip it for follow-ups that need the conversation context.
+    """
+    _knowledge_store()
+    hit = answer_locally(query, get_settings().RESEARCH_LOCAL_CONFIDENCE)
+    if hit is None:
+        return None
+    return hit["text"], ["KnowledgeBase"]
+
+
+def get_knowledge_stats() -> Dict:
+    """Knowledge store size by document kind."""
+    kinds: Dict[str, int] = {}
+    for doc in _knowledge_store().docs:
+        kinds[doc["kind"]] = kinds.get(doc["kind"], 0) + 1
+    return {"documents": sum(kinds.values()), "by_kind": kinds,
+            "min_confidence": get_settings().RESEARCH_LOCAL_CONFIDENCE}
+
+
+def accept_research_answer(message_id: int) -> Dict:
+    """
+    Mark an assistant answer as accepted: it is stored and indexed, so the
+    same question is answered locally (no LLM) from then on.
+    """
+    accepted = accept_answer(message_id)
+    if accepted is None:
+        return {"status": "not_found", "message_id": message_id}
+    _knowledge_store().add_answer(accepted["id"], accepted["question"], accepted["answer"])
+    return {"status": "accepted", "message_id": message_id, "question": accepted["question"]}
 
 
 # ============================================
 # Simple Gemini Agent (fallback)
 # ============================================
 
-def simple_gemini_response(query: str, context: str = "") -> str:
-    """Use Google Gemini directly for responses."""
-    api_key = os.getenv("GOOGLE_API_KEY", "")
-    
-    if not api_key or api_key == "your_google_gemini_key_here":
-        return "⚠️ GOOGLE_API_KEY not configured. Please set a valid API key in your .env file."
-    
-    if not GENAI_AVAILABLE:
-        return "⚠️ Google GenAI package not installed. Run: pip install google-generativeai"
-    
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # Check for drug queries first
-        drug_info = lookup_drug(query)
-        if drug_info:
-            return drug_info
-        
-        # Check customer care queries
-        care_info = lookup_customer_care(query)
-        if care_info:
-            return care_info
-        
-        # Use Gemini for general queries
-        prompt = f"""You are CareGrid Research Assistant, a helpful AI for:
+RESEARCH_PROMPT = """You are CareGrid Research Assistant, a helpful AI for:
 1. Medical research and information
 2. Drug information
 3. Healthcare provider questions
@@ -191,7 +173,38 @@ User question: {query}
 
 Provide a helpful, concise response. For medical questions, include a disclaimer to consult healthcare providers."""
 
-        response = model.generate_content(prompt)
+
+def _gemini_unavailable() -> str:
+    """Configuration problem message, or '' if Gemini can be called."""
+    api_key = os.getenv("GOOGLE_API_KEY", "")
+    if not api_key or api_key == "your_google_gemini_key_here":
+        return "⚠️ GOOGLE_API_KEY not configured. Please set a valid API key in your .env file."
+    if not GENAI_AVAILABLE:
+        return "⚠️ Google GenAI package not installed. Run: pip install google-generativeai"
+    return ""
+
+
+def _keyword_answer(query: str):
+    """Built-in drug / customer care answer by keyword (weaker than local_answer), or None."""
+    return lookup_drug(query) or lookup_customer_care(query)
+
+
+def simple_gemini_response(query: str, context: str = "") -> str:
+    """Use Google Gemini directly for responses."""
+    problem = _gemini_unavailable()
+    if problem:
+        return problem
+
+    try:
+        model = get_model()
+
+        # Check for drug / customer care queries first
+        local = _keyword_answer(query)
+        if local:
+            return local
+
+        # Use Gemini for general queries
+        response = model.generate_content(RESEARCH_PROMPT.format(context=context, query=query))
         return response.text
         
     except Exception as e:
@@ -204,77 +217,172 @@ Provide a helpful, concise response. For medical questions, include a disclaimer
 
 # Import the agent from your AGENTS folder
 try:
-    from agents.research_agent import build_research_agent
+    from agents.research_agent import (
+        build_research_agent,
+        gather_observations,
+        build_synthesis_prompt,
+        get_retrieval_tools,
+        plan_tools
+    )
 except ImportError:
     build_research_agent = None
+    gather_observations = None
 
 
+# "parallel": fan out to retrieval tools, then one synthesis call
+# "react":    LangChain ReAct agent (one LLM round-trip per tool call)
+RESEARCH_MODES = ("parallel", "react")
+
 _agent_cache = None
 
 def get_agent():
     """Get or create agent using the logic in agents/research_agent.py"""
-    global _agent_cache
+    global _agent_cache, build_research_agent
     if _agent_cache is None:
         if build_research_agent:
-            _agent_cache = build_research_agent()
+            try:
+                _agent_cache = build_research_agent()
+            except ImportError as e:
+                # LangChain agent classes missing: don't retry every request
+                print(f"ReAct agent not available: {e}")
+                build_research_agent = None
     return _agent_cache
 
 
+def resolve_mode(mode: str = None) -> str:
+    """Requested research mode, or the configured default (ValueError if unknown)."""
+    mode = mode or get_settings().RESEARCH_MODE
+    if mode not in RESEARCH_MODES:
+        raise ValueError(f"Unknown research mode: {mode} (expected one of {', '.join(RESEARCH_MODES)})")
+    if mode == "parallel" and gather_observations is None:
+        return "react"
+    return mode
+
+
 # ============================================
 # Main Service Functions
 # ============================================
 
-def run_research_query(query: str, session_id: str = "default") -> Dict[str, Any]:
-    """Run a research query - uses LangChain if available, otherwise simple Gemini."""
+def _context_text(recent: List[Dict]) -> str:
+    """Prompt context from the last few messages of a session."""
+    if not recent:
+        return ""
+    return "Recent conversation:\n" + "\n".join(
+        f"{m['role']}: {m['content'][:100]}..." for m in recent
+    )
+
+
+def run_research_query(query: str, session_id: str = "default", use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Run a research query - uses LangChain if available, otherwise simple Gemini.
+
+    Answers are served from the shared answer cache when the same question
+    (after normalization) was answered recently, unless use_cache is False
+    or the question refers back to earlier turns of this session.
+    """
     try:
         # Get conversation context
         recent = get_recent_messages(session_id, count=4)
-        context = ""
-        if recent:
-            context = "Recent conversation:\n" + "\n".join(
-                f"{m['role']}: {m['content'][:100]}..." for m in recent
-            )
-        
-        # Try to use LangChain agent for real agentic execution
-        agent = get_agent()
-        
-        if agent:
-            try:
-                # Run agent with ReAct reasoning
-                result = agent.invoke({"input": query})
-                response = result.get("output", "No response generated")
-                
-                # Track which tools were used
-                tools_used = []
-                if "intermediate_steps" in result:
-                    for step in result["intermediate_steps"]:
-                        if len(step) > 0 and hasattr(step[0], 'tool'):
-                            tools_used.append(step[0].tool)
-                
-            except Exception as e:
-                print(f"Agent execution error: {e}")
-                # Fallback to simple Gemini
-                response = simple_gemini_response(query, context)
-                tools_used = []
+        context = _context_text(recent)
+
+        # Follow-ups ("what are its side effects?") depend on earlier turns:
+        # neither the shared cache nor the knowledge base can answer them
+        contextual = bool(recent) and needs_context(query)
+        cacheable = use_cache and not contextual
+        cached = answer_cache.get(query) if cacheable else None
+
+        local = None if cached or contextual else local_answer(query)
+
+        if cached:
+            response = cached["response"]
+            tools_used = cached["tools_used"]
+        elif local:
+            # Covered by the knowledge base: no LLM call
+            response, tools_used = local
         else:
-            # Fallback if agent creation failed
-            response = simple_gemini_response(query, context)
-            tools_used = []
-        
-        # Save to memory
-        add_message(session_id, "user", query)
-        add_message(session_id, "assistant", response)
-        
+            response, tools_used = _answer_query(query, context)
+            # Error/config messages (⚠️ ...) are not cached
+            if cacheable and not response.startswith("⚠️"):
+                answer_cache.put(query, response, tools_used)
+
+        # Save to memory (one transaction for the question and the answer)
+        saved = add_messages(session_id, [("user", query, None), ("assistant", response, {"cached": True} if cached else None)])
+
         return {
             "status": "success",
             "response": response,
             "query": query,
             "session_id": session_id,
             "timestamp": datetime.now().isoformat(),
-            "tools_used": list(set(tools_used)) if tools_used else [],
-            "has_memory": MEMORY_AVAILABLE
+            "tools_used": tools_used,
+            "has_memory": MEMORY_AVAILABLE,
+            "message_id": saved[-1]["id"],
+            "cached": bool(cached),
+            "cache_age_seconds": cached["age_seconds"] if cached else None
         }
-        
+
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": str(e),
+            "message": "An error occurred. Please check your GOOGLE_API_KEY."
+        }
+
+
+async def arun_research_query(query: str, session_id: str = "default", use_cache: bool = True,
+                              mode: str = None) -> Dict[str, Any]:
+    """
+    Async version of run_research_query for the API. LLM work runs under
+    llm_limiter with a per-request timeout; LLMBusyError (queue full) and
+    LLMTimeoutError are raised to the caller instead of returned as errors.
+    'mode' is "parallel" or "react" (default: settings.RESEARCH_MODE);
+    an unknown mode raises ValueError.
+    """
+    mode = resolve_mode(mode)
+    try:
+        recent = await asyncio.to_thread(get_recent_messages, session_id, 4)
+        context = _context_text(recent)
+
+        # Follow-ups ("what are its side effects?") depend on earlier turns:
+        # neither the shared cache nor the knowledge base can answer them
+        contextual = bool(recent) and needs_context(query)
+        cacheable = use_cache and not contextual
+        cached = answer_cache.get(query) if cacheable else None
+
+        local = None if cached or contextual else local_answer(query)
+
+        if cached:
+            response = cached["response"]
+            tools_used = cached["tools_used"]
+        elif local:
+            # Covered by the knowledge base: no LLM call
+            response, tools_used = local
+        else:
+            response, tools_used = await _aanswer_query(query, context, mode)
+            if cacheable and not response.startswith("⚠️"):
+                answer_cache.put(query, response, tools_used)
+
+        saved = await asyncio.to_thread(
+            add_messages, session_id,
+            [("user", query, None), ("assistant", response, {"cached": True} if cached else None)]
+        )
+
+        return {
+            "status": "success",
+            "response": response,
+            "query": query,
+            "session_id": session_id,
+            "timestamp": datetime.now().isoformat(),
+            "tools_used": tools_used,
+            "has_memory": MEMORY_AVAILABLE,
+            "message_id": saved[-1]["id"],
+            "cached": bool(cached),
+            "cache_age_seconds": cached["age_seconds"] if cached else None,
+            "mode": mode
+        }
+
+    except (LLMBusyError, LLMTimeoutError):
+        raise
     except Exception as e:
         return {
             "status": "error",
@@ -283,6 +391,301 @@ def run_research_query(query: str, session_id: str = "default") -> Dict[str, Any
         }
 
 
+async def _aanswer_parallel(query: str, context: str):
+    """Parallel mode: all retrieval tools at once, then one synthesis call."""
+    observations = [o async for o in gather_observations(query)]
+    tools_used = sorted(o["tool"] for o in observations if o.get("output"))
+
+    problem = _gemini_unavailable()
+    if problem:
+        return problem, tools_used
+    return await generate(build_synthesis_prompt(query, observations, context)), tools_used
+
+
+async def _aanswer_query(query: str, context: str, mode: str = "react"):
+    """Async _answer_query: agent on the LLM pool, else Gemini's async API."""
+    if mode == "parallel":
+        return await _aanswer_parallel(query, context)
+
+    agent = get_agent()
+
+    if agent:
+        try:
+            result = await run_blocking(agent.invoke, {"input": query})
+            response = result.get("output", "No response generated")
+            tools_used = [
+                step[0].tool for step in result.get("intermediate_steps", [])
+                if len(step) > 0 and hasattr(step[0], 'tool')
+            ]
+            return response, sorted(set(tools_used))
+        except (LLMBusyError, LLMTimeoutError):
+            raise
+        except Exception as e:
+            print(f"Agent execution error: {e}")
+
+    problem = _gemini_unavailable()
+    if problem:
+        return problem, []
+    local = _keyword_answer(query)
+    if local:
+        return local, []
+    return await generate(RESEARCH_PROMPT.format(context=context, query=query)), []
+
+
+def _answer_query(query: str, context: str):
+    """Produce (response, tools_used) with the agent, falling back to simple Gemini."""
+    # Try to use LangChain agent for real agentic execution
+    agent = get_agent()
+
+    if agent:
+        try:
+            # Run agent with ReAct reasoning
+            result = agent.invoke({"input": query})
+            response = result.get("output", "No response generated")
+
+            # Track which tools were used
+            tools_used = []
+            if "intermediate_steps" in result:
+                for step in result["intermediate_steps"]:
+                    if len(step) > 0 and hasattr(step[0], 'tool'):
+                        tools_used.append(step[0].tool)
+            return response, sorted(set(tools_used))
+
+        except Exception as e:
+            print(f"Agent execution error: {e}")
+
+    # Fallback to simple Gemini (agent creation or execution failed)
+    return simple_gemini_response(query, context), []
+
+
+# ============================================
+# Streaming (SSE) Research Queries
+# ============================================
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+# Tool observations are truncated to this many characters in stream events
+STREAM_OBSERVATION_CHARS = 500
+
+
+def _generate_stream(prompt: str):
+    """Blocking Gemini response stream, with the HTTP timeout matching the stall timeout."""
+    timeout = get_settings().LLM_TIMEOUT_SECONDS
+    return get_model().generate_content(prompt, stream=True, request_options={"timeout": timeout})
+
+
+async def _stream_gemini(query: str, context: str):
+    """Token events from Gemini (or one event with a local / error answer)."""
+    problem = _gemini_unavailable()
+    local = None if problem else _keyword_answer(query)
+    if problem or local:
+        yield {"t": "token", "text": problem or local}
+        return
+
+    prompt = RESEARCH_PROMPT.format(context=context, query=query)
+    async for chunk in iterate_blocking(lambda: _generate_stream(prompt)):
+        text = getattr(chunk, "text", "")
+        if text:
+            yield {"t": "token", "text": text}
+
+
+async def _stream_agent(agent, query: str):
+    """
+    Step and token events from the ReAct agent. The LLM's Thought/Action
+    text is not forwarded; only what follows "Final Answer:" is streamed
+    as tokens. Tool calls and observations become step events.
+    """
+    llm_text: Dict[str, str] = {}  # run_id -> text so far
+    answer_started = set()
+    final_output = None
+
+    async for event in agent.astream_events({"input": query}, version="v2"):
+        kind = event["event"]
+        if kind == "on_tool_start":
+            yield {"t": "tool", "tool": event["name"], "input": str(event["data"].get("input", ""))}
+        elif kind == "on_tool_end":
+            output = str(event["data"].get("output", ""))
+            yield {"t": "observation", "tool": event["name"], "output": output[:STREAM_OBSERVATION_CHARS]}
+        elif kind == "on_chat_model_stream":
+            run_id = event["run_id"]
+            chunk = event["data"]["chunk"]
+            text = chunk.content if isinstance(chunk.content, str) else ""
+            seen = llm_text.get(run_id, "") + text
+            llm_text[run_id] = seen
+            if run_id in answer_started:
+                if text:
+                    yield {"t": "token", "text": text}
+            elif FINAL_ANSWER_MARKER in seen:
+                answer_started.add(run_id)
+                tail = seen.split(FINAL_ANSWER_MARKER, 1)[1].lstrip()
+                if tail:
+                    yield {"t": "token", "text": tail}
+        elif kind == "on_chain_end" and not event.get("parent_ids"):
+            output = event["data"].get("output")
+            if isinstance(output, dict) and "output" in output:
+                final_output = output["output"]
+
+    if final_output is not None and not answer_started:
+        # Parsing fallbacks (e.g. iteration limit) never print the marker
+        yield {"t": "token", "text": final_output}
+    yield {"t": "final", "response": final_output}
+
+
+async def _stream_parallel(query: str, context: str):
+    """
+    Parallel mode events: a tool event per planned tool, an observation
+    event as each returns (by the deadline), then the synthesis tokens.
+    """
+    tools = plan_tools(query, list(get_retrieval_tools()))
+    for name in tools:
+        yield {"t": "tool", "tool": name, "input": query}
+
+    observations = []
+    async for obs in gather_observations(query, tools):
+        observations.append(obs)
+        output = obs.get("output")
+        yield {
+            "t": "observation",
+            "tool": obs["tool"],
+            "output": str(output)[:STREAM_OBSERVATION_CHARS] if output else None,
+            "error": obs.get("error"),
+            "elapsed_ms": obs.get("elapsed_ms")
+        }
+    tools_used = sorted(o["tool"] for o in observations if o.get("output"))
+
+    problem = _gemini_unavailable()
+    if problem:
+        yield {"t": "token", "text": problem}
+        yield {"t": "answer", "response": problem, "tools_used": tools_used}
+        return
+
+    prompt = build_synthesis_prompt(query, observations, context)
+    parts: List[str] = []
+    async for chunk in iterate_blocking(lambda: _generate_stream(prompt)):
+        text = getattr(chunk, "text", "")
+        if text:
+            parts.append(text)
+            yield {"t": "token", "text": text}
+    yield {"t": "answer", "response": "".join(parts), "tools_used": tools_used}
+
+
+async def _stream_answer(query: str, context: str, mode: str = "react"):
+    """
+    Step/token events for a fresh answer (agent first, Gemini fallback),
+    ending with {"t": "answer", "response", "tools_used"}.
+    """
+    if mode == "parallel":
+        async for event in _stream_parallel(query, context):
+            yield event
+        return
+
+    parts: List[str] = []
+    tools_used = []
+    agent = get_agent()
+    final = None
+    if agent:
+        try:
+            async for event in iterate_with_timeout(_stream_agent(agent, query)):
+                if event["t"] == "final":
+                    final = event["response"]
+                    continue
+                if event["t"] == "tool":
+                    tools_used.append(event["tool"])
+                elif event["t"] == "token":
+                    parts.append(event["text"])
+                yield event
+        except LLMTimeoutError:
+            raise
+        except Exception as e:
+            print(f"Agent streaming error: {e}")
+            if parts:
+                raise
+    if final is None and not parts:
+        # No agent, or it failed before answering: stream from Gemini
+        tools_used = []
+        async for event in _stream_gemini(query, context):
+            parts.append(event["text"])
+            yield event
+    response = final if final is not None else "".join(parts)
+    yield {"t": "answer", "response": response, "tools_used": sorted(set(tools_used))}
+
+
+async def stream_research_query(query: str, session_id: str = "default", use_cache: bool = True,
+                                mode: str = None):
+    """
+    Async generator of research events for the SSE endpoint:
+
+        {"t": "start", "session_id", "cached"}
+        {"t": "tool", "tool", "input"} / {"t": "observation", "tool", "output"}
+        {"t": "token", "text"}            (answer text as it is generated)
+        {"t": "done", "message_id", "response", "tools_used", "cached", "mode", "timestamp"}
+        {"t": "error", "message"}
+
+    'mode' must already be validated (resolve_mode).
+
+    Same caching rules as run_research_query. The question and answer are
+    saved to memory (and the answer cache) only once the stream completes;
+    a client that disconnects early leaves no partial answer behind.
+    """
+    recent = await asyncio.to_thread(get_recent_messages, session_id, 4)
+    context = _context_text(recent)
+
+    contextual = bool(recent) and needs_context(query)
+    cacheable = use_cache and not contextual
+    cached = answer_cache.get(query) if cacheable else None
+    yield {"t": "start", "session_id": session_id, "cached": bool(cached)}
+
+    try:
+        local = None if cached or contextual else local_answer(query)
+        if cached:
+            response, tools_used = cached["response"], cached["tools_used"]
+            yield {"t": "token", "text": response}
+        elif local:
+            response, tools_used = local
+            yield {"t": "token", "text": response}
+        else:
+            async with llm_limiter.slot():
+                response, tools_used = None, []
+                async for event in _stream_answer(query, context, mode):
+                    if event["t"] == "answer":
+                        response, tools_used = event["response"], event["tools_used"]
+                        continue
+                    yield event
+            if cacheable and response and not response.startswith("⚠️"):
+                answer_cache.put(query, response, tools_used)
+
+        saved = await asyncio.to_thread(
+            add_messages, session_id,
+            [("user", query, None), ("assistant", response, {"cached": True} if cached else None)]
+        )
+        yield {
+            "t": "done",
+            "message_id": saved[-1]["id"],
+            "response": response,
+            "tools_used": tools_used,
+            "cached": bool(cached),
+            "mode": mode,
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        yield {"t": "error", "message": str(e)}
+
+
+def get_llm_stats() -> Dict:
+    """LLM concurrency limiter counters (active, waiting, rejected, ...)."""
+    return llm_limiter.stats()
+
+
+def get_answer_cache_stats() -> Dict:
+    """Answer cache size and hit rate."""
+    return answer_cache.stats()
+
+
+def clear_answer_cache() -> Dict:
+    """Drop all cached answers."""
+    return {"status": "cleared", "entries_removed": answer_cache.clear()}
+
+
 def get_conversation_history(session_id: str = "default") -> List[Dict]:
     """Get conversation history."""
     return get_messages(session_id)
@@ -0,0 +1,124 @@
+"""
+Local SMTP sink for outreach load tests.
+
+Accepts every message and discards it (or writes it to --maildir as .eml
+files), counting deliveries. Speaks just enough ESMTP for smtplib:
+EHLO/HELO, MAIL, RCPT, DATA, RSET, NOOP, QUIT.
+
+Run:
+python -m backend.smtp_sink --port 8025
+SMTP_HOST=127.0.0.1 SMTP_PORT=8025 uvicorn backend.main:app
+
+--fail-rate answers a fraction of messages with a 451 to exercise retries;
+--latency delays each DATA reply to mimic a real relay.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import uuid
+from typing import Optional
+
+# Largest message accepted (StreamReader buffer limit)
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+class SmtpSink:
+    """Minimal SMTP server that accepts and counts messages."""
+
+    def __init__(self, maildir: Optional[str] = None, fail_rate: float = 0.0, latency: float = 0.0):
+        self.maildir = maildir
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.received = 0
+        self.rejected = 0
+        self.connections = 0
+        if maildir:
+            os.makedirs(maildir, exist_ok=True)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8025) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._handle, host, port, limit=MAX_MESSAGE_BYTES)
+
+    def _store(self, data: bytes):
+        if self.maildir:
+            with open(os.path.join(self.maildir, f"{uuid.uuid4().hex}.eml"), "wb") as f:
+                f.write(data[:-5])  # strip the terminating CRLF.CRLF
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+
+        def reply(line: str):
+            writer.write((line + "\r\n").encode("ascii"))
+
+        reply("220 caregrid-smtp-sink ESMTP")
+        try:
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                verb = line[:4].decode("ascii", "replace").upper()
+
+                if verb == "EHLO":
+                    reply("250-caregrid-smtp-sink")
+                    reply("250-8BITMIME")
+                    reply("250 SMTPUTF8")
+                elif verb == "HELO":
+                    reply("250 caregrid-smtp-sink")
+                elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    reply("250 OK")
+                elif verb == "DATA":
+                    reply("354 End data with <CR><LF>.<CR><LF>")
+                    await writer.drain()
+                    data = await reader.readuntil(b"\r\n.\r\n")
+                    if self.latency:
+                        await asyncio.sleep(self.latency)
+                    if self.fail_rate and random.random() < self.fail_rate:
+                        self.rejected += 1
+                        reply("451 4.3.0 Temporary failure (sink)")
+                    else:
+                        self.received += 1
+                        self._store(data)
+                        reply("250 OK queued")
+                elif verb == "QUIT":
+                    reply("221 Bye")
+                    await writer.drain()
+                    break
+                else:
+                    reply("502 Command not implemented")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _serve(args):
+    sink = SmtpSink(maildir=args.maildir, fail_rate=args.fail_rate, latency=args.latency)
+    server = await sink.start(args.host, args.port)
+    print(f"SMTP sink listening on {args.host}:{args.port} (fail rate {args.fail_rate:.0%})")
+    async with server:
+        last = -1
+        while True:
+            await asyncio.sleep(5)
+            if sink.received != last:
+                last = sink.received
+                print(f"received={sink.received} rejected={sink.rejected} connections={sink.connections}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SMTP sink for outreach testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--maildir", default=None, help="write each message to this directory")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of messages answered with 451")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each DATA reply")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 import sqlite3
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 
 import os
 
+from utils.fts import FTS5_AVAILABLE, fts_query, page_bounds, require_fts5
+
 # Robust database path detection
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(BASE_DIR, "provider_system.db")
@@ -22,6 +24,19 @@ def get_connection():
     return sqlite3.connect(DB_PATH, check_same_thread=False)
 
 
+def _provider_id_value(provider_id):
+    """
+    Plain int for an integer-like provider id. sqlite3 stores numpy ints
+    (e.g. a pandas row's id) as 8-byte blobs, which then fail to
+    JSON-encode and never match an integer filter.
+    """
+    if isinstance(provider_id, (bytes, memoryview)) and len(provider_id) == 8:
+        return int.from_bytes(provider_id, "little", signed=True)
+    if hasattr(provider_id, "__index__") and not isinstance(provider_id, bool):
+        return int(provider_id)
+    return provider_id
+
+
 # ---------------------------------------------------
 # CREATE TABLES
 # ---------------------------------------------------
@@ -85,25 +100,118 @@ def init_db():
         )
     """)
 
+    # Migration: batch_id on provider results (older databases lack it)
+    cols = [row[1] for row in cur.execute("PRAGMA table_info(provider_results)")]
+    if "batch_id" not in cols:
+        cur.execute("ALTER TABLE provider_results ADD COLUMN batch_id TEXT")
+
+    # Migration: provider ids written as numpy int64 blobs -> integers
+    for table in ("provider_results", "fraud_signals"):
+        blobs = cur.execute(
+            f"SELECT id, provider_id FROM {table} WHERE typeof(provider_id) = 'blob'"
+        ).fetchall()
+        if blobs:
+            cur.executemany(
+                f"UPDATE {table} SET provider_id = ? WHERE id = ?",
+                [(_provider_id_value(pid), row_id) for row_id, pid in blobs]
+            )
+
+    # Indexes for exports/filters on provider results
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_provider_results_batch ON provider_results(batch_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_provider_results_provider ON provider_results(provider_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_provider_results_risk ON provider_results(risk_level)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_provider_results_created ON provider_results(created_at)")
+
+    if FTS5_AVAILABLE:
+        _create_search_index(cur)
+
     conn.commit()
     conn.close()
 
 
+# Searchable text for a result row: name, address, specialty and its flags
+# (fraud flags plus the discrepancy keys that are set, e.g. phone_mismatch)
+_FTS_ROW_SQL = """
+    SELECT {r}.id, {r}.name, {r}.address, {r}.specialty,
+        trim(
+            COALESCE((SELECT group_concat(value, ' ') FROM json_each({r}.fraud_json, '$.flags')), '') || ' ' ||
+            COALESCE((SELECT group_concat(key, ' ') FROM json_each({r}.quality_json, '$.discrepancies')
+                      WHERE value = 1), '')
+        )
+"""
+
+
+def _create_search_index(cur):
+    """
+    Full-text index over provider results. The flags column is derived from
+    the stored JSON, so the index keeps its own copy of the text (keyed by
+    provider_results.id) and triggers keep it in sync.
+    """
+    exists = cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'provider_results_fts'"
+    ).fetchone()
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS provider_results_fts USING fts5(
+            name, address, specialty, flags, tokenize='unicode61'
+        )
+    """)
+    if not exists:
+        cur.execute(
+            "INSERT INTO provider_results_fts(rowid, name, address, specialty, flags) "
+            + _FTS_ROW_SQL.format(r="provider_results") + " FROM provider_results"
+        )
+
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_provider_results_fts_insert AFTER INSERT ON provider_results
+        BEGIN
+            INSERT INTO provider_results_fts(rowid, name, address, specialty, flags)
+            {_FTS_ROW_SQL.format(r="NEW")};
+        END
+    """)
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_provider_results_fts_delete AFTER DELETE ON provider_results
+        BEGIN
+            DELETE FROM provider_results_fts WHERE rowid = OLD.id;
+        END
+    """)
+    cur.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_provider_results_fts_update AFTER UPDATE ON provider_results
+        BEGIN
+            DELETE FROM provider_results_fts WHERE rowid = OLD.id;
+            INSERT INTO provider_results_fts(rowid, name, address, specialty, flags)
+            {_FTS_ROW_SQL.format(r="NEW")};
+        END
+    """)
+
+
+_schema_ready = False
+
+
+def ensure_db():
+    """Run init_db (tables, migrations, indexes) once per process."""
+    global _schema_ready
+    if not _schema_ready:
+        init_db()
+        _schema_ready = True
+
+
 # ---------------------------------------------------
 # INSERT PROVIDER RESULT
 # ---------------------------------------------------
-def save_provider_result(provider_id, base, validated, enriched, quality, fraud):
+def save_provider_result(provider_id, base, validated, enriched, quality, fraud, batch_id=None):
+    ensure_db()
     conn = get_connection()
     cur = conn.cursor()
 
     cur.execute("""
         INSERT INTO provider_results (
-            provider_id, name, address, phone, specialty, license,
+            provider_id, batch_id, name, address, phone, specialty, license,
             confidence, risk_level, status,
             enriched_json, validated_json, quality_json, fraud_json
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, (
-        provider_id,
+        _provider_id_value(provider_id),
+        batch_id,
         base.get("name"),
         enriched.get("address"),
         enriched.get("phone"),
@@ -152,7 +260,7 @@ def save_fraud(provider_id, score, flags):
         INSERT INTO fraud_signals (
             provider_id, fraud_score, fraud_flags
         ) VALUES (?, ?, ?)
-    """, (provider_id, score, json.dumps(flags)))
+    """, (_provider_id_value(provider_id), score, json.dumps(flags)))
 
     conn.commit()
     conn.close()
@@ -174,3 +282,228 @@ def save_qa_result(providers_checked, avg_conf, high_risk):
 
     conn.commit()
     conn.close()
+
+
+# ---------------------------------------------------
+# STREAM PROVIDER RESULTS (EXPORTS)
+# ---------------------------------------------------
+EXPORT_COLUMNS = [
+    "id", "provider_id", "batch_id", "name", "address", "phone", "specialty", "license",
+    "confidence", "risk_level", "status", "created_at"
+]
+
+# All selectable provider_results columns (EXPORT_COLUMNS + stored JSON)
+RESULT_COLUMNS = EXPORT_COLUMNS + ["enriched_json", "validated_json", "quality_json", "fraud_json"]
+
+# filter name -> (SQL column, operator); list values become IN (...),
+# and an empty list matches no rows
+EXPORT_FILTERS = {
+    "provider_id": ("provider_id", "="),
+    "batch_id": ("batch_id", "="),
+    "risk_level": ("risk_level", "="),
+    "status": ("status", "="),
+    "specialty": ("specialty", "="),
+    "min_confidence": ("confidence", ">="),
+    "max_confidence": ("confidence", "<="),
+    "created_after": ("created_at", ">="),
+    "created_before": ("created_at", "<"),
+}
+
+
+def build_result_filters(filters):
+    """
+    Translate an export filter dict into a SQL WHERE clause + params.
+    Unknown filter names raise ValueError.
+    """
+    clauses, params = [], []
+    for key, value in (filters or {}).items():
+        if value is None:
+            continue
+        if key not in EXPORT_FILTERS:
+            raise ValueError(f"Unsupported export filter: {key}")
+        column, op = EXPORT_FILTERS[key]
+        if isinstance(value, (list, tuple)):
+            if op != "=":
+                raise ValueError(f"Filter {key} does not accept a list")
+            if not value:
+                # IN () matches nothing; an empty list must not mean "no filter"
+                clauses.append("1 = 0")
+                continue
+            clauses.append(f"{column} IN ({', '.join('?' * len(value))})")
+            params.extend(value)
+        else:
+            clauses.append(f"{column} {op} ?")
+            params.append(value)
+    where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+    return where, params
+
+
+def _result_columns(columns):
+    columns = list(columns or EXPORT_COLUMNS)
+    unknown = [c for c in columns if c not in RESULT_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown provider_results columns: {unknown}")
+    return columns
+
+
+def iter_provider_results(filters=None, batch_size=1000, since_id=None, until_id=None, columns=None):
+    """
+    Yield provider_results rows as dicts, fetched batch_size at a time.
+    Filters are applied in SQL, so memory use is constant in table size.
+    'columns' (default EXPORT_COLUMNS) may include the stored JSON columns.
+
+    With since_id (a change cursor), only each provider's current (latest)
+    result is returned, and only if it was written after the cursor and at
+    or before until_id. The id range is a primary-key range scan and the
+    "latest per provider" check uses idx_provider_results_provider.
+    """
+    ensure_db()
+    columns = _result_columns(columns)
+    where, params = build_result_filters(filters)
+    if since_id is not None:
+        # A row without a provider_id has no later versions: it is its own latest
+        clauses = ["id > ?", "(provider_id IS NULL OR id = (SELECT MAX(p.id) FROM provider_results p "
+                             "WHERE p.provider_id = provider_results.provider_id))"]
+        delta_params = [since_id]
+        if until_id is not None:
+            clauses.append("id <= ?")
+            delta_params.append(until_id)
+        where = ("WHERE " if not where else where + " AND ") + " AND ".join(clauses)
+        params = params + delta_params
+
+    conn = get_connection()
+    try:
+        cur = conn.execute(
+            f"SELECT {', '.join(columns)} FROM provider_results {where} ORDER BY id",
+            params
+        )
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield dict(zip(columns, row))
+    finally:
+        conn.close()
+
+
+def get_latest_provider_result(provider_id, columns=None):
+    """Most recent provider_results row for a provider, or None."""
+    ensure_db()
+    columns = _result_columns(columns)
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            f"SELECT {', '.join(columns)} FROM provider_results WHERE provider_id = ? ORDER BY id DESC LIMIT 1",
+            (provider_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+    return dict(zip(columns, row)) if row else None
+
+
+def get_change_cursor():
+    """Current change cursor: the highest provider_results id (0 if empty)."""
+    ensure_db()
+    conn = get_connection()
+    try:
+        return conn.execute("SELECT COALESCE(MAX(id), 0) FROM provider_results").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def resolve_change_cursor(since):
+    """
+    Turn a 'since' cursor into a provider_results id.
+    Accepts a change id (int or digit string) or a timestamp
+    ('YYYY-MM-DD[ HH:MM:SS]' or ISO 8601, UTC like created_at).
+    """
+    if isinstance(since, int) or str(since).strip().isdigit():
+        return int(since)
+
+    try:
+        ts = datetime.fromisoformat(str(since).strip().replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid since cursor: {since}")
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    ts_text = ts.strftime("%Y-%m-%d %H:%M:%S")
+
+    ensure_db()
+    conn = get_connection()
+    try:
+        # First result written after the timestamp (index seek on created_at);
+        # ids and created_at both only grow, so the cursor is just before it.
+        row = conn.execute(
+            "SELECT id FROM provider_results WHERE created_at > ? ORDER BY created_at, id LIMIT 1",
+            (ts_text,)
+        ).fetchone()
+    finally:
+        conn.close()
+    return row[0] - 1 if row else get_change_cursor()
+
+
+# ---------------------------------------------------
+# FULL-TEXT SEARCH OVER PROVIDER RESULTS
+# ---------------------------------------------------
+SEARCH_COLUMNS = [
+    "id", "provider_id", "batch_id", "name", "address", "specialty",
+    "confidence", "risk_level", "status", "created_at"
+]
+
+# bm25 column weights: name, address, specialty, flags
+SEARCH_WEIGHTS = (10.0, 2.0, 5.0, 1.0)
+
+
+def search_provider_results(query, limit=20, offset=0, filters=None):
+    """
+    Ranked full-text search over provider results (name, address, specialty
+    and flags), best matches first. 'filters' takes the export filters
+    (risk_level, status, batch_id, ...). Returns one page of hits, each with
+    a highlighted snippet, and the total number of matches.
+    """
+    require_fts5()
+    ensure_db()
+    match = fts_query(query)
+    limit, offset = page_bounds(limit, offset)
+    # Filters name provider_results columns (specialty is also an FTS column),
+    # so the matches are ranked in a CTE and joined back to the table.
+    where, params = build_result_filters(filters)
+    weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+    hits = f"""
+        WITH hits AS (
+            SELECT rowid AS hit_id, bm25(provider_results_fts, {weights}) AS rank
+            FROM provider_results_fts WHERE provider_results_fts MATCH ?
+        )
+    """
+    joined = f"FROM hits JOIN provider_results ON provider_results.id = hits.hit_id {where}"
+
+    conn = get_connection()
+    try:
+        total = conn.execute(f"{hits} SELECT COUNT(*) {joined}", [match] + params).fetchone()[0]
+        rows = conn.execute(
+            f"{hits} SELECT {', '.join(SEARCH_COLUMNS)}, rank {joined} ORDER BY rank LIMIT ? OFFSET ?",
+            [match] + params + [limit, offset]
+        ).fetchall()
+        results = [dict(zip(SEARCH_COLUMNS + ["rank"], row)) for row in rows]
+
+        # Highlighted snippets for this page only
+        if results:
+            ids = [r["id"] for r in results]
+            snippets = dict(conn.execute(f"""
+                SELECT rowid, snippet(provider_results_fts, -1, '[', ']', '...', 12)
+                FROM provider_results_fts
+                WHERE provider_results_fts MATCH ? AND rowid IN ({', '.join('?' * len(ids))})
+            """, [match] + ids).fetchall())
+            for r in results:
+                r["snippet"] = snippets.get(r["id"])
+    finally:
+        conn.close()
+
+    return {
+        "query": query,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "results": results
+    }
@@ -267,7 +267,7 @@ export function AgentAutomation() {
 
         setSendingEmails(true)
         try {
-            // REAL API CALL TO BACKEND /api/reports/email
+            // REAL API CALL TO BACKEND /api/reports/email/bulk
             const result = await api.sendBulkEmails(selectedTemplate, selectedProviders)
             setEmailResult(result)
         } catch (error) {
@@ -83,7 +83,7 @@ export function AgentOperations() {
         setCurrentStep(1)
 
         try {
-            const response = await fetch('http://localhost:8000/api/run-stream', {
+            const response = await fetch('http://localhost:8000/api/run-stream?mode=compact', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
@@ -123,7 +123,12 @@ export function AgentOperations() {
                         if (dataStr === '[DONE]') break
 
                         try {
-                            const event = JSON.parse(dataStr)
+                            let event = JSON.parse(dataStr)
+
+                            // Compact stream: one delta per agent, same keys as a full-mode node output
+                            if (event.t === 'node') {
+                                event = { type: 'on_chain_end', name: event.node, output: event.delta }
+                            }
 
                             if (event.type === 'on_tool_start') {
                                 addLog(`Running tool: ${event.name}...`)
@@ -19,6 +19,13 @@ export const api = {
 
     // Batch
     runBatch: (data) => apiClient.post('/batch', data).then(res => res.data),
+    uploadBatchCsv: (file, chunkSize = 500) => {
+        const form = new FormData()
+        form.append('file', file)
+        return apiClient.post(`/batch/upload?chunk_size=${chunkSize}`, form, {
+            headers: { 'Content-Type': 'multipart/form-data' }
+        }).then(res => res.data)
+    },
 
     // Analytics & System
     getAnalytics: () => apiClient.get('/analytics').then(res => res.data),
@@ -26,6 +33,39 @@ export const api = {
 
     // Research Agent
     researchQuery: (data) => apiClient.post('/research/query', data).then(res => res.data),
+    /**
+     * Streamed research query (SSE)
+     * POST /api/research/query/stream
+     * Calls onEvent for each {t: 'start' | 'tool' | 'observation' | 'token' | 'done' | 'error'} event.
+     */
+    streamResearchQuery: async (data, onEvent) => {
+        const response = await fetch(`${API_URL}/research/query/stream`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(data)
+        })
+        if (!response.ok) throw new Error('Research stream failed')
+
+        const reader = response.body.getReader()
+        const decoder = new TextDecoder()
+        let buffer = ''
+        while (true) {
+            const { done, value } = await reader.read()
+            if (done) break
+            buffer += decoder.decode(value, { stream: true })
+            const frames = buffer.split('\n\n')
+            buffer = frames.pop()
+            for (const frame of frames) {
+                if (!frame.startsWith('data: ')) continue
+                const dataStr = frame.slice(6)
+                if (dataStr === '[DONE]') return
+                onEvent(JSON.parse(dataStr))
+            }
+        }
+    },
+    acceptResearchAnswer: (message_id) => apiClient.post('/research/accept', { message_id }).then(res => res.data),
+    searchResearch: (q, params = {}) => apiClient.get('/research/search', { params: { q, ...params } }).then(res => res.data),
+    runResearchMaintenance: () => apiClient.post('/research/maintenance').then(res => res.data),
 
     // NEW: Real Pipeline
     /**
@@ -45,7 +85,8 @@ export const api = {
     },
 
     runFullPipeline: (data) => apiClient.post('/run-pipeline', data).then(res => res.data),
-    getProviders: () => apiClient.get('/providers').then(res => res.data),
+    getProviders: (params = {}) => apiClient.get('/providers', { params }).then(res => res.data),
+    searchResults: (q, params = {}) => apiClient.get('/reports/results/search', { params: { q, ...params } }).then(res => res.data),
 
     // NEW: Bulk Automation APIs
     validateBulk: (data) => apiClient.post('/agents/validate-bulk', data).then(res => res.data),
@@ -61,9 +102,11 @@ export const api = {
     getJobHistory: (limit = 50) => apiClient.get(`/jobs/history?limit=${limit}`).then(res => res.data),
 
     // Outreach
-    sendBulkEmails: (template_id, providers) => apiClient.post('/reports/email', {
+    sendBulkEmails: (template_id, providers, campaign_id = null) => apiClient.post('/reports/email/bulk', {
         template_id,
-        recipients: providers.map(p => p.email || `${p.name}@example.com`),
-        data: { providers }
-    }).then(res => res.data)
+        providers: providers.map(p => ({ ...p, email: p.email || `${p.name}@example.com` })),
+        campaign_id
+    }).then(res => res.data),
+    getEmailDraft: (provider_id) => apiClient.get(`/reports/email-draft/${provider_id}`).then(res => res.data),
+    getCampaignStatus: (campaign_id) => apiClient.get(`/reports/email/campaigns/${campaign_id}`).then(res => res.data)
 }
@@ -50,7 +50,7 @@ def compute_fraud_score(quality_data, enriched_data):
 # ------------------------------------------------------------
 # PROCESS ONE PROVIDER
 # ------------------------------------------------------------
-def process_single_provider(row):
+def process_single_provider(row, batch_id=None):
     provider_id = row["id"]
 
     # Convert merged CSV+PDF
@@ -69,10 +69,13 @@ def process_single_provider(row):
 
     # Save final provider result into SQLite
     save_provider_result(provider_id, provider_input, validated, enriched, quality,
-                         {"score": fraud_score, "flags": fraud_flags})
+                         {"score": fraud_score, "flags": fraud_flags}, batch_id=batch_id)
+
+    final_profile = dict(result.get("final_profile") or {}, provider_id=provider_id)
 
     return {
         "provider_id": provider_id,
+        "final_profile": final_profile,
         "confidence": quality["confidence_scores"]["overall"],
         "risk": quality["risk_level"],
         "verified": not quality["needs_manual_review"]
@@ -84,27 +87,60 @@ def process_single_provider(row):
 # MAIN BATCH ENGINE (FAST)
 # ------------------------------------------------------------
 def run_batch_processing(df):
+    return run_batch_chunks([df])
+
+
+# ------------------------------------------------------------
+# CHUNKED BATCH ENGINE (STREAMING INGEST)
+# ------------------------------------------------------------
+def run_batch_chunks(chunks, batch_id=None, max_workers=10,
+                     on_progress=None, keep_results=True, sink=None):
+    """
+    Run the pipeline over an iterable of DataFrame chunks.
+
+    Only one chunk is in flight at a time, so memory is bounded by the
+    chunk size rather than the full batch. Aggregates are kept as running
+    counters; per-provider results are collected only if keep_results.
+    With a sink (utils.result_sinks), each final profile is written as
+    soon as its provider completes (flushed per the sink's policy) and the
+    sink is closed when the batch ends, even on failure.
+    """
     start_ts = time.time()
-    batch_id = str(uuid.uuid4())[:8]
+    batch_id = batch_id or str(uuid.uuid4())[:8]
 
     results = []
+    total = verified = high_risk = 0
+    conf_sum = 0.0
 
     print(f"\n⚡ Running batch: {batch_id}")
-    print(f"⚡ Providers: {len(df)}")
 
     # 10 threads for extremely fast execution
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-        futures = [executor.submit(process_single_provider, df.iloc[i])
-                   for i in range(len(df))]
-
-        for future in concurrent.futures.as_completed(futures):
-            results.append(future.result())
-
-    # Aggregate results
-    total = len(results)
-    verified = sum(1 for r in results if r["verified"])
-    high_risk = sum(1 for r in results if r["risk"] == "HIGH")
-    avg_conf = round(sum(r["confidence"] for r in results) / total, 2)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for df in chunks:
+                futures = [executor.submit(process_single_provider, df.iloc[i], batch_id)
+                           for i in range(len(df))]
+
+                for future in concurrent.futures.as_completed(futures):
+                    r = future.result()
+                    profile = r.pop("final_profile")
+                    if sink is not None:
+                        sink.write(profile)
+                    total += 1
+                    verified += 1 if r["verified"] else 0
+                    high_risk += 1 if r["risk"] == "HIGH" else 0
+                    conf_sum += r["confidence"]
+                    if keep_results:
+                        results.append(r)
+
+                print(f"⚡ Providers: {total}")
+                if on_progress:
+                    on_progress(total)
+    finally:
+        if sink is not None:
+            sink.close()
+
+    avg_conf = round(conf_sum / total, 2) if total else 0
 
     # Save batch summary
     save_batch_summary(batch_id, total, verified, high_risk, avg_conf)
@@ -63,6 +63,16 @@ def directory_node(state: ProviderState):
     }
 
 
+# State keys each node adds — used to stream per-node deltas
+# without re-sending the full (PDF-heavy) state.
+NODE_OUTPUT_KEYS = {
+    "validate": ("validated_data", "google_result", "npi_result"),
+    "enrich": ("enriched_data",),
+    "quality": ("quality_data",),
+    "directory": ("final_profile", "summary_report"),
+}
+
+
 # --------------------------------------------
 # Build Pipeline Graph
 # --------------------------------------------
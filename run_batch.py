@@ -3,6 +3,8 @@ import os
 
 from pipeline.pipeline_graph import build_pipeline
 from utils.pdf_parser import extract_pdf_data   # <-- PDF extractor
+from utils.exporter import PARQUET_ROOT, PYARROW_AVAILABLE
+from utils.result_sinks import CsvSink, PartitionedParquetSink, MultiSink
 
 
 # ---------------------------------------------
@@ -15,62 +17,65 @@ app = build_pipeline()
 # ---------------------------------------------
 CSV_PATH = "data/providers.csv"
 PDF_FOLDER = "data/provider_docs"
+OUTPUT_PATH = "data/final_results.csv"
 
 df = pd.read_csv(CSV_PATH)
 
 print(f"\n🔍 Total Providers Loaded: {len(df)}")
 print("🚀 Running Batch Validation with CSV + PDF...\n")
 
-all_results = []
-
+# Results are written as each provider completes (flushed every 50 rows),
+# so a crash keeps everything processed so far. The Parquet result store
+# gets the same batch, so the dashboard shows this run.
+with MultiSink(
+    CsvSink(OUTPUT_PATH),
+    PartitionedParquetSink(PARQUET_ROOT) if PYARROW_AVAILABLE else None,
+) as sink:
 
-# ---------------------------------------------
-# Process Each Provider
-# ---------------------------------------------
-for idx, row in df.iterrows():
+    # ---------------------------------------------
+    # Process Each Provider
+    # ---------------------------------------------
+    for idx, row in df.iterrows():
 
-    # ---- CSV Base Data ----
-    provider = {
-        "name": row["name"],
-        "address": row["address"],
-        "phone": row["phone"],
-        "specialty": row["specialty"]
-    }
+        # ---- CSV Base Data ----
+        provider = {
+            "name": row["name"],
+            "address": row["address"],
+            "phone": row["phone"],
+            "specialty": row["specialty"]
+        }
 
-    # ---- Check if a Matching PDF Exists ----
-    pdf_filename = f"{row['name'].replace(' ', '_')}.pdf"
-    pdf_path = os.path.join(PDF_FOLDER, pdf_filename)
+        # ---- Check if a Matching PDF Exists ----
+        pdf_filename = f"{row['name'].replace(' ', '_')}.pdf"
+        pdf_path = os.path.join(PDF_FOLDER, pdf_filename)
 
-    pdf_data = {}
+        pdf_data = {}
 
-    if os.path.exists(pdf_path):
-        print(f"📄 Extracting PDF for: {row['name']} ...")
-        try:
-            pdf_data = extract_pdf_data(pdf_path)
-        except Exception as e:
-            print(f"⚠ PDF extraction failed for {row['name']}: {e}")
+        if os.path.exists(pdf_path):
+            print(f"📄 Extracting PDF for: {row['name']} ...")
+            try:
+                pdf_data = extract_pdf_data(pdf_path)
+            except Exception as e:
+                print(f"⚠ PDF extraction failed for {row['name']}: {e}")
 
-    # ---- Merge CSV + PDF → Final Provider Input ----
-    provider.update(pdf_data)
+        # ---- Merge CSV + PDF → Final Provider Input ----
+        provider.update(pdf_data)
 
-    # ---- Send Provider Data Into Multi-Agent Pipeline ----
-    result = app.invoke({"provider": provider})
+        # ---- Send Provider Data Into Multi-Agent Pipeline ----
+        result = app.invoke({"provider": provider})
 
-    final_output = result.get("final_profile", {})
-    final_output["provider_id"] = idx + 1
+        final_output = result.get("final_profile", {})
+        final_output["provider_id"] = idx + 1
 
-    all_results.append(final_output)
+        sink.write(final_output)
 
-    print(f"✔ Processed Provider {idx + 1}: {row['name']}")
+        print(f"✔ Processed Provider {idx + 1}: {row['name']}")
 
 
 # ---------------------------------------------
-# Save Final Output
+# Final Output (the with block flushed and closed the sink, even on error)
 # ---------------------------------------------
-output_df = pd.DataFrame(all_results)
-
-OUTPUT_PATH = "data/final_results.csv"
-output_df.to_csv(OUTPUT_PATH, index=False)
+output_df = pd.read_csv(OUTPUT_PATH, nrows=5)
 
 print("\n🎉 Batch Processing Completed Successfully!")
 print(f"📁 Results saved to: {OUTPUT_PATH}")
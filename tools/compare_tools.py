@@ -1,7 +1,18 @@
 # tools/compare_tools.py
 
 import re
-import difflib
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.similarity import ratio_many
+
+ADDRESS_ABBREVIATIONS = {
+    " street": " st",
+    " avenue": " ave",
+    " boulevard": " blvd",
+    " road": " rd",
+    " drive": " dr",
+}
+_ADDRESS_MATCHER = KeywordMatcher(ADDRESS_ABBREVIATIONS)
 
 
 def _normalize_phone(phone: str | None) -> str | None:
@@ -18,24 +29,17 @@ def _normalize_address(addr: str | None) -> str | None:
     if not addr:
         return None
     addr = addr.lower().strip()
-    # common abbreviations
-    replacements = {
-        " street": " st",
-        " avenue": " ave",
-        " boulevard": " blvd",
-        " road": " rd",
-        " drive": " dr",
-    }
-    for k, v in replacements.items():
-        addr = addr.replace(k, v)
+    # common abbreviations, all replaced in one pass
+    addr = _ADDRESS_MATCHER.replace(addr, ADDRESS_ABBREVIATIONS)
     addr = re.sub(r"[,\.\s]+", " ", addr)
     return addr.strip()
 
 
-def _similarity(a: str | None, b: str | None) -> float:
-    if not a or not b:
-        return 0.0
-    return difflib.SequenceMatcher(None, a, b).ratio()
+def _similarities(pairs: list[tuple[str | None, str | None]]) -> list[float]:
+    """Similarity of each pair (0.0 if either side is missing), scored in one batch."""
+    scores = ratio_many((a, b) for a, b in pairs if a and b)
+    it = iter(scores)
+    return [next(it) if a and b else 0.0 for a, b in pairs]
 
 
 def compare_data(provider: dict, google_data: dict, npi_data: dict) -> dict:
@@ -43,7 +47,7 @@ def compare_data(provider: dict, google_data: dict, npi_data: dict) -> dict:
     Advanced comparison logic with normalization + similarity.
 
     Returns a dict used by Agent-1 and Agent-3:
-      {
+    {
         "phone_match": bool,
         "address_match": bool,
         "specialty_match": bool,
@@ -52,53 +56,71 @@ def compare_data(provider: dict, google_data: dict, npi_data: dict) -> dict:
         "corrected_phone": str | None,
         "corrected_address": str | None,
         "license": str | None,
+        "npi_valid": bool | None,   # False: NPI failed the check digit
     }
+
+    Similarities use utils.similarity.ratio, on the same 0-1 scale as
+    difflib's SequenceMatcher ratio, so the thresholds below are unchanged.
     """
-    p_phone_raw = provider.get("phone")
-    p_addr_raw = provider.get("address")
-    p_spec = provider.get("specialty")
-
-    g_phone_raw = google_data.get("google_phone")
-    g_addr_raw = google_data.get("google_address")
-
-    npi_spec = npi_data.get("npi_specialty")
-    npi_license = npi_data.get("npi_license")
-
-    # ---- Normalize ----
-    p_phone = _normalize_phone(p_phone_raw)
-    g_phone = _normalize_phone(g_phone_raw)
-
-    p_addr = _normalize_address(p_addr_raw)
-    g_addr = _normalize_address(g_addr_raw)
-
-    # ---- Similarity ----
-    phone_sim = _similarity(p_phone, g_phone)
-    addr_sim = _similarity(p_addr, g_addr)
-
-    # RELAXED THRESHOLDS: Real-world data is messy. 0.7 is a good fuzzy match.
-    phone_match = bool(p_phone and g_phone and phone_sim >= 0.70)
-    address_match = bool(p_addr and g_addr and addr_sim >= 0.70)
-    
-    # Fuzzy specialty match
-    specialty_match = False
-    if p_spec and npi_spec:
-        # Check if one contains the other
-        if p_spec.lower() in npi_spec.lower() or npi_spec.lower() in p_spec.lower():
-            specialty_match = True
-        elif _similarity(p_spec.lower(), npi_spec.lower()) > 0.8:
-            specialty_match = True
-
-    # corrected values – prefer google/NPI if high similarity
-    corrected_phone = g_phone_raw if phone_sim >= 0.6 else None
-    corrected_address = g_addr_raw if addr_sim >= 0.6 else None
-
-    return {
-        "phone_match": phone_match,
-        "address_match": address_match,
-        "specialty_match": specialty_match,
-        "phone_similarity": round(phone_sim, 3),
-        "address_similarity": round(addr_sim, 3),
-        "corrected_phone": corrected_phone,
-        "corrected_address": corrected_address,
-        "license": npi_license,
-    }
+    return compare_data_many([provider], [google_data], [npi_data])[0]
+
+
+def compare_data_many(providers: list[dict], google_data: list[dict], npi_data: list[dict]) -> list[dict]:
+    """
+    compare_data for many providers at once (lists aligned by position).
+    All phone, address and specialty pairs are scored in batched
+    similarity calls instead of one call per field per provider.
+    """
+    if not (len(providers) == len(google_data) == len(npi_data)):
+        raise ValueError("providers, google_data and npi_data must have the same length")
+
+    rows = []
+    for provider, google, npi in zip(providers, google_data, npi_data):
+        p_spec = provider.get("specialty")
+        npi_spec = npi.get("npi_specialty")
+        rows.append({
+            # ---- Normalize ----
+            "p_phone": _normalize_phone(provider.get("phone")),
+            "g_phone": _normalize_phone(google.get("google_phone")),
+            "p_addr": _normalize_address(provider.get("address")),
+            "g_addr": _normalize_address(google.get("google_address")),
+            "p_spec": p_spec.lower() if p_spec else None,
+            "npi_spec": npi_spec.lower() if npi_spec else None,
+            "g_phone_raw": google.get("google_phone"),
+            "g_addr_raw": google.get("google_address"),
+            "npi_license": npi.get("npi_license"),
+            "npi_valid": npi.get("npi_valid"),
+        })
+
+    # ---- Similarity (batched) ----
+    phone_sims = _similarities([(r["p_phone"], r["g_phone"]) for r in rows])
+    addr_sims = _similarities([(r["p_addr"], r["g_addr"]) for r in rows])
+    spec_sims = _similarities([(r["p_spec"], r["npi_spec"]) for r in rows])
+
+    results = []
+    for r, phone_sim, addr_sim, spec_sim in zip(rows, phone_sims, addr_sims, spec_sims):
+        # RELAXED THRESHOLDS: Real-world data is messy. 0.7 is a good fuzzy match.
+        phone_match = bool(r["p_phone"] and r["g_phone"] and phone_sim >= 0.70)
+        address_match = bool(r["p_addr"] and r["g_addr"] and addr_sim >= 0.70)
+
+        # Fuzzy specialty match: one contains the other, or close spelling
+        specialty_match = False
+        if r["p_spec"] and r["npi_spec"]:
+            if r["p_spec"] in r["npi_spec"] or r["npi_spec"] in r["p_spec"]:
+                specialty_match = True
+            elif spec_sim > 0.8:
+                specialty_match = True
+
+        # corrected values – prefer google/NPI if high similarity
+        results.append({
+            "phone_match": phone_match,
+            "address_match": address_match,
+            "specialty_match": specialty_match,
+            "phone_similarity": round(phone_sim, 3),
+            "address_similarity": round(addr_sim, 3),
+            "corrected_phone": r["g_phone_raw"] if phone_sim >= 0.6 else None,
+            "corrected_address": r["g_addr_raw"] if addr_sim >= 0.6 else None,
+            "license": r["npi_license"],
+            "npi_valid": r["npi_valid"],
+        })
+    return results
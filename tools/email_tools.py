@@ -1,38 +1,20 @@
 # tools/email_tools.py
 
-from typing import Dict, Any
+import json
+from string import Template
+from typing import Dict, Any, Iterable, Iterator
 
 
-def build_provider_email(profile: Dict[str, Any], quality: Dict[str, Any]) -> str:
-    """
-    Build a plain-text email to provider explaining discrepancies.
-    This is not actually sending – just generating content.
-    """
-    name = profile.get("name", "Doctor")
-    risk = profile.get("risk_level", "MEDIUM")
-    conf = profile.get("confidence_overall", 0)
-    discrepancies = quality.get("discrepancies", {})
-
-    mismatch_fields = []
-    if discrepancies.get("phone_mismatch"):
-        mismatch_fields.append("phone number")
-    if discrepancies.get("address_mismatch"):
-        mismatch_fields.append("practice address")
-    if discrepancies.get("specialty_mismatch"):
-        mismatch_fields.append("specialty")
-
-    issues_text = ", ".join(mismatch_fields) if mismatch_fields else "basic profile details"
-
-    email = f"""
-Dear {name},
+# Compiled once at import; drafts are rendered on demand (not in the pipeline)
+PROVIDER_EMAIL_TEMPLATE = Template("""Dear $name,
 
 We are currently updating our provider directory to ensure that members can
 reliably reach you and access accurate information about your practice.
 
 During an automated data quality review, your profile was assigned a
-confidence score of {conf}% with overall risk level marked as {risk}.
+confidence score of $conf% with overall risk level marked as $risk.
 
-Our system detected potential discrepancies related to: {issues_text}.
+Our system detected potential discrepancies related to: $issues.
 
 We kindly request you to review your practice information in the directory
 and share any corrections if needed (phone, address, specialty, or license).
@@ -42,7 +24,55 @@ If the information shown is already correct, no further action is required.
 Thank you for helping us maintain a high-quality provider network.
 
 Best regards,
-Provider Data Quality Team
-"""
+Provider Data Quality Team""")
+
+MISMATCH_FIELDS = (
+    ("phone_mismatch", "phone number"),
+    ("address_mismatch", "practice address"),
+    ("specialty_mismatch", "specialty"),
+)
+
+
+def _issues_text(discrepancies: Dict[str, Any]) -> str:
+    fields = [label for key, label in MISMATCH_FIELDS if discrepancies.get(key)]
+    return ", ".join(fields) if fields else "basic profile details"
+
+
+def build_provider_email(profile: Dict[str, Any], quality: Dict[str, Any]) -> str:
+    """
+    Build a plain-text email to provider explaining discrepancies.
+    This is not actually sending – just generating content.
+    """
+    return PROVIDER_EMAIL_TEMPLATE.substitute(
+        name=profile.get("name") or "Doctor",
+        risk=profile.get("risk_level", "MEDIUM"),
+        conf=profile.get("confidence_overall", 0),
+        issues=_issues_text(quality.get("discrepancies") or {}),
+    )
+
+
+def build_email_from_result(row: Dict[str, Any]) -> str:
+    """
+    Build the same email from a stored provider_results row
+    (name, confidence, risk_level, quality_json).
+    """
+    quality = row.get("quality_json") or {}
+    if isinstance(quality, str):
+        quality = json.loads(quality) if quality else {}
+    profile = {
+        "name": row.get("name"),
+        "risk_level": row.get("risk_level") or quality.get("risk_level", "MEDIUM"),
+        "confidence_overall": row.get("confidence", quality.get("confidence_scores", {}).get("overall", 0)),
+    }
+    return build_provider_email(profile, quality)
+
 
-    return email.strip()
+def iter_result_emails(rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Bulk render: one {provider_id, name, risk_level, email_draft} per result row."""
+    for row in rows:
+        yield {
+            "provider_id": row.get("provider_id"),
+            "name": row.get("name"),
+            "risk_level": row.get("risk_level"),
+            "email_draft": build_email_from_result(row),
+        }
@@ -0,0 +1,315 @@
+# tools/knowledge_base.py
+
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Optional, Iterable
+
+from utils.keyword_matcher import KeywordMatcher
+
+# ------------------------------------------------------------------
+# Built-in knowledge: drug monographs and platform support articles.
+# Single source for the research service and the research agent tools.
+# ------------------------------------------------------------------
+
+DRUG_DATABASE = {
+    "aspirin": {
+        "generic_name": "Acetylsalicylic acid",
+        "brand_names": ["Bayer", "Bufferin", "Ecotrin"],
+        "drug_class": "NSAID",
+        "uses": "Pain relief, fever reduction, anti-inflammatory, blood thinner (anti-platelet)",
+        "side_effects": "Stomach upset, heartburn, nausea, bleeding risk",
+        "warnings": "Not for children under 12, avoid with blood thinners"
+    },
+    "ibuprofen": {
+        "generic_name": "Ibuprofen",
+        "brand_names": ["Advil", "Motrin", "Nurofen"],
+        "drug_class": "NSAID",
+        "uses": "Pain relief, fever reduction, anti-inflammatory",
+        "side_effects": "Stomach upset, dizziness, headache",
+        "warnings": "Stomach ulcers; may increase cardiovascular risk with long-term use"
+    },
+    "metformin": {
+        "generic_name": "Metformin hydrochloride",
+        "brand_names": ["Glucophage", "Fortamet"],
+        "drug_class": "Biguanide (Antidiabetic)",
+        "uses": "Type 2 diabetes, blood sugar control",
+        "side_effects": "Nausea, diarrhea, metallic taste",
+        "warnings": "Risk of lactic acidosis (rare), avoid with kidney disease"
+    },
+    "lisinopril": {
+        "generic_name": "Lisinopril",
+        "brand_names": ["Prinivil", "Zestril"],
+        "drug_class": "ACE Inhibitor",
+        "uses": "High blood pressure (hypertension), heart failure",
+        "side_effects": "Dry cough, dizziness, headache",
+        "warnings": "Not for pregnancy, monitor potassium levels"
+    },
+    "atorvastatin": {
+        "generic_name": "Atorvastatin calcium",
+        "brand_names": ["Lipitor"],
+        "drug_class": "Statin",
+        "uses": "High cholesterol, cardiovascular risk reduction",
+        "side_effects": "Muscle pain, joint pain, digestive upset",
+        "warnings": "Report unexplained muscle pain, monitor liver function"
+    },
+    "amoxicillin": {
+        "generic_name": "Amoxicillin",
+        "brand_names": ["Amoxil", "Moxatag"],
+        "drug_class": "Penicillin antibiotic",
+        "uses": "Bacterial infections (ear, throat, urinary tract, pneumonia)",
+        "side_effects": "Diarrhea, nausea, rash",
+        "warnings": "Do not use with penicillin allergy"
+    }
+}
+
+# keyword phrase -> answer
+CUSTOMER_CARE_KB = {
+    "update provider": "To update provider information: Log into dashboard > Provider Management > Search & Edit > Submit for verification. You can also re-run validation from Dashboard > Run Agent.",
+    "add provider": "To add a new provider: Dashboard > Batch Processing > Upload CSV > Run validation > Review results, or use the API.",
+    "verification": "Check verification status in Dashboard > Overview with color-coded risk levels.",
+    "compliance": "CareGrid maintains 48-hour turnaround compliance with automated validation.",
+    "export": "Export data: Navigate to results page > Click Export > Choose CSV, JSON or PDF and click Download.",
+    "batch": "Batch processing supports up to 300 records. Upload CSV with name, address, phone, specialty.",
+    "api key": "To manage API keys: Go to Settings > Security > API Keys.",
+    "billing": "For billing inquiries, please contact finance@ey-caregrid.com."
+}
+
+# Trigger phrases / drug names (generic or brand) found in one pass;
+# earlier entries win
+_CARE_MATCHER = KeywordMatcher(CUSTOMER_CARE_KB)
+_DRUG_BY_NAME = {
+    alias.lower(): drug
+    for drug, info in DRUG_DATABASE.items()
+    for alias in [drug, *info["brand_names"]]
+}
+_DRUG_NAME_MATCHER = KeywordMatcher(_DRUG_BY_NAME)
+
+DRUG_DISCLAIMER = "⚠️ Consult a healthcare provider for medical advice."
+
+
+def format_drug(info: Dict[str, Any]) -> str:
+    return f"""
+**{info['generic_name']}** ({', '.join(info['brand_names'])})
+- Class: {info['drug_class']}
+- Uses: {info['uses']}
+- Side Effects: {info['side_effects']}
+- Warnings: {info['warnings']}
+
+{DRUG_DISCLAIMER}
+"""
+
+
+# ------------------------------------------------------------------
+# BM25 index
+# ------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Question words and filler that say nothing about which article is meant
+STOPWORDS = frozenset("""
+a an the and or of to in on for with about from by at as is are was were be been am
+what whats which who whom how why when where do does did can could should would will
+i me my we our you your it its this that these those there
+tell explain give show need want know please info information question help
+use used uses using
+""".split())
+
+# Title/keyword tokens count this many times in a document's term frequencies
+KEYWORD_BOOST = 3
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# best() needs the top hit to outscore the runner-up by this factor, so a
+# question that fits several articles equally (e.g. "what are the side
+# effects?" against every drug) is not answered with an arbitrary one
+BEST_MARGIN = 1.25
+
+
+def _stem(token: str) -> str:
+    """Tiny suffix stripper so 'effects'/'effect' and 'providers'/'provider' match."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, stemmed tokens without stopwords."""
+    return [_stem(t) for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class KnowledgeStore:
+    """
+    In-memory BM25 index over knowledge articles (drugs, support answers and
+    previously accepted research answers).
+
+    Each document has a kind, an id, the text to return, and keywords
+    (titles, brand names, trigger phrases) weighted above body text.
+    search() only scores documents that share a term with the query, by
+    walking the inverted index.
+
+    Hits carry a 'confidence' in [0, 1]: the share of the query's IDF
+    weight that the document covers. 1.0 means every informative query
+    word appears in the document; unknown words (never seen in the corpus)
+    pull it down, so off-topic questions fall through to the LLM. Hits also
+    list the query terms that matched the document's keywords
+    ('keyword_matched'), as opposed to only its body.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.docs: List[Dict[str, Any]] = []
+        self._ids: Dict[str, int] = {}
+        self._postings: Dict[str, List[tuple]] = defaultdict(list)  # term -> [(doc_idx, tf)]
+        self._keyword_terms: List[frozenset] = []  # doc_idx -> keyword terms
+        self._total_len = 0
+
+    def __len__(self):
+        return len(self.docs)
+
+    def add(self, kind: str, doc_id: str, text: str, keywords: Iterable[str] = (),
+            body: str = None, **meta) -> bool:
+        """
+        Index a document. 'text' is what gets returned; 'body' (default: text)
+        is what gets indexed alongside the keywords. Re-adding an id is a no-op.
+        """
+        key = f"{kind}:{doc_id}"
+        keywords = list(keywords)
+        terms = Counter(tokenize(body if body is not None else text))
+        keyword_terms = frozenset(term for keyword in keywords for term in tokenize(keyword))
+        for keyword in keywords:
+            for term in tokenize(keyword):
+                terms[term] += KEYWORD_BOOST
+        with self._lock:
+            if key in self._ids:
+                return False
+            idx = len(self.docs)
+            length = sum(terms.values())
+            self.docs.append({
+                "kind": kind, "id": doc_id, "text": text, "keywords": keywords,
+                "length": length, **meta
+            })
+            self._ids[key] = idx
+            self._keyword_terms.append(keyword_terms)
+            for term, tf in terms.items():
+                self._postings[term].append((idx, tf))
+            self._total_len += length
+        return True
+
+    def _idf(self, term: str, n_docs: int) -> float:
+        df = len(self._postings.get(term, ()))
+        return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, kind: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """Top documents by BM25 score, each with score, confidence and matched terms."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            n_docs = len(self.docs)
+            if not n_docs:
+                return []
+            avg_len = self._total_len / n_docs
+            idf = {t: self._idf(t, n_docs) for t in terms}
+            scores: Dict[int, float] = defaultdict(float)
+            matched: Dict[int, List[str]] = defaultdict(list)
+            for term in terms:
+                for idx, tf in self._postings.get(term, ()):
+                    doc = self.docs[idx]
+                    if kind and doc["kind"] != kind:
+                        continue
+                    norm = K1 * (1 - B + B * doc["length"] / avg_len)
+                    scores[idx] += idf[term] * tf * (K1 + 1) / (tf + norm)
+                    matched[idx].append(term)
+            top = sorted(scores, key=scores.get, reverse=True)[:limit]
+            total_idf = sum(idf.values())
+            return [
+                {
+                    **self.docs[idx],
+                    "score": round(scores[idx], 4),
+                    "confidence": round(sum(idf[t] for t in matched[idx]) / total_idf, 3),
+                    "matched": matched[idx],
+                    "keyword_matched": [t for t in matched[idx] if t in self._keyword_terms[idx]],
+                }
+                for idx in top
+            ]
+
+    def best(self, query: str, kind: Optional[str] = None, min_confidence: float = 0.0,
+             margin: float = BEST_MARGIN) -> Optional[Dict[str, Any]]:
+        """
+        Top hit if it is unambiguous, else None: its confidence reaches
+        min_confidence, the query names one of its keywords (drug name,
+        trigger phrase, accepted question), and it outscores the best hit
+        with a different text by 'margin'.
+        """
+        hits = self.search(query, kind=kind, limit=5)
+        if not hits:
+            return None
+        top = hits[0]
+        if top["confidence"] < min_confidence or not top["keyword_matched"]:
+            return None
+        runner_up = next((h for h in hits[1:] if h["text"] != top["text"]), None)
+        if runner_up and top["score"] < runner_up["score"] * margin:
+            return None
+        return top
+
+    def add_answer(self, answer_id, question: str, answer: str) -> bool:
+        """Index a previously accepted research answer (matched on its question)."""
+        return self.add("answer", str(answer_id), answer, keywords=[question], body="", question=question)
+
+
+def _build_default_store() -> KnowledgeStore:
+    store = KnowledgeStore()
+    for name, info in DRUG_DATABASE.items():
+        store.add(
+            "drug", name, format_drug(info),
+            keywords=[name, info["generic_name"], *info["brand_names"]],
+            body=" ".join([info["drug_class"], info["uses"], "side effects", info["side_effects"],
+                           "warnings", info["warnings"]]),
+        )
+    for phrase, answer in CUSTOMER_CARE_KB.items():
+        store.add("support", phrase, answer, keywords=[phrase])
+    return store
+
+
+_store: Optional[KnowledgeStore] = None
+_store_lock = threading.Lock()
+
+
+def get_knowledge_store() -> KnowledgeStore:
+    """Shared store, built on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _build_default_store()
+    return _store
+
+
+# ------------------------------------------------------------------
+# Lookups (agent tools, Gemini fallback)
+# ------------------------------------------------------------------
+
+def lookup_drug(query: str) -> Optional[str]:
+    """Drug monograph if the query names a drug (generic or brand), else None."""
+    name = _DRUG_NAME_MATCHER.first_by_priority(query or "")
+    return format_drug(DRUG_DATABASE[_DRUG_BY_NAME[name]]) if name else None
+
+
+def lookup_customer_care(query: str) -> Optional[str]:
+    """Support answer if the query contains one of the KB trigger phrases, else None."""
+    phrase = _CARE_MATCHER.first_by_priority(query or "")
+    return CUSTOMER_CARE_KB[phrase] if phrase else None
+
+
+def answer_locally(query: str, min_confidence: float) -> Optional[Dict[str, Any]]:
+    """
+    Best KB article or accepted answer if it covers the question with at
+    least min_confidence, else None (the question goes to the LLM).
+    """
+    return get_knowledge_store().best(query, min_confidence=min_confidence)
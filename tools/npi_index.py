@@ -0,0 +1,396 @@
+# tools/npi_index.py
+
+"""
+Local NPI registry index built from the NPPES monthly bulk file
+(https://download.cms.gov/nppes/NPI_Files.html, npidata_pfile_*.csv).
+
+The ingest command streams the CSV into a compact SQLite file:
+  - npi is the INTEGER PRIMARY KEY (rowid), so lookup by NPI is one b-tree probe
+  - idx_npi_name_state on (name_key, state) serves name + state lookups
+Lookups use read-only, memory-mapped connections (one per thread) and take
+microseconds, so validation checks here before any web search.
+
+Build / refresh (the new index replaces the old one atomically):
+python -m tools.npi_index path/to/npidata_pfile.csv [--db data/npi_index.db]
+"""
+
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+
+from backend.core.config import get_settings
+
+NPI_INDEX_DB = get_settings().NPI_INDEX_DB
+
+# Rows per executemany during ingest
+INGEST_BATCH_SIZE = 10000
+
+# Memory-map this much of the index file for lookups
+MMAP_BYTES = 1 << 30
+
+# NPPES column headers used by the index (the file has ~330 columns)
+COL_NPI = "NPI"
+COL_ENTITY_TYPE = "Entity Type Code"
+COL_ORG_NAME = "Provider Organization Name (Legal Business Name)"
+COL_LAST_NAME = "Provider Last Name (Legal Name)"
+COL_FIRST_NAME = "Provider First Name"
+COL_MIDDLE_NAME = "Provider Middle Name"
+COL_CREDENTIAL = "Provider Credential Text"
+COL_ADDRESS = "Provider First Line Business Practice Location Address"
+COL_CITY = "Provider Business Practice Location Address City Name"
+COL_STATE = "Provider Business Practice Location Address State Name"
+COL_POSTAL_CODE = "Provider Business Practice Location Address Postal Code"
+COL_PHONE = "Provider Business Practice Location Address Telephone Number"
+COL_DEACTIVATION_DATE = "NPI Deactivation Date"
+COL_REACTIVATION_DATE = "NPI Reactivation Date"
+TAXONOMY_SLOTS = 15  # Healthcare Provider Taxonomy Code_1 .. _15
+
+# NUCC taxonomy codes for the specialties the pipeline compares against;
+# prefixes cover the subspecialty codes under them
+TAXONOMY_SPECIALTIES = {
+    "207RC0000X": "Cardiology",
+    "207N00000X": "Dermatology",
+    "208000000X": "Pediatrics",
+    "2085R0202X": "Radiology",
+    "207RX0202X": "Oncology",
+    "207RH0003X": "Oncology",
+    "2084N0400X": "Neurology",
+    "2084P0800X": "Psychiatry",
+    "207RG0100X": "Gastroenterology",
+    "207RE0101X": "Endocrinology",
+    "207X00000X": "Orthopedics",
+    "207Q00000X": "Family Medicine",
+    "207R00000X": "Internal Medicine",
+    "208D00000X": "General Practice",
+}
+TAXONOMY_PREFIXES = [
+    ("207RC", "Cardiology"),
+    ("207N", "Dermatology"),
+    ("2080", "Pediatrics"),
+    ("2085", "Radiology"),
+    ("207X", "Orthopedics"),
+    ("2084N", "Neurology"),
+    ("2084P", "Psychiatry"),
+]
+
+US_STATES = frozenset("""
+AL AK AZ AR CA CO CT DE FL GA HI ID IL IN IA KS KY LA ME MD MA MI MN MS MO MT NE NV NH NJ NM
+NY NC ND OH OK OR PA RI SC SD TN TX UT VT VA WA WV WI WY DC PR GU VI AS MP
+""".split())
+
+# Titles / credentials dropped from names before keying
+NAME_NOISE = frozenset("""
+dr mr mrs ms miss prof md do dds dmd dpm od phd pharmd np rn aprn fnp pa pac lpn lcsw psyd
+mph mba jr sr ii iii iv facc facp facs faap
+""".split())
+ORG_SUFFIXES = frozenset("inc llc pc pllc pa corp co ltd lp llp".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STATE_RE = re.compile(r"(?:,|\s)\s*([A-Za-z]{2})\.?(?:\s+\d{5}(?:-\d{4})?)?\s*$")
+
+SCHEMA = """
+CREATE TABLE npi (
+    npi INTEGER PRIMARY KEY,
+    entity_type INTEGER,
+    name TEXT,
+    name_key TEXT,
+    credential TEXT,
+    taxonomy TEXT,
+    address TEXT,
+    city TEXT,
+    state TEXT,
+    postal_code TEXT,
+    phone TEXT,
+    deactivated TEXT
+);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+# ------------------------------------------------------------------
+# Normalization
+# ------------------------------------------------------------------
+
+def _tokens(text: str) -> List[str]:
+    # "O'Brien-Smith" -> "obriensmith": punctuation inside a word is dropped
+    words = re.sub(r"['\-]", "", (text or "").lower())
+    return _TOKEN_RE.findall(words)
+
+
+def person_key(first: str, last: str) -> str:
+    return f"{''.join(_tokens(last))} {''.join(_tokens(first))}".strip()
+
+
+def org_key(name: str) -> str:
+    tokens = _tokens(name)
+    while tokens and tokens[-1] in ORG_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def name_keys(name: str) -> List[str]:
+    """
+    Candidate index keys for a free-form provider name: the person key
+    ("last first", titles / credentials / middle names ignored; "Last, First"
+    understood) and the organization key.
+    """
+    if not name:
+        return []
+    keys = []
+    head, _, tail = name.partition(",")
+    tail_tokens = [t for t in _tokens(tail) if t not in NAME_NOISE and t not in ORG_SUFFIXES]
+    head_tokens = [t for t in _tokens(head) if t not in NAME_NOISE]
+    if tail_tokens and head_tokens:
+        # "Smith, John A" (a tail of only credentials or a company suffix,
+        # as in "John Smith, MD" or "Heart Clinic, LLC", is ignored)
+        keys.append(person_key(tail_tokens[0], " ".join(head_tokens)))
+    elif len(head_tokens) >= 2:
+        keys.append(person_key(head_tokens[0], head_tokens[-1]))
+    org = org_key(name)
+    if org and org not in keys:
+        keys.append(org)
+    return keys
+
+
+def state_from_address(address: Optional[str]) -> Optional[str]:
+    """Two-letter state at the end of a US address ("..., Boston, MA 02115"), or None."""
+    match = _STATE_RE.search(address or "")
+    if match and match.group(1).upper() in US_STATES:
+        return match.group(1).upper()
+    return None
+
+
+def specialty_for_taxonomy(code: Optional[str]) -> Optional[str]:
+    if not code:
+        return None
+    if code in TAXONOMY_SPECIALTIES:
+        return TAXONOMY_SPECIALTIES[code]
+    for prefix, specialty in TAXONOMY_PREFIXES:
+        if code.startswith(prefix):
+            return specialty
+    return None
+
+
+# ------------------------------------------------------------------
+# Ingest
+# ------------------------------------------------------------------
+
+def _column_getter(header: List[str]):
+    positions = {name.strip(): i for i, name in enumerate(header)}
+    missing = [c for c in (COL_NPI, COL_ENTITY_TYPE, COL_LAST_NAME, COL_FIRST_NAME, COL_STATE)
+               if c not in positions]
+    if missing:
+        raise ValueError(f"Not an NPPES data file, missing columns: {missing}")
+
+    def get(row: List[str], column: str) -> str:
+        i = positions.get(column)
+        return row[i].strip() if i is not None and i < len(row) else ""
+
+    taxonomy_cols = [
+        (f"Healthcare Provider Taxonomy Code_{n}", f"Healthcare Provider Primary Taxonomy Switch_{n}")
+        for n in range(1, TAXONOMY_SLOTS + 1)
+    ]
+
+    def primary_taxonomy(row: List[str]) -> str:
+        first = ""
+        for code_col, switch_col in taxonomy_cols:
+            code = get(row, code_col)
+            if code and get(row, switch_col) == "Y":
+                return code
+            first = first or code
+        return first
+
+    return get, primary_taxonomy
+
+
+def iter_nppes_rows(path: str) -> Iterator[Tuple]:
+    """Stream (npi, entity_type, name, name_key, ...) tuples from an NPPES CSV."""
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        reader = csv.reader(f)
+        get, primary_taxonomy = _column_getter(next(reader))
+        for row in reader:
+            npi = get(row, COL_NPI)
+            if not npi.isdigit():
+                continue
+            entity_type = int(get(row, COL_ENTITY_TYPE) or 0)
+            if entity_type == 2:
+                name = get(row, COL_ORG_NAME)
+                key = org_key(name)
+            else:
+                first, last = get(row, COL_FIRST_NAME), get(row, COL_LAST_NAME)
+                name = " ".join(p for p in (first, get(row, COL_MIDDLE_NAME), last) if p)
+                key = person_key(first, last)
+            if not key:
+                # Deactivated NPIs carry no name or address
+                name = None
+            deactivated = get(row, COL_DEACTIVATION_DATE) if not get(row, COL_REACTIVATION_DATE) else ""
+            yield (
+                int(npi), entity_type, name, key or None, get(row, COL_CREDENTIAL) or None,
+                primary_taxonomy(row) or None, get(row, COL_ADDRESS) or None, get(row, COL_CITY) or None,
+                get(row, COL_STATE).upper() or None, get(row, COL_POSTAL_CODE)[:5] or None,
+                get(row, COL_PHONE) or None, deactivated or None,
+            )
+
+
+def build_index(csv_path: str, db_path: str = None, batch_size: int = INGEST_BATCH_SIZE,
+                on_progress=None) -> Dict[str, Any]:
+    """
+    Load an NPPES CSV into a new index file, then swap it in for db_path.
+    Indexes are built after the bulk load; readers of the old file are not
+    blocked. Returns {rows, seconds, size_bytes}.
+    """
+    db_path = db_path or NPI_INDEX_DB
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    tmp_path = db_path + ".building"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    start = time.perf_counter()
+    conn = sqlite3.connect(tmp_path, isolation_level=None)
+    rows = 0
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executescript(SCHEMA)
+        conn.execute("BEGIN")
+        batch = []
+        for record in iter_nppes_rows(csv_path):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                conn.executemany("INSERT OR REPLACE INTO npi VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", batch)
+                rows += len(batch)
+                batch = []
+                if on_progress:
+                    on_progress(rows)
+        if batch:
+            conn.executemany("INSERT OR REPLACE INTO npi VALUES (?,?,?,?,?,?,?,?,?,?,?,?)", batch)
+            rows += len(batch)
+        conn.execute("CREATE INDEX idx_npi_name_state ON npi(name_key, state)")
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("source", os.path.basename(csv_path)),
+            ("rows", str(rows)),
+            ("built_at", time.strftime("%Y-%m-%dT%H:%M:%S")),
+        ])
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    return {
+        "rows": rows,
+        "seconds": round(time.perf_counter() - start, 2),
+        "size_bytes": os.path.getsize(db_path),
+    }
+
+
+# ------------------------------------------------------------------
+# Lookup
+# ------------------------------------------------------------------
+
+class NPIIndex:
+    """Read-only lookups against a built index file (safe to share across threads)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self._local = threading.local()
+        # Every thread's connection, so close() can release them all
+        self._conns: List[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA mmap_size={MMAP_BYTES}")
+            with self._conns_lock:
+                self._conns.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close every thread's connection (file handle and mapping)."""
+        with self._conns_lock:
+            conns, self._conns = self._conns, []
+            # Threads that use the index afterwards open a new connection
+            self._local = threading.local()
+        for conn in conns:
+            conn.close()
+
+    def get(self, npi) -> Optional[Dict[str, Any]]:
+        """Record for an NPI (str or int), or None."""
+        npi = str(npi or "").strip()
+        if not npi.isdigit():
+            return None
+        row = self._conn().execute("SELECT * FROM npi WHERE npi = ?", (int(npi),)).fetchone()
+        return dict(row) if row else None
+
+    def find(self, name: str, state: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
+        """Records whose normalized name (and state, if given) match, active ones first."""
+        keys = name_keys(name)
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        sql = f"SELECT * FROM npi WHERE name_key IN ({placeholders})"
+        params: List[Any] = list(keys)
+        if state:
+            sql += " AND state = ?"
+            params.append(state.upper())
+        sql += " ORDER BY deactivated IS NOT NULL, npi LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._conn().execute(sql, params).fetchall()]
+
+    def stats(self) -> Dict[str, str]:
+        return {row["key"]: row["value"] for row in self._conn().execute("SELECT key, value FROM meta")}
+
+
+_index: Optional[NPIIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_npi_index() -> Optional[NPIIndex]:
+    """
+    Shared index for NPI_INDEX_DB, or None if it has not been built.
+    Reopened when the file is replaced by a new ingest; the old index's
+    connections are closed so the replaced file is released.
+    """
+    global _index
+    try:
+        mtime = os.path.getmtime(NPI_INDEX_DB)
+    except OSError:
+        return None
+    index = _index
+    if index is None or index.path != NPI_INDEX_DB or index.mtime != mtime:
+        with _index_lock:
+            if _index is None or _index.path != NPI_INDEX_DB or _index.mtime != mtime:
+                old, _index = _index, NPIIndex(NPI_INDEX_DB)
+                if old is not None:
+                    old.close()
+            index = _index
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the local NPI index from an NPPES CSV")
+    parser.add_argument("csv_path", help="NPPES data file (npidata_pfile_*.csv)")
+    parser.add_argument("--db", default=NPI_INDEX_DB, help=f"index file (default {NPI_INDEX_DB})")
+    args = parser.parse_args()
+
+    def progress(rows):
+        if rows % 500000 == 0:
+            print(f"  {rows:,} rows")
+
+    result = build_index(args.csv_path, args.db, on_progress=progress)
+    print(f"Indexed {result['rows']:,} NPIs in {result['seconds']}s "
+          f"({result['size_bytes'] / 1e6:.1f} MB) -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
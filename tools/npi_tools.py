@@ -1,13 +1,105 @@
-import re
 import random # Keep specific randoms for fields DDG can't find easily (license status)
 from langchain_community.tools import DuckDuckGoSearchRun
 
+from utils.keyword_matcher import KeywordMatcher
+from tools.npi_index import get_npi_index, name_keys, state_from_address, specialty_for_taxonomy
+from utils.npi import extract_npis
+
 SPECIALTIES = [
     "Cardiology", "Dermatology", "Pediatrics", "Radiology",
     "Oncology", "Neurology", "Psychiatry", "Gastroenterology",
     "Endocrinology", "Orthopedics"
 ]
 
+# All specialties found in one pass over the search results
+_SPECIALTY_MATCHER = KeywordMatcher(SPECIALTIES)
+
+def invalid_npi_result(npi_id: str) -> dict:
+    """NPI result for an ID that fails the check digit (no lookup is made)."""
+    return {
+        "npi": npi_id,
+        "npi_valid": False,
+        "npi_specialty": "Unknown",
+        "npi_license": None,
+        "license_status": "Invalid NPI",
+        "source_reliability": 0.0,
+        "source": "check_digit",
+        "education": [],
+        "certifications": [],
+        "affiliations": [],
+        "accepted_insurances": [],
+    }
+
+
+def not_in_registry_result(npi_id: str) -> dict:
+    """NPI result for a well-formed NPI that the NPPES index does not contain."""
+    return {
+        "npi": npi_id,
+        "npi_valid": True,
+        "npi_in_registry": False,
+        "npi_specialty": "Unknown",
+        "npi_license": "Not Found",
+        "license_status": "Not in Registry",
+        "source_reliability": 0.0,
+        "source": "nppes_index",
+        "education": [],
+        "certifications": [],
+        "affiliations": [],
+        "accepted_insurances": [],
+    }
+
+
+def lookup_npi_local(name: str, npi_id: str = None, address: str = None) -> dict | None:
+    """
+    NPI data from the local NPPES index (tools/npi_index.py), or None if the
+    index is not built or has no unambiguous match (callers then fall back
+    to get_npi_data's web search).
+    By NPI if given, otherwise by normalized name + state from the address.
+    A given NPI that is not in the index is reported as not in the registry;
+    it is never swapped for another provider's NPI found by name.
+    """
+    index = get_npi_index()
+    if index is None:
+        return None
+
+    if npi_id:
+        record = index.get(npi_id)
+        if record is None:
+            return not_in_registry_result(npi_id)
+    else:
+        matches = index.find(name, state_from_address(address), limit=2)
+        if len(matches) != 1:
+            return None
+        record = matches[0]
+
+    # An NPI that exists but is registered to someone else is not a match
+    name_match = record["name_key"] in name_keys(name)
+    reliability = 0.95 if name_match else 0.4
+    active = not record["deactivated"]
+    npi = str(record["npi"])
+    location = ", ".join(p for p in (record["address"], record["city"],
+                                     " ".join(filter(None, (record["state"], record["postal_code"])))) if p)
+    return {
+        "npi": npi,
+        "npi_valid": True,
+        "npi_in_registry": True,
+        "npi_name": record["name"],
+        "npi_name_match": name_match,
+        "npi_address": location or None,
+        "npi_phone": record["phone"],
+        "npi_taxonomy": record["taxonomy"],
+        "npi_specialty": specialty_for_taxonomy(record["taxonomy"]) or "General Practice",
+        "npi_license": npi,  # NPI as license proxy, as with the web lookup
+        "license_status": "Active" if active else "Deactivated",
+        "source_reliability": reliability,
+        "source": "nppes_index",
+        "education": [],
+        "certifications": [],
+        "affiliations": [],
+        "accepted_insurances": ["Medicare", "Medicaid"],
+    }
+
+
 def get_npi_data(name: str, npi_id: str = None) -> dict:
     """
     Returns Real NPI data using DuckDuckGo search.
@@ -23,20 +115,18 @@ def get_npi_data(name: str, npi_id: str = None) -> dict:
             
         results = search.run(query)
         
-        # 1. Extract NPI (10 digits)
-        npi_match = re.search(r'\b\d{10}\b', results)
-        found_npi = npi_match.group(0) if npi_match else None
+        # 1. Extract NPI: 10-digit numbers with a valid check digit (phone
+        # numbers and other ids in the snippets fail it); the requested NPI
+        # wins if it appears
+        candidates = extract_npis(results)
+        found_npi = npi_id if npi_id in candidates else (candidates[0] if candidates else None)
         
         # 2. Extract Similarity/Context
         # Simple heuristic: if name is in results
         reliability = 0.9 if (name.split()[-1] in results) else 0.4
         
         # 3. Infer Specialty from text
-        found_specialty = "General Practice"
-        for s in SPECIALTIES:
-            if s.lower() in results.lower():
-                found_specialty = s
-                break
+        found_specialty = _SPECIALTY_MATCHER.first_by_priority(results) or "General Practice"
                 
         return {
             "npi_specialty": found_specialty,
@@ -13,6 +13,13 @@ def safe_get(row, key, default=None):
         return default
 
 
+def _npi_text(value) -> str:
+    """NPI cell as text: read_csv without dtype=str gives int, or float with NaN for blanks."""
+    if isinstance(value, float):
+        return "" if pd.isna(value) else str(int(value))
+    return "" if value is None else str(value)
+
+
 def find_pdf_for_provider(name, pdf_dir="data/pdfs"):
     """Find PDF for provider by matching filename."""
     if not os.path.exists(pdf_dir):
@@ -45,6 +52,9 @@ def load_provider_with_pdf(row):
         "address": safe_get(row, "address", ""),
         "phone": safe_get(row, "phone", ""),
         "specialty": safe_get(row, "specialty", ""),
+        # Passed through so the validation agent can check it (a bad check
+        # digit is flagged invalid_npi)
+        "npi": _npi_text(safe_get(row, "npi")),
         "pdf_path": None,
         "pdf_text": "",
         "pdf_structured": {},
@@ -2,11 +2,18 @@
 
 import json
 import csv
+import uuid
+import importlib.util
+from datetime import date
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Iterable, Callable
 
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
+# Optional: columnar (Parquet) result store.
+# Only checked for here; pyarrow (and reportlab for PDFs) are imported on
+# first use so that importing this module stays cheap.
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+pa = None
+pq = None
 
 
 def mask_phone(phone: str | None) -> str | None:
@@ -46,33 +53,283 @@ def export_json(obj: Any, path: str) -> str:
     return str(p)
 
 
-def export_summary_pdf(summary_rows: List[Dict[str, Any]], path: str) -> str:
+def export_summary_pdf(summary_rows: Iterable[Dict[str, Any]], path: str,
+                       title: str = "Provider Directory QA Summary",
+                       pages_per_chunk: int = 20,
+                       on_chunk: Optional[Callable[[int, int], None]] = None) -> str:
     """
     Very simple PDF report: one provider per line.
     Heavy styling is not needed – EY just wants PDF capability.
+
+    summary_rows may be any iterable (e.g. a DB cursor), so no list of rows
+    is built; reportlab still keeps the rendered pages in memory until
+    save(). Every pages_per_chunk pages, on_chunk(rows, pages) is called for
+    progress reporting only. The PDF is written to a temp name and renamed
+    into place, so readers never see a half-written file.
     """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
     p = Path(path)
     p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(p.name + ".part")
 
-    c = canvas.Canvas(str(p), pagesize=A4)
+    c = canvas.Canvas(str(tmp), pagesize=A4)
     width, height = A4
     y = height - 50
 
     c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y, "Provider Directory QA Summary")
+    c.drawString(50, y, title)
     y -= 30
 
+    rows_done = 0
+    pages_done = 0
     c.setFont("Helvetica", 10)
     for row in summary_rows:
         line = f"{row.get('Provider Name')} | {row.get('Status')} | " \
                f"Conf: {row.get('Overall Confidence')} | Risk: {row.get('Risk Level')}"
         if y < 80:
             c.showPage()
+            pages_done += 1
+            if on_chunk and pages_done % pages_per_chunk == 0:
+                on_chunk(rows_done, pages_done)
             y = height - 50
             c.setFont("Helvetica", 10)
         c.drawString(50, y, line)
         y -= 15
+        rows_done += 1
 
     c.showPage()
     c.save()
+    if on_chunk:
+        on_chunk(rows_done, pages_done + 1)
+    tmp.replace(p)
     return str(p)
+
+
+# ---------------------------------------------------
+# PARQUET RESULT STORE
+# ---------------------------------------------------
+PARQUET_ROOT = "data/final_results_parquet"
+# provider_results copies (ExportService.write_parquet_dataset) live apart
+# from the dashboard's batch results, since their columns differ
+PROVIDER_RESULTS_PARQUET_ROOT = "data/provider_results_parquet"
+PARTITION_COLS = ["batch_date", "risk_level"]
+
+# Fixed final_profile schema of the result store (agents/agent_4.py plus the
+# provider_id / batch_id the batch runner adds). Every part file is written
+# with exactly these columns, so files from different batches always share
+# one schema; keys outside the list are not stored.
+FINAL_RESULT_COLUMNS = [
+    "provider_id", "batch_id", "name", "address_original", "address_corrected",
+    "phone_original", "phone_corrected", "specialty", "license", "education",
+    "board_certification", "affiliations", "accepted_insurances",
+    "confidence_overall", "risk_level", "fraud_score", "needs_manual_review",
+    "provider_status", "priority_score",
+]
+
+# Marker naming the most recent batch written to a store (pyarrow skips
+# files starting with "_" when reading the dataset)
+LATEST_BATCH_FILE = "_latest_batch.json"
+
+# final_profile column types; other columns are stored as strings
+_FLOAT_COLS = {"confidence_overall", "fraud_score", "priority_score", "confidence"}
+_INT_COLS = {"provider_id"}
+_BOOL_COLS = {"needs_manual_review"}
+
+
+def _require_pyarrow():
+    global pa, pq
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for Parquet export. Run: pip install pyarrow")
+    if pq is None:
+        import pyarrow
+        import pyarrow.parquet
+        pa, pq = pyarrow, pyarrow.parquet
+
+
+def _parquet_value(col: str, value: Any) -> Any:
+    """Coerce one value to the column's Parquet type (lists/dicts -> JSON text)."""
+    if value is None:
+        return None
+    try:
+        if col in _FLOAT_COLS:
+            return float(value)
+        if col in _INT_COLS:
+            return int(value)
+        if col in _BOOL_COLS:
+            return value if isinstance(value, bool) else str(value).lower() == "true"
+    except (TypeError, ValueError):
+        return None
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _parquet_type(col: str):
+    if col in _FLOAT_COLS:
+        return pa.float64()
+    if col in _INT_COLS:
+        return pa.int64()
+    if col in _BOOL_COLS:
+        return pa.bool_()
+    return pa.string()
+
+
+def parquet_schema(columns: List[str]):
+    """Arrow schema for result columns (known numeric/bool columns typed, rest strings)."""
+    _require_pyarrow()
+    return pa.schema([(col, _parquet_type(col)) for col in columns])
+
+
+def parquet_table(rows: List[Dict[str, Any]], columns: List[str], schema=None):
+    """Build an Arrow table from row dicts, coercing values to the schema."""
+    schema = schema or parquet_schema(columns)
+    data = {col: [_parquet_value(col, r.get(col)) for r in rows] for col in columns}
+    return pa.Table.from_pydict(data, schema=schema)
+
+
+def export_parquet(rows: List[Dict[str, Any]], root: str = PARQUET_ROOT,
+                   batch_date: Optional[str] = None, basename: Optional[str] = None,
+                   columns: Optional[List[str]] = None) -> str:
+    """
+    Append rows to a Parquet dataset partitioned by batch_date and risk_level
+    (hive layout: root/batch_date=YYYY-MM-DD/risk_level=HIGH/part-*.parquet).
+    Each call writes new part files, so repeated batches accumulate.
+
+    All files share one schema: 'columns' (default FINAL_RESULT_COLUMNS),
+    with missing keys stored as nulls and other keys dropped.
+    """
+    _require_pyarrow()
+    if not rows:
+        return root
+
+    batch_date = batch_date or date.today().isoformat()
+    columns = [col for col in (columns or FINAL_RESULT_COLUMNS) if col not in PARTITION_COLS]
+
+    data = {col: [_parquet_value(col, r.get(col)) for r in rows] for col in columns}
+    data["batch_date"] = [batch_date] * len(rows)
+    data["risk_level"] = [str(r.get("risk_level") or "UNKNOWN") for r in rows]
+
+    schema = pa.schema([(col, _parquet_type(col)) for col in columns]
+                       + [(col, pa.string()) for col in PARTITION_COLS])
+    table = pa.Table.from_pydict(data, schema=schema)
+
+    Path(root).mkdir(parents=True, exist_ok=True)
+    pq.write_to_dataset(
+        table,
+        root_path=root,
+        partition_cols=PARTITION_COLS,
+        basename_template=f"part-{basename or uuid.uuid4().hex[:12]}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return root
+
+
+def mark_latest_batch(root: str, batch_id: str, batch_date: str):
+    """Record batch_id / batch_date as the store's most recent batch."""
+    p = Path(root) / LATEST_BATCH_FILE
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_name(p.name + ".part")
+    tmp.write_text(json.dumps({"batch_id": batch_id, "batch_date": batch_date}), encoding="utf-8")
+    tmp.replace(p)
+
+
+def latest_batch(root: str = PARQUET_ROOT) -> Optional[Dict[str, Any]]:
+    """
+    The {"batch_id", "batch_date"} last passed to mark_latest_batch, plus
+    "marked_at" (the marker's mtime), or None.
+    """
+    p = Path(root) / LATEST_BATCH_FILE
+    try:
+        latest = json.loads(p.read_text(encoding="utf-8"))
+        latest["marked_at"] = p.stat().st_mtime
+        return latest
+    except (OSError, ValueError):
+        return None
+
+
+def write_parquet_file(rows, path: str, row_group_size: int = 10000,
+                       columns: Optional[List[str]] = None) -> int:
+    """
+    Write an iterable of row dicts to a single Parquet file, one row group
+    per row_group_size rows, so memory stays bounded by the row group.
+    Columns default to the keys of the first row. Returns the number of rows written.
+    """
+    _require_pyarrow()
+    p = Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+
+    writer = None
+    schema = None
+    written = 0
+    group = []
+
+    def flush():
+        writer.write_table(parquet_table(group, columns, schema))
+
+    try:
+        for row in rows:
+            if writer is None:
+                columns = columns or list(row.keys())
+                schema = parquet_schema(columns)
+                writer = pq.ParquetWriter(str(p), schema)
+            group.append(row)
+            if len(group) >= row_group_size:
+                flush()
+                written += len(group)
+                group = []
+        if group:
+            flush()
+            written += len(group)
+        if writer is None and columns:
+            # No rows: still produce a valid, empty file with the schema
+            pq.write_table(parquet_schema(columns).empty_table(), str(p))
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def read_results_parquet(root: str = PARQUET_ROOT, columns: Optional[List[str]] = None,
+                         batch_dates: Optional[List[str]] = None,
+                         risk_levels: Optional[List[str]] = None,
+                         batch_ids: Optional[List[str]] = None):
+    """
+    Load a results DataFrame from the Parquet store, reading only the
+    requested columns and only the matching batch_date/risk_level partitions
+    (batch_ids further filters rows within them).
+    Returns None if the store does not exist yet.
+    """
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    if not Path(root).exists():
+        return None
+
+    dataset = ds.dataset(root, format="parquet", partitioning="hive")
+
+    expr = None
+    for col, values in (("batch_date", batch_dates), ("risk_level", risk_levels), ("batch_id", batch_ids)):
+        if values:
+            cond = ds.field(col).isin(list(values))
+            expr = cond if expr is None else expr & cond
+
+    table = dataset.to_table(columns=columns, filter=expr)
+    return table.to_pandas()
+
+
+def list_result_partitions(root: str = PARQUET_ROOT) -> Dict[str, List[str]]:
+    """
+    List available batch dates and risk levels from the directory layout
+    alone (no data files are opened).
+    """
+    found = {col: set() for col in PARTITION_COLS}
+    base = Path(root)
+    if base.exists():
+        for part_dir in base.glob("*=*/*=*"):
+            for segment in (part_dir.parent.name, part_dir.name):
+                key, _, value = segment.partition("=")
+                if key in found:
+                    found[key].add(value)
+    return {col: sorted(values) for col, values in found.items()}
@@ -0,0 +1,53 @@
+# utils/fts.py
+
+import re
+import sqlite3
+
+# FTS5 ships with the SQLite bundled in CPython builds, but not every system
+# SQLite has it; without it the search tables are skipped and search raises.
+def _probe_fts5() -> bool:
+    try:
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE VIRTUAL TABLE probe USING fts5(x)")
+        conn.close()
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+FTS5_AVAILABLE = _probe_fts5()
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+MAX_SEARCH_LIMIT = 100
+
+
+def fts_query(text: str, prefix: bool = True) -> str:
+    """
+    Turn free text from a search box into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted term (so FTS5 operators and punctuation in
+    user input cannot cause syntax errors) and all terms must match. The last
+    word is prefix-matched so partial input ("metfor") still finds results.
+    """
+    terms = _TOKEN_RE.findall(text or "")
+    if not terms:
+        raise ValueError("Search query must contain at least one word")
+    quoted = [f'"{t}"' for t in terms]
+    if prefix:
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def page_bounds(limit: int, offset: int):
+    """Validate pagination arguments (ValueError on bad input)."""
+    if limit < 1 or limit > MAX_SEARCH_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_SEARCH_LIMIT}")
+    if offset < 0:
+        raise ValueError("offset must be >= 0")
+    return limit, offset
+
+
+def require_fts5():
+    if not FTS5_AVAILABLE:
+        raise RuntimeError("Full-text search needs SQLite with the FTS5 extension")
@@ -0,0 +1,146 @@
+# utils/keyword_matcher.py
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton: finds every occurrence of any keyword in one
+    pass over the text, so the cost is O(len(text) + matches) no matter how
+    many keywords there are (a loop of `keyword in text` checks costs
+    O(len(text) * n_keywords)).
+
+    Build once (module level) and reuse:
+
+        matcher = KeywordMatcher(["street", "avenue"])
+        matcher.find_all("12 main street")   # [(8, 14, "street")]
+        matcher.first_by_priority(text)      # found keyword earliest in the list
+
+    Matching is case-insensitive by default. Keywords keep their original
+    spelling (and list position, used as priority) in results.
+
+    For small keyword lists (<= SCAN_THRESHOLD) a per-keyword str.find scan
+    runs in C and beats the pure-Python automaton walk, so it is used
+    instead; results are identical either way.
+    """
+
+    SCAN_THRESHOLD = 32
+
+    def __init__(self, keywords: Iterable[str], case_insensitive: bool = True):
+        self.case_insensitive = case_insensitive
+        self.keywords: List[str] = []
+        self._priority: Dict[str, int] = {}
+
+        # Node 0 is the root; per node: transitions, fail link, output keyword ids
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for keyword in keywords:
+            self._add(keyword)
+        self._build_links()
+        self._needles = [self._norm(k) for k in self.keywords]
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def _norm(self, text: str) -> str:
+        return text.lower() if self.case_insensitive else text
+
+    def _add(self, keyword: str):
+        if not keyword or keyword in self._priority:
+            return
+        kid = len(self.keywords)
+        self.keywords.append(keyword)
+        self._priority[keyword] = kid
+
+        node = 0
+        for ch in self._norm(keyword):
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._out[node].append(kid)
+
+    def _build_links(self):
+        # BFS: a node's fail link is the longest proper suffix that is also
+        # a trie path; outputs are inherited along fail links.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                link = self._goto[fail].get(ch, 0)
+                self._fail[child] = link if link != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _scan_matches(self, text: str) -> List[Tuple[int, int, str]]:
+        matches = []
+        for keyword, needle in zip(self.keywords, self._needles):
+            start = text.find(needle)
+            while start != -1:
+                matches.append((start, start + len(needle), keyword))
+                start = text.find(needle, start + 1)
+        matches.sort(key=lambda m: (m[1], -(m[1] - m[0])))
+        return matches
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, keyword) for every occurrence, ordered by end position."""
+        text = self._norm(text or "")
+        if len(self.keywords) <= self.SCAN_THRESHOLD:
+            yield from self._scan_matches(text)
+            return
+
+        goto, fail, out, keywords = self._goto, self._fail, self._out, self.keywords
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for kid in out[node]:
+                keyword = keywords[kid]
+                yield i + 1 - len(keyword), i + 1, keyword
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        return list(self.iter_matches(text))
+
+    def matched(self, text: str) -> List[str]:
+        """Distinct keywords found in the text, in keyword-list order."""
+        found = {keyword for _, _, keyword in self.iter_matches(text)}
+        return sorted(found, key=self._priority.__getitem__)
+
+    def contains_any(self, text: str) -> bool:
+        return next(self.iter_matches(text), None) is not None
+
+    def first_by_priority(self, text: str) -> Optional[str]:
+        """
+        The found keyword that comes first in the keyword list (same result
+        as `for k in keywords: if k in text: return k`), or None.
+        """
+        found = self.matched(text)
+        return found[0] if found else None
+
+    def replace(self, text: str, mapping: Dict[str, str]) -> str:
+        """
+        Replace keyword occurrences using 'mapping' (keyword -> replacement),
+        leftmost-longest, non-overlapping, in a single pass. Case-insensitive
+        matchers should be given already-normalized text.
+        """
+        matches = sorted(self.iter_matches(text), key=lambda m: (m[0], -(m[1] - m[0])))
+        parts, pos = [], 0
+        for start, end, keyword in matches:
+            if start < pos or keyword not in mapping:
+                continue
+            parts.append(text[pos:start])
+            parts.append(mapping[keyword])
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts)
@@ -0,0 +1,70 @@
+# utils/npi.py
+
+"""
+NPI check digit (CMS NPI standard): the Luhn algorithm applied to the
+first 9 digits prefixed with the card issuer code 80840. The prefix
+contributes a constant 24 to the Luhn sum, so only the NPI digits are
+processed.
+
+About 1 in 10 random 10-digit strings passes, so this rejects typos and
+scraped phone numbers / order ids before any lookup, without a network call.
+"""
+
+import re
+from typing import Iterable, List
+
+NPI_PREFIX = "80840"
+NPI_PREFIX_LUHN_SUM = 24  # Luhn sum of the doubled/undoubled 80840 digits
+
+# ASCII digits only: str.isdigit / \d also accept other scripts' digits
+_NPI_CANDIDATE_RE = re.compile(r"(?<![0-9])[0-9]{10}(?![0-9])")
+
+# Luhn value of a doubled digit (2*d, minus 9 if over 9)
+_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+
+
+def normalize_npi(value) -> str:
+    """ASCII digits only ('1234-567-893' -> '1234567893'); '' for None."""
+    return re.sub(r"[^0-9]", "", str(value)) if value is not None else ""
+
+
+def npi_check_digit(payload: str) -> int:
+    """Check digit for the first 9 digits of an NPI."""
+    digits = [ord(c) - 48 for c in payload]
+    # From the right of the 9 payload digits, every other one is doubled
+    total = NPI_PREFIX_LUHN_SUM + sum(_DOUBLED[d] for d in digits[8::-2]) + sum(digits[7::-2])
+    return (10 - total % 10) % 10
+
+
+def is_valid_npi(value) -> bool:
+    """True if 'value' is 10 digits with a correct check digit."""
+    npi = str(value or "")
+    if len(npi) != 10 or not (npi.isascii() and npi.isdigit()):
+        return False
+    return npi_check_digit(npi[:9]) == ord(npi[9]) - 48
+
+
+def valid_npi_mask(values: Iterable[str]):
+    """
+    Vectorized is_valid_npi over many values (list, array or pandas Series
+    of strings): returns a numpy bool array. Non-10-digit values are False.
+    """
+    import numpy as np
+
+    values = ["" if v is None else str(v) for v in values]
+    mask = np.fromiter((len(v) == 10 and v.isascii() and v.isdigit() for v in values),
+                       dtype=bool, count=len(values))
+    if not mask.any():
+        return mask
+
+    candidates = "".join(v for v, ok in zip(values, mask) if ok).encode("ascii")
+    digits = (np.frombuffer(candidates, dtype=np.uint8) - 48).reshape(-1, 10).astype(np.int16)
+    doubled = np.asarray(_DOUBLED, dtype=np.int16)[digits[:, 0:9:2]]
+    total = NPI_PREFIX_LUHN_SUM + doubled.sum(axis=1) + digits[:, 1:9:2].sum(axis=1)
+    mask[mask] = (10 - total % 10) % 10 == digits[:, 9]
+    return mask
+
+
+def extract_npis(text: str) -> List[str]:
+    """Distinct 10-digit numbers in 'text' that are valid NPIs, in order of appearance."""
+    return list(dict.fromkeys(n for n in _NPI_CANDIDATE_RE.findall(text or "") if is_valid_npi(n)))
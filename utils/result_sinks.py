@@ -0,0 +1,320 @@
+# utils/result_sinks.py
+
+"""
+Incremental result sinks.
+
+A sink receives one provider result (usually a final_profile dict) at a
+time and persists it as it arrives, flushing every `flush_every` rows or
+`flush_seconds` seconds. A crash mid-batch keeps everything flushed so far,
+and memory no longer grows with batch size.
+
+    with open_sink("data/final_results.csv") as sink:
+        for profile in profiles:
+            sink.write(profile)
+
+Sinks: CsvSink, NdjsonSink, ParquetSink (one row group per flush),
+PartitionedParquetSink (batch_date/risk_level dataset), SqliteSink.
+"""
+
+import csv
+import json
+import sqlite3
+import time
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.exporter import (
+    export_parquet,
+    mark_latest_batch,
+    parquet_schema,
+    parquet_table,
+    PARQUET_ROOT,
+)
+
+
+class ResultSink:
+    """
+    Base sink: buffers rows and calls _write_rows() on each flush.
+    Subclasses implement _write_rows (and optionally _close).
+    """
+
+    def __init__(self, flush_every: int = 50, flush_seconds: float = 5.0):
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.rows_written = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self._closed = False
+
+    def write(self, row: Dict[str, Any]):
+        """Queue one result; flushes when the row or time threshold is hit."""
+        self._buffer.append(row)
+        if (len(self._buffer) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_seconds):
+            self.flush()
+
+    def flush(self):
+        """Persist all buffered rows."""
+        if self._buffer:
+            self._write_rows(self._buffer)
+            self.rows_written += len(self._buffer)
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Flush remaining rows and release resources (idempotent)."""
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            self._close()
+
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _cell(value: Any) -> Any:
+    """Lists/dicts are stored as JSON text in flat formats."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+class CsvSink(ResultSink):
+    """
+    Append rows to a CSV file. Columns come from the existing header when
+    appending, otherwise from the first row. A later row with new keys adds
+    them as columns (the file is rewritten once with the wider header, and
+    earlier rows get empty cells), like pd.DataFrame over all rows.
+    Passing 'columns' fixes the header instead; other keys are then dropped.
+    """
+
+    def __init__(self, path: str, append: bool = False, columns: Optional[List[str]] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.columns = list(columns) if columns else None
+        self._fixed_columns = bool(columns)
+
+        if append and self.path.exists() and self.path.stat().st_size > 0:
+            with self.path.open("r", newline="", encoding="utf-8") as f:
+                self.columns = self.columns or next(csv.reader(f), None)
+            self._file = self.path.open("a", newline="", encoding="utf-8")
+            self._header_written = True
+        else:
+            self._file = self.path.open("w", newline="", encoding="utf-8")
+            self._header_written = False
+        self._writer = None
+
+    def _write_rows(self, rows):
+        if self.columns is None:
+            self.columns = list(rows[0].keys())
+        if not self._fixed_columns:
+            known = set(self.columns)
+            new_keys = [k for row in rows for k in row if k not in known and not known.add(k)]
+            if new_keys:
+                self._add_columns(new_keys)
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=self.columns, extrasaction="ignore")
+            if not self._header_written:
+                self._writer.writeheader()
+                self._header_written = True
+        self._writer.writerows({k: _cell(v) for k, v in row.items()} for row in rows)
+        self._file.flush()
+
+    def _add_columns(self, new_keys: List[str]):
+        """Widen the header, rewriting rows already on disk under it."""
+        self.columns = self.columns + new_keys
+        self._writer = None
+        if not self._header_written:
+            return
+        self._file.close()
+        tmp = self.path.with_name(self.path.name + ".part")
+        with self.path.open("r", newline="", encoding="utf-8") as src, \
+                tmp.open("w", newline="", encoding="utf-8") as dst:
+            reader = csv.reader(src)
+            next(reader, None)
+            writer = csv.writer(dst)
+            writer.writerow(self.columns)
+            for record in reader:
+                writer.writerow(record + [""] * (len(self.columns) - len(record)))
+        tmp.replace(self.path)
+        self._file = self.path.open("a", newline="", encoding="utf-8")
+
+    def _close(self):
+        self._file.close()
+
+
+class NdjsonSink(ResultSink):
+    """Append rows to a newline-delimited JSON file."""
+
+    def __init__(self, path: str, append: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("a" if append else "w", encoding="utf-8")
+
+    def _write_rows(self, rows):
+        self._file.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in rows))
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class ParquetSink(ResultSink):
+    """
+    Write rows to a single Parquet file, one row group per flush.
+    The file is only readable after close() writes the footer.
+    """
+
+    def __init__(self, path: str, columns: Optional[List[str]] = None, **kwargs):
+        kwargs.setdefault("flush_every", 1000)
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.columns = columns
+        self._writer = None
+        self._schema = None
+
+    def _write_rows(self, rows):
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self.columns = self.columns or list(rows[0].keys())
+            self._schema = parquet_schema(self.columns)
+            self._writer = pq.ParquetWriter(str(self.path), self._schema)
+        self._writer.write_table(parquet_table(rows, self.columns, self._schema))
+
+    def _close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class PartitionedParquetSink(ResultSink):
+    """
+    Append rows to the batch_date/risk_level partitioned result store.
+    Each flush writes new part files, readable immediately. Rows are
+    stamped with the sink's batch_id, and close() records the batch as the
+    store's latest (see utils.exporter.latest_batch).
+    """
+
+    def __init__(self, root: str = PARQUET_ROOT, batch_date: Optional[str] = None,
+                 basename: Optional[str] = None, batch_id: Optional[str] = None,
+                 columns: Optional[List[str]] = None, **kwargs):
+        kwargs.setdefault("flush_every", 1000)
+        super().__init__(**kwargs)
+        self.root = root
+        self.batch_date = batch_date or date.today().isoformat()
+        self.batch_id = batch_id or uuid.uuid4().hex[:12]
+        self.basename = basename or self.batch_id
+        self.columns = columns
+        self._parts = 0
+
+    def _write_rows(self, rows):
+        rows = [{**r, "batch_id": r.get("batch_id") or self.batch_id} for r in rows]
+        export_parquet(rows, self.root, batch_date=self.batch_date,
+                       basename=f"{self.basename}-{self._parts}", columns=self.columns)
+        self._parts += 1
+
+    def _close(self):
+        if self.rows_written:
+            mark_latest_batch(self.root, self.batch_id, self.batch_date)
+
+
+class SqliteSink(ResultSink):
+    """
+    Insert rows into a SQLite table (columns untyped). The table is created
+    from the first rows' keys; keys that first appear later are added with
+    ALTER TABLE ADD COLUMN, like CsvSink widens its header. Keys that are
+    not identifiers are skipped. One transaction per flush.
+    """
+
+    def __init__(self, path: str, table: str = "final_results", **kwargs):
+        super().__init__(**kwargs)
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.table = table
+        self.columns: Optional[List[str]] = None
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+
+    def _write_rows(self, rows):
+        keys = list(dict.fromkeys(k for row in rows for k in row if k.isidentifier()))
+        with self._conn:
+            if self.columns is None:
+                cols = ", ".join(f'"{c}"' for c in keys)
+                self._conn.execute(f"CREATE TABLE IF NOT EXISTS {self.table} ({cols})")
+                self.columns = [r[1] for r in self._conn.execute(f"PRAGMA table_info({self.table})")]
+            # SQLite column names are case-insensitive
+            known = {c.lower() for c in self.columns}
+            for key in keys:
+                if key.lower() not in known:
+                    self._conn.execute(f'ALTER TABLE {self.table} ADD COLUMN "{key}"')
+                    self.columns.append(key)
+                    known.add(key.lower())
+            cols = ", ".join(f'"{c}"' for c in self.columns)
+            lowered = [c.lower() for c in self.columns]
+            placeholders = ", ".join("?" * len(self.columns))
+            self._conn.executemany(
+                f"INSERT INTO {self.table} ({cols}) VALUES ({placeholders})",
+                [tuple(_cell(r.get(c)) for c in lowered) for r in
+                 ({k.lower(): v for k, v in row.items()} for row in rows)]
+            )
+
+    def _close(self):
+        self._conn.close()
+
+
+class MultiSink(ResultSink):
+    """Fan each row out to several sinks (each keeps its own flush policy)."""
+
+    def __init__(self, *sinks: ResultSink):
+        super().__init__(flush_every=1)
+        self.sinks = [s for s in sinks if s is not None]
+
+    def write(self, row):
+        for sink in self.sinks:
+            sink.write(row)
+        self.rows_written += 1
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def _close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def open_sink(target: str, **kwargs) -> ResultSink:
+    """
+    Pick a sink from the target's extension:
+    .csv -> CsvSink, .ndjson/.jsonl -> NdjsonSink, .parquet -> ParquetSink,
+    .db/.sqlite -> SqliteSink, no extension -> PartitionedParquetSink (directory).
+    """
+    suffix = Path(target).suffix.lower()
+    if suffix == ".csv":
+        return CsvSink(target, **kwargs)
+    if suffix in (".ndjson", ".jsonl"):
+        return NdjsonSink(target, **kwargs)
+    if suffix == ".parquet":
+        return ParquetSink(target, **kwargs)
+    if suffix in (".db", ".sqlite", ".sqlite3"):
+        return SqliteSink(target, **kwargs)
+    if suffix == "":
+        return PartitionedParquetSink(target, **kwargs)
+    raise ValueError(f"Unsupported result sink: {target}")